@@ -0,0 +1 @@
+# 페이지별 핵심 계산 벤치마크 (Streamlit 없이 실행): python -m benchmarks.run
@@ -0,0 +1,146 @@
+import numpy as np
+
+from benchmarks import synthetic
+
+
+# ✅ 벤치마크 사례: 페이지마다 핵심 계산 하나씩
+# setup(n) → 입력 (측정 밖에서 한 번 만든다), run(*입력) → 측정할 계산
+# max_size: 이보다 큰 크기는 건너뛴다 (O(n²) 계산·큰 메모리)
+class Case:
+    def __init__(self, name, page, setup, run, max_size=None):
+        self.name = name
+        self.page = page
+        self.setup = setup
+        self.run = run
+        self.max_size = max_size
+
+    def supports(self, n):
+        return self.max_size is None or n <= self.max_size
+
+
+def _shelter_coords(n):
+    df = synthetic.shelters(n)
+    return df["위도"].to_numpy(), df["경도"].to_numpy(), df["수용인원"].to_numpy(float)
+
+
+# 06_MST: 속도가 모두 다르면 k-NN 후보 + 검증 경로, 같으면 들로네 경로
+def _mst_input(n, equal_speed=False):
+    lat, lon, _ = _shelter_coords(n)
+    rng = np.random.default_rng(1)
+    speed = np.full(n, 100.0) if equal_speed else rng.uniform(10, 1000, n)
+    return lat, lon, speed
+
+
+def _prim(lat, lon, speed):
+    from utils.mst import prim_mst
+    return prim_mst(lat, lon, speed)
+
+
+def _sparse(lat, lon, speed):
+    from utils.mst import sparse_mst
+    return sparse_mst(lat, lon, speed)
+
+
+# 07_SDGS: 대피소 Ball 트리 만들기 + 질의점 1,000 개의 2 km 반경 탐색
+def _radius_input(n):
+    lat, lon, _ = _shelter_coords(n)
+    q_lat, q_lon = synthetic.coords(1000, seed=2)
+    return lat, lon, q_lat, q_lon
+
+
+def _radius(lat, lon, q_lat, q_lon):
+    from utils.spatial import SpatialIndex
+    return SpatialIndex(lat, lon).radius_batch(q_lat, q_lon, 2000.0)
+
+
+# 07_SDGS: 위험 지점 n 개 → 대피소 배정 (대피소 수 = n / 10)
+def _assign_input(n):
+    risk = synthetic.fire_incidents(n, seed=3)
+    lat, lon = synthetic.coords(n, seed=3)
+    s_lat, s_lon, capacity = _shelter_coords(max(n // 10, 1))
+    return lat, lon, risk["피해면적_합계"].to_numpy() * 100 + 1, s_lat, s_lon, capacity
+
+
+def _assign(*args):
+    from utils.assignment import assign_shelters
+    return assign_shelters(*args)
+
+
+# 05.Where Ess: 기준 정규화·점수 (product, TOPSIS + 가중치 시나리오 100 개) → 순위·상위 10
+def _ess_input(n):
+    df = synthetic.ess_stations(n)
+    return (df[["평균기온편차(°C)", "강수량(mm)"]].to_numpy(),)
+
+
+def _ess(matrix):
+    from utils.ranking import rank_with_ties, top_k
+    from utils.scoring import CriteriaStats, score, weight_scenarios
+
+    stats = CriteriaStats(matrix)
+    directions = np.array([-1, -1])
+    scores = score(stats, np.ones(2), directions, "product")
+    score(stats, weight_scenarios(np.ones(2), 100), directions, "topsis")
+    return rank_with_ties(scores), top_k(scores, 10)
+
+
+# 05.Where Ess: 후보지 n 개 일괄 근접 요약 (관측 지점 1,000 개)
+def _screen_input(n):
+    df = synthetic.ess_stations(1000)
+    lat, lon = synthetic.coords(n, seed=4)
+    return df["위도"].to_numpy(), df["경도"].to_numpy(), df["ESS_적합도"].to_numpy(), lat, lon
+
+
+def _screen(lat, lon, values, q_lat, q_lon):
+    from utils.spatial import SpatialIndex, neighbour_summary
+    return neighbour_summary(SpatialIndex(lat, lon), q_lat, q_lon, values)
+
+
+# 02_folium / 03_plotlytest: 넓은 인구 표 → 큐브 + 연령 구간 합 (전체 지역)
+def _population_input(n):
+    return (synthetic.census(n),)
+
+
+def _population(df):
+    from utils.population import build_cube
+
+    cube = build_cube(df)
+    lo, hi = cube.age_span(20, 39)
+    return cube.range_sum(cube.regions, lo, hi)
+
+
+# 04_financial: 거래일 n 일 × 20 종목 수익률·변동성·낙폭
+def _returns_input(n):
+    return (synthetic.prices(n).to_numpy(),)
+
+
+def _returns(prices):
+    from utils.analytics import daily_returns, drawdown, rolling_volatility
+
+    returns = daily_returns(prices)
+    return rolling_volatility(returns, min(20, len(returns))), drawdown(prices)
+
+
+# 08_fire_stats: 원본 산불 표 n 행 → 사건 정리 + 큐브 + 원인별 집계
+def _incidents_input(n):
+    return (synthetic.fire_incidents(n),)
+
+
+def _incidents(raw):
+    from utils.incidents import build_incident_cube, parse_incidents
+
+    cube = build_incident_cube(parse_incidents(raw))
+    return cube.breakdown("원인")
+
+
+CASES = [
+    Case("mst.prim", "06_MST", _mst_input, _prim, max_size=10_000),
+    Case("mst.sparse", "06_MST", _mst_input, _sparse),
+    Case("mst.delaunay", "06_MST", lambda n: _mst_input(n, equal_speed=True), _sparse),
+    Case("shelter.radius_2km", "07_SDGS", _radius_input, _radius),
+    Case("shelter.assign", "07_SDGS", _assign_input, _assign, max_size=10_000),
+    Case("ess.score_rank", "05.Where Ess", _ess_input, _ess),
+    Case("ess.screen_sites", "05.Where Ess", _screen_input, _screen),
+    Case("population.age_slice", "02_folium", _population_input, _population, max_size=10_000),
+    Case("finance.returns", "04_financial", _returns_input, _returns),
+    Case("fire.incident_cube", "08_fire_stats", _incidents_input, _incidents),
+]
@@ -0,0 +1,100 @@
+import argparse
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.kernels import CASES
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+SIZES = (100, 1_000, 10_000, 100_000)
+# 기준선보다 이 배수 넘게 느리거나 메모리를 더 쓰면 회귀로 본다 (기계마다 편차가 있어 넉넉하게)
+TIME_TOLERANCE = 2.0
+MEMORY_TOLERANCE = 1.25
+# 이보다 짧은 계산은 잡음이 커서 시간 비교에서 뺀다
+MIN_COMPARE_S = 0.02
+
+
+# 시간: repeat 번 중 최솟값 (perf_counter)
+# 메모리: tracemalloc 을 켠 별도 실행 한 번의 최대 할당량 (추적 부담이 시간에 섞이지 않도록)
+def measure(case, n, repeat=3):
+    args = case.setup(n)
+    case.run(*args)  # 지연 import·첫 실행 비용은 빼고
+    best = np.inf
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        case.run(*args)
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    case.run(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"case": case.name, "page": case.page, "n": n, "seconds": best, "peak_mb": peak / 2**20}
+
+
+def run(sizes=SIZES, names=None, repeat=3):
+    results = []
+    for case in CASES:
+        if names and not any(case.name.startswith(name) for name in names):
+            continue
+        for n in sizes:
+            if not case.supports(n):
+                continue
+            result = measure(case, n, repeat)
+            results.append(result)
+            print(f"{result['case']:<24} n={n:<8} {result['seconds'] * 1e3:10.2f} ms {result['peak_mb']:10.2f} MB",
+                  flush=True)
+    return results
+
+
+# 기준선과 같은 (사례, 크기) 끼리 비교 → 회귀 목록
+def compare(results, baseline):
+    stored = {(r["case"], r["n"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = stored.get((result["case"], result["n"]))
+        if old is None:
+            continue
+        slow = result["seconds"] / old["seconds"] if old["seconds"] >= MIN_COMPARE_S else 1.0
+        heavy = result["peak_mb"] / old["peak_mb"] if old["peak_mb"] > 1 else 1.0
+        if slow > TIME_TOLERANCE or heavy > MEMORY_TOLERANCE:
+            regressions.append((result["case"], result["n"], slow, heavy))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지 계산 벤치마크 (Streamlit 없이)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--case", nargs="+", help="이 이름으로 시작하는 사례만 (예: mst shelter)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", action="store_true", help=f"결과를 기준선으로 저장 ({BASELINE_PATH.name})")
+    parser.add_argument("--compare", action="store_true", help="기준선과 비교해 회귀가 있으면 종료 코드 1")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.case, args.repeat)
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline)
+        for name, n, slow, heavy in regressions:
+            print(f"회귀: {name} n={n} 시간 ×{slow:.2f} 메모리 ×{heavy:.2f}")
+        if not regressions:
+            print("회귀 없음")
+    if args.save:
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "results": results,
+        }, ensure_ascii=False, indent=1), encoding="utf-8")
+    return 1 if args.compare and regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,51 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = [ROOT / "main.py", *sorted((ROOT / "pages").glob("*.py"))]
+STARTUP_PATH = Path(__file__).resolve().parent / "startup.json"
+
+# 새 인터프리터에서 페이지를 두 번 실행: 첫 번째 = 콜드 (import·캐시 비어 있음), 두 번째 = 웜 재실행
+# (업로드가 필요한 페이지는 업로드 전 화면까지만 – 모듈 수준 import 비용을 본다)
+SCRIPT = """
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file({page!r}, default_timeout=300).run()
+cold = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+warm = time.perf_counter() - start
+print(json.dumps({{"cold": cold, "warm": warm, "error": bool(at.exception), "modules": len(sys.modules)}}))
+"""
+
+
+def measure(page):
+    out = subprocess.run([sys.executable, "-c", SCRIPT.format(root=str(ROOT), page=str(page))],
+                         cwd=ROOT, capture_output=True, text=True, timeout=600)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return {"page": page.stem, **result}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지별 콜드·웜 시작 시간 (Streamlit AppTest, 새 프로세스)")
+    parser.add_argument("--save", action="store_true", help=f"결과를 {STARTUP_PATH.name} 에 저장")
+    args = parser.parse_args(argv)
+
+    results = []
+    for page in PAGES:
+        result = measure(page)
+        results.append(result)
+        print(f"{result['page']:<20} 콜드 {result['cold'] * 1e3:8.0f} ms  웜 {result['warm'] * 1e3:8.0f} ms  "
+              f"모듈 {result['modules']:5d}{'  (오류)' if result['error'] else ''}", flush=True)
+    if args.save:
+        STARTUP_PATH.write_text(json.dumps(results, ensure_ascii=False, indent=1), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
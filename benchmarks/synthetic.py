@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# 한반도 대략 범위 (위도, 경도)
+LAT_RANGE = (34.0, 38.5)
+LON_RANGE = (126.0, 129.5)
+PROVINCES = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종",
+             "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]
+FIRE_CAUSES = ["기타(직접입력)", "입산자실화", "논밭두렁소각", "쓰레기소각", "담뱃불실화",
+               "성묘객실화", "작업장실화", "방화", "낙뢰", "주택화재비화"]
+
+
+def _coords(rng, n):
+    return rng.uniform(*LAT_RANGE, n), rng.uniform(*LON_RANGE, n)
+
+
+# 한반도 범위 안의 무작위 좌표 n 개 → (위도, 경도) – 질의점·위험 지점용
+def coords(n, seed=0):
+    return _coords(np.random.default_rng(seed), n)
+
+
+# pages/chemical_shelters.csv 와 같은 열
+def shelters(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lat, lon = _coords(rng, n)
+    province = rng.choice(PROVINCES, n)
+    return pd.DataFrame({
+        "대피장소명": [f"대피소{i}" for i in range(n)],
+        "세부위치명": rng.choice(["체육관", "강당", "주차장"], n),
+        "수용인원": rng.integers(50, 2000, n),
+        "도로명주소": [f"{p} 가상시 대피로 {i}" for i, p in enumerate(province)],
+        "위도": lat,
+        "경도": lon,
+        "설치년도": rng.integers(2000, 2024, n),
+        "설치형태": "화학사고",
+        "관리기관전화번호": "000-000-0000",
+        "관리기관명": [f"{p} 안전과" for p in province],
+        "데이터기준일자": "2024-01-01",
+    })
+
+
+# pages/fire_data.csv 와 같은 열 (날짜·시간이 나뉜 원본 형식)
+def fire_incidents(n, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("1990-01-01") + pd.to_timedelta(rng.integers(0, 35 * 365 * 24 * 60, n), unit="min")
+    end = start + pd.to_timedelta(rng.exponential(180, n).astype(int) + 10, unit="min")
+    province = rng.choice(PROVINCES, n)
+    weekdays = np.array(list("월화수목금토일"))
+    return pd.DataFrame({
+        "발생일시_년": start.year, "발생일시_월": start.month, "발생일시_일": start.day,
+        "발생일시_시간": start.strftime("%H:%M"), "발생일시_요일": weekdays[start.weekday],
+        "진화종료시간_년": end.year, "진화종료시간_월": end.month, "진화종료시간_일": end.day,
+        "진화종료시간_시간": end.strftime("%H:%M"),
+        "발생장소_관서": province, "발생장소_시도": province,
+        "발생장소_시군구": [f"시군구{i}" for i in rng.integers(0, 15, n)],
+        "발생장소_읍면": [f"읍면{i}" for i in rng.integers(0, 10, n)],
+        "발생장소_동리": [f"동리{i}" for i in rng.integers(0, 10, n)],
+        "발생원인_구분": rng.choice(["기", "입", "쓰", "담"], n),
+        "발생원인_세부원인": rng.choice(FIRE_CAUSES, n),
+        "발생원인_기타": "",
+        "피해면적_합계": np.round(rng.lognormal(-1, 1.5, n), 2),
+    })
+
+
+# ess_suitability_data_updated.csv 와 같은 열
+def ess_stations(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lat, lon = _coords(rng, n)
+    return pd.DataFrame({
+        "지점정보": [f"지점{i}({90 + i})" for i in range(n)],
+        "경도": lon,
+        "위도": lat,
+        "평균기온편차(°C)": np.round(rng.normal(1.5, 0.4, n), 1),
+        "강수량(mm)": np.round(rng.normal(1300, 250, n), 1),
+        "ESS_적합도": rng.random(n),
+    })
+
+
+# 행정안전부 성별·연령별 인구 표 형식 (행정구역 × "YYYY년MM월_남_0세" … 열)
+def census(n_regions, seed=0):
+    rng = np.random.default_rng(seed)
+    ages = [f"{a}세" for a in range(100)] + ["100세 이상"]
+    data = {"행정구역": [f"가상시 {i}동 ({1100000000 + i})" for i in range(n_regions)]}
+    for sex in ("남", "여"):
+        for label in ages:
+            data[f"2024년05월_{sex}_{label}"] = rng.integers(0, 500, n_regions)
+    return pd.DataFrame(data)
+
+
+# 종가 넓은 표 (날짜 × 종목), 기하 브라운 운동
+def prices(days, tickers=20, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0003, 0.02, (days, tickers))
+    index = pd.bdate_range("2000-01-03", periods=days, name="Date")
+    return pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=index,
+                        columns=[f"T{j:02d}" for j in range(tickers)])
@@ -4,3 +4,13 @@ name = st.text_input('이름을 입력해주세요 : ')
 menu = st.selectbox('좋아하는 음식을 선택해주세요:', ['망고빙수','아몬드봉봉'])
 if st.button('인사말 생성') : 
   st.write(name+'님! 당신이 좋아하는 음식은 '+menu+'이군요?! 저도 좋아요!!')
+
+# ⏱️ 페이지별 콜드/웜 재실행 시간과 백그라운드 예열 현황 (이 서버 프로세스 기준)
+from utils import profiling, warmup
+with st.expander('⏱️ 페이지 로딩 시간'):
+  st.dataframe(profiling.page_latency(), hide_index=True)
+  warm = warmup.timings()
+  st.caption('예열 ' + ('완료' if warmup.done() else '진행 중') + ' – 무거운 모듈 import · 데이터셋 캐시 (ms)')
+  st.dataframe({'항목': list(warm), '소요(ms)': [None if s is None else round(s * 1e3, 1) for s in warm.values()]},
+               hide_index=True)
+warmup.start()
@@ -1,8 +1,10 @@
 import streamlit as st
+from utils import profiling
 
 st.set_page_config(page_title="MBTI 분석기", layout="centered")
 
 st.title("🧠 나의 MBTI 분석기")
+profiling.begin("00_mbti")
 st.markdown("당신의 성격을 간단한 설문을 통해 분석해보세요!")
 
 # 질문 세트 정의
@@ -63,3 +65,5 @@ if st.button("MBTI 결과 분석하기"):
 
     st.markdown("---")
     st.caption("⚠️ 이 분석은 간단한 테스트이며 공식 MBTI 검사와는 다를 수 있습니다.")
+
+profiling.finish()
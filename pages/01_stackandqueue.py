@@ -1,91 +1,81 @@
+import random
+
 import streamlit as st
-import plotly.graph_objects as go
+import pandas as pd
+import plotly.express as px
+from utils import profiling
+from utils.plot import block_figure
+from utils.structures import PriorityQueue, Queue, Stack, operation_timings
 
 st.set_page_config(page_title="스택과 큐 시각화", layout="centered")
 st.title("📚 Stack & Queue 시각화")
+profiling.begin("01_stackandqueue")
+
+# 화면에 그리는 최대 칸 수 (나머지는 개수만 표시)
+WINDOW = 50
 
-# 초기 상태 설정
-if "stack" not in st.session_state:
-    st.session_state.stack = []
-if "queue" not in st.session_state:
-    st.session_state.queue = []
+# 초기 상태 설정 – ✅ 자료구조: deque 기반 스택/큐, heapq 기반 우선순위 큐
+STRUCTURES = {"Stack": Stack, "Queue": Queue, "Priority Queue": PriorityQueue}
+for name, cls in STRUCTURES.items():
+    if not isinstance(st.session_state.get(name), cls):
+        st.session_state[name] = cls()
 
 # UI
 st.sidebar.header("📥 조작 패널")
-data_structure = st.sidebar.radio("자료구조 선택", ("Stack", "Queue"))
-element = st.sidebar.text_input("추가할 값", key="element")
+data_structure = st.sidebar.radio("자료구조 선택", list(STRUCTURES))
+structure = st.session_state[data_structure]
+element = st.sidebar.text_input("추가할 값 (쉼표로 여러 개)", key="element")
+priority = None
+if data_structure == "Priority Queue":
+    priority = st.sidebar.number_input("우선순위 (작을수록 먼저, 숫자 값은 값 자체가 우선순위)", value=0.0)
+
+
+def as_priority(value):
+    try:
+        return float(value)
+    except ValueError:
+        return priority
+
 
 if st.sidebar.button("➕ 추가"):
-    if element:
-        if data_structure == "Stack":
-            st.session_state.stack.append(element)
-        else:
-            st.session_state.queue.append(element)
+    values = [v.strip() for v in element.split(",") if v.strip()]
+    if data_structure == "Priority Queue":
+        structure.push_many(values, [as_priority(v) for v in values])
+    else:
+        structure.push_many(values)
 
 if st.sidebar.button("➖ 삭제"):
-    if data_structure == "Stack" and st.session_state.stack:
-        st.session_state.stack.pop()
-    elif data_structure == "Queue" and st.session_state.queue:
-        st.session_state.queue.pop(0)
-
-# 시각화 함수
-def visualize_stack(stack):
-    fig = go.Figure()
-    height = len(stack)
-    for i, val in enumerate(reversed(stack)):
-        fig.add_shape(
-            type="rect",
-            x0=0, y0=i, x1=1, y1=i+1,
-            line=dict(color="black"),
-            fillcolor="skyblue"
-        )
-        fig.add_trace(go.Scatter(
-            x=[0.5],
-            y=[i + 0.5],
-            text=[val],
-            mode="text",
-            textfont=dict(size=18)
-        ))
-    fig.update_layout(
-        height=max(300, 60 * height),
-        width=300,
-        title="Stack (LIFO)",
-        xaxis=dict(showticklabels=False, range=[0, 1]),
-        yaxis=dict(showticklabels=False, range=[0, height]),
-        margin=dict(l=0, r=0, t=50, b=0)
-    )
-    return fig
+    if len(structure):
+        structure.pop()
 
-def visualize_queue(queue):
-    fig = go.Figure()
-    width = len(queue)
-    for i, val in enumerate(queue):
-        fig.add_shape(
-            type="rect",
-            x0=i, y0=0, x1=i+1, y1=1,
-            line=dict(color="black"),
-            fillcolor="lightgreen"
-        )
-        fig.add_trace(go.Scatter(
-            x=[i + 0.5],
-            y=[0.5],
-            text=[val],
-            mode="text",
-            textfont=dict(size=18)
-        ))
-    fig.update_layout(
-        height=200,
-        width=max(300, 100 * width),
-        title="Queue (FIFO)",
-        xaxis=dict(showticklabels=False, range=[0, width]),
-        yaxis=dict(showticklabels=False, range=[0, 1]),
-        margin=dict(l=0, r=0, t=50, b=0)
-    )
-    return fig
+st.sidebar.subheader("📦 대량 조작")
+bulk = st.sidebar.number_input("개수", min_value=1, max_value=1_000_000, value=1000, step=1000)
+col_add, col_pop = st.sidebar.columns(2)
+if col_add.button("무작위 추가"):
+    values = [random.randint(0, 999) for _ in range(int(bulk))]
+    structure.push_many(values)
+if col_pop.button("여러 개 삭제"):
+    structure.pop_many(int(bulk))
 
-# 시각화 출력
+# 시각화 출력 – 먼저 나올 것부터 WINDOW 칸만, 도형 목록 한 번 + 텍스트 트레이스 하나
+shown = structure.window(WINDOW)
+hidden = len(structure) - len(shown)
+st.caption(f"원소 수: {len(structure):,}")
 if data_structure == "Stack":
-    st.plotly_chart(visualize_stack(st.session_state.stack), use_container_width=True)
+    fig = block_figure(shown, False, "Stack (LIFO) – 위가 꼭대기", "skyblue", hidden)
+elif data_structure == "Queue":
+    fig = block_figure(shown, True, "Queue (FIFO) – 왼쪽이 앞", "lightgreen", hidden)
 else:
-    st.plotly_chart(visualize_queue(st.session_state.queue), use_container_width=True)
+    fig = block_figure(shown, True, "Priority Queue – 왼쪽이 다음 차례", "khaki", hidden)
+st.plotly_chart(fig, use_container_width=True)
+
+# ⏱️ 연산 시간 비교 – list.pop(0) 은 O(n), deque/힙은 O(1)/O(log n)
+with st.expander("⏱️ 연산 시간 비교 (크기별 1회 평균)"):
+    sizes = st.multiselect("구조 크기", [1_000, 10_000, 100_000, 1_000_000], default=[1_000, 10_000, 100_000])
+    if sizes and st.button("측정 실행"):
+        timings = pd.DataFrame(operation_timings(sorted(sizes)))
+        st.plotly_chart(px.line(timings, x="크기", y="1회 평균(µs)", color="연산", markers=True, log_x=True, log_y=True),
+                        use_container_width=True)
+        st.dataframe(timings.pivot(index="크기", columns="연산", values="1회 평균(µs)").round(3))
 
+profiling.finish()
@@ -1,32 +1,39 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from utils import profiling
+from utils.data import load_csv
+from utils.population import build_cube
 
-# 데이터 로드
-df = pd.read_csv("people_gender.csv", encoding="cp949")
+profiling.begin("02_folium")
+
+
+# 데이터 로드 + 인구 큐브 전처리 (파일당 한 번)
+@profiling.cached(st.cache_resource)
+def get_cube(path):
+    return build_cube(load_csv(path), sexes=("남", "여"))
+
+
+cube = get_cube("people_gender.csv")
 
 # 지역 선택
-regions = df[df["행정구역"].str.contains("\\(")]["행정구역"].unique()
+regions = [r for r in cube.regions if "(" in r]
 selected_region = st.selectbox("지역 선택", regions)
 
 # 연령대 선택
 age_min, age_max = st.slider("연령대 범위 선택", min_value=0, max_value=100, value=(0, 100), step=5)
 
-# 선택한 지역의 데이터만 추출
-region_data = df[df["행정구역"] == selected_region].iloc[0]
-
-# 남성과 여성 컬럼 분리
-male_cols = [col for col in df.columns if "남_" in col and "세" in col]
-female_cols = [col for col in df.columns if "여_" in col and "세" in col]
-ages = [int(col.split("_")[-1].replace("세", "").replace(" 이상", "100")) for col in male_cols]
-
-# 필터링 및 숫자 정리
-male_values = [(age, int(str(region_data[col]).replace(",", ""))) for age, col in zip(ages, male_cols) if age_min <= age <= age_max]
-female_values = [(age, -int(str(region_data[col]).replace(",", ""))) for age, col in zip(ages, female_cols) if age_min <= age <= age_max]
+# 선택한 지역·연령 구간 추출 (지역 → 행 번호 사전, 연령 → 이진 탐색)
+lo, hi = cube.age_span(age_min, age_max)
+male, female = cube.slice(selected_region, lo, hi)
+ages = cube.ages[lo:hi]
 
 # 시각화용 데이터프레임 생성
-df_plot = pd.DataFrame(male_values + female_values, columns=["연령", "인구수"])
-df_plot["성별"] = ["남성"] * len(male_values) + ["여성"] * len(female_values)
+df_plot = pd.DataFrame({
+    "연령": list(ages) * 2,
+    "인구수": list(male) + list(-female),
+    "성별": ["남성"] * len(ages) + ["여성"] * len(ages),
+})
 
 # 인구 피라미드 그리기
 fig = px.bar(df_plot, x="인구수", y="연령", color="성별", orientation="h",
@@ -35,3 +42,17 @@ fig.update_layout(yaxis=dict(autorange="reversed"))
 
 # 출력
 st.plotly_chart(fig)
+
+# 여러 지역 비교 (연령 구간 합 = 누적합 뺄셈)
+compare = st.multiselect("비교할 지역", regions, default=[selected_region])
+if compare:
+    totals = cube.range_sum(compare, lo, hi)
+    df_compare = pd.DataFrame({
+        "지역": compare * 2,
+        "인구수": list(totals[:, 0]) + list(totals[:, 1]),
+        "성별": ["남성"] * len(compare) + ["여성"] * len(compare),
+    })
+    st.plotly_chart(px.bar(df_compare, x="지역", y="인구수", color="성별", barmode="group",
+                           title=f"{age_min}~{age_max}세 인구 비교"))
+
+profiling.finish()
@@ -1,18 +1,26 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from utils import profiling
+from utils.data import load_csv
+from utils.population import build_cube
 
-# 📁 데이터 로딩
-df = pd.read_csv("data.csv", encoding="cp949")
+profiling.begin("03_plotlytest")
+
+
+# 📁 데이터 로딩 + 연령 구간 큐브 전처리 (파일당 한 번)
+@profiling.cached(st.cache_resource)
+def get_cube(path):
+    return build_cube(load_csv(path), sexes=("계",))
 
-# 📍 지역 선택
-region = st.selectbox("📍 지역을 선택하세요", df['행정구역'].unique())
 
-# ✅ 연령 구간 컬럼만 필터링
-age_cols = [col for col in df.columns if '세' in col and '계' in col]
+cube = get_cube("data.csv")
+
+# 📍 지역 선택
+region = st.selectbox("📍 지역을 선택하세요", cube.regions)
 
-# 🔢 슬라이더용 연령 구간 리스트 생성
-age_labels = [col.split('_')[-1] for col in age_cols]  # ex) 0~9세, 10~19세...
+# 🔢 슬라이더용 연령 구간 리스트 (ex) 0~9세, 10~19세...)
+age_labels = cube.labels
 selected_range = st.slider(
     "🎚️ 시각화할 연령 구간을 선택하세요",
     min_value=0,
@@ -21,14 +29,10 @@ selected_range = st.slider(
     format="%d단계"
 )
 
-# 📌 선택 지역 행 가져오기
-row = df[df['행정구역'] == region].iloc[0]
-
-# 🧹 인구 수 전처리
-selected_labels = age_labels[selected_range[0]:selected_range[1]+1]
-cted_range[1]+1]
-selected_cols = age_cols[selected_range[0]:selected_range[1]+1]
-population = row[selected_cols].astype(str).str.replace(',', '').astype(int)
+# 📌 선택 지역·구간 인구 (큐브에서 바로 슬라이스)
+lo, hi = selected_range[0], selected_range[1]+1
+selected_labels = age_labels[lo:hi]
+population = cube.slice(region, lo, hi)[0]
 
 # 📊 데이터프레임 구성
 df_plot = pd.DataFrame({
@@ -40,3 +44,18 @@ df_plot = pd.DataFrame({
 fig = px.bar(
     df_plot,
     x="연령구간",
+    y="인구수",
+    title=f"{region} 연령대별 인구",
+)
+
+# 출력
+st.plotly_chart(fig)
+
+# 🔍 여러 지역 비교 – 선택 구간 합계 (누적합 뺄셈)
+compare = st.multiselect("비교할 지역", cube.regions, default=[region])
+if compare:
+    totals = cube.range_sum(compare, lo, hi)[:, 0]
+    st.plotly_chart(px.bar(pd.DataFrame({"지역": compare, "인구수": totals}), x="지역", y="인구수",
+                           title=f"{selected_labels[0]} ~ {selected_labels[-1]} 인구 합계 비교"))
+
+profiling.finish()
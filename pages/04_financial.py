@@ -1,8 +1,15 @@
 import streamlit as st
-import yfinance as yf
 import plotly.express as px
 import pandas as pd
+import time
 from datetime import datetime, timedelta
+from utils.analytics import (correlation, cumulative_returns, daily_returns, drawdown, portfolio_equity,
+                             rolling_max_drawdown, rolling_returns, rolling_volatility, summary)
+from utils import profiling
+from utils.data import content_key, load_csv
+from utils.market import PriceStore, SyntheticSource, YahooSource
+from utils.plot import line_figure
+from utils.stream import BarReplay, replay_bars
 
 # 시가총액 상위 10개 기업
 companies = {
@@ -19,31 +26,49 @@ companies = {
 }
 
 st.title("📈 글로벌 시가총액 Top 10 기업 주가 및 누적 수익률 시각화")
+profiling.begin("04_financial")
+
+sources = {"Yahoo Finance": YahooSource, "로컬 합성 데이터 (오프라인)": SyntheticSource}
+source_name = st.sidebar.radio("데이터 소스", list(sources.keys()))
+replay_mode = st.sidebar.toggle("⏯️ 리플레이(스트리밍) 모드")
+
+# 리플레이 화면 갱신 주기 (초)
+REPLAY_TICK = 0.5
+
+
+# 📦 로컬 가격 저장소 – 이미 받은 날짜는 다시 받지 않음
+@profiling.cached(st.cache_resource)
+def get_store(source_name):
+    return PriceStore(sources[source_name]())
+
+
+# 10개 기업 전체의 날짜 × 기업 종가 행렬 (하루 단위로 갱신)
+@profiling.cached(st.cache_data(ttl=3600, show_spinner="주가 데이터 불러오는 중..."))
+def load_closes(source_name, start_date, end_date):
+    closes = get_store(source_name).closes(list(companies.values()), start_date, end_date)
+    closes.columns = list(companies.keys())
+    return closes
+
 
 selected = st.multiselect("기업 선택", list(companies.keys()), default=["Apple (AAPL)", "Microsoft (MSFT)"])
 if not selected:
     st.warning("최소 1개 이상의 기업을 선택하세요.")
     st.stop()
 
-tickers = [companies[name] for name in selected]
-end_date = datetime.today()
+end_date = datetime.today().date()
 start_date = end_date - timedelta(days=365)
 
-# yfinance 데이터 다운로드
-raw_data = yf.download(tickers, start=start_date, end=end_date, group_by="ticker", auto_adjust=True)
-
-# 기업별 주가 데이터 정리
-df_close = pd.DataFrame()
-for name in selected:
-    ticker = companies[name]
-    try:
-        if len(tickers) == 1:
-            # 단일 종목은 컬럼 구조 없음
-            df_close[name] = raw_data["Close"]
-        else:
-            df_close[name] = raw_data[ticker]["Close"]
-    except Exception as e:
-        st.warning(f"{name}의 데이터를 가져오지 못했습니다: {e}")
+try:
+    all_closes = load_closes(source_name, start_date, end_date)
+except Exception as e:
+    st.error(f"주가 데이터를 가져오지 못했습니다: {e}")
+    st.stop()
+
+# 기업 선택 = 열 슬라이스 (네트워크 요청 없음)
+df_close = all_closes[selected]
+for name in df_close.columns[df_close.isna().all()]:
+    st.warning(f"{name}의 데이터를 가져오지 못했습니다.")
+df_close = df_close.dropna(axis=1, how="all")
 
 # 유효 데이터 없으면 중단
 if df_close.empty:
@@ -53,16 +78,111 @@ if df_close.empty:
 # 결측 제거
 df_close = df_close.dropna()
 
+# ⏯️ 리플레이 모드 – 봉을 하나씩 흘려보내며 누적 통계만 갱신
+if replay_mode:
+    st.subheader("⏯️ 주가 리플레이")
+    replay_file = st.file_uploader("봉 데이터 CSV (Date + 종목별 종가 열, 비우면 선택한 기업 사용)", type="csv")
+    if replay_file:
+        bars = load_csv(replay_file)
+        bars = bars.set_index(bars.columns[0])
+    else:
+        bars = df_close
+    col_rate, col_window = st.columns(2)
+    rate = col_rate.slider("재생 속도 (봉/초)", 1, 100, 10)
+    window = col_window.slider("차트에 남길 최근 봉 수", 50, 1000, 250, step=50)
+
+    # 업로드 파일은 내용 해시로 구분 – 같은 이름으로 고친 파일을 올리면 처음부터 다시 재생
+    bars_id = content_key(replay_file.getvalue()) if replay_file else source_name
+    replay_key = (bars_id, tuple(bars.columns), len(bars), window)
+    col_play, col_pause, col_reset = st.columns(3)
+    if col_reset.button("⏮️ 처음부터") or st.session_state.get("replay_key") != replay_key:
+        st.session_state.replay_key = replay_key
+        st.session_state.replay = BarReplay(replay_bars(bars), bars.columns, window)
+        st.session_state.replay_playing = False
+    if col_play.button("▶️ 재생"):
+        st.session_state.replay_playing = True
+        st.session_state.replay_clock = time.monotonic()
+    if col_pause.button("⏸️ 일시정지"):
+        st.session_state.replay_playing = False
+
+    @st.fragment(run_every=REPLAY_TICK)
+    def replay_panel():
+        replay = st.session_state.replay
+        if st.session_state.replay_playing and not replay.finished:
+            # 지난 갱신 이후 흐른 시간만큼의 봉만 처리
+            due = int((time.monotonic() - st.session_state.replay_clock) * rate)
+            if due:
+                replay.step(due)
+                st.session_state.replay_clock += due / rate
+
+        stats = replay.stats
+        st.caption(f"처리한 봉 {stats.count:,} / {len(bars):,}" + (" · 재생 완료" if replay.finished else ""))
+        if stats.count:
+            st.dataframe(pd.DataFrame({
+                "누적 수익률": stats.cumulative_return(),
+                "고점 대비 낙폭": stats.drawdown(),
+                "일간 변동성": stats.volatility(),
+            }, index=replay.names).style.format("{:.2%}"))
+            stamps, values = replay.returns.view()
+            st.plotly_chart(line_figure(stamps, values * 100, replay.names, "누적 수익률 (%) – 리플레이", "수익률"),
+                            use_container_width=True)
+
+    replay_panel()
+    profiling.finish()  # 아래 분석 화면은 그리지 않으므로 여기서 프로파일 패널을 닫는다
+    st.stop()
+
+# 📐 날짜 × 기업 배열 (이후 계산은 모두 이 배열 위에서)
+dates = df_close.index
+names = list(df_close.columns)
+prices = df_close.to_numpy(dtype=float)
+returns = daily_returns(prices)
+
 # 📊 주가 시각화
 st.subheader("📊 주가 추이")
-df_price = df_close.reset_index().melt(id_vars="Date", var_name="기업", value_name="가격")
-fig_price = px.line(df_price, x="Date", y="가격", color="기업", title="최근 1년 주가 변화")
-st.plotly_chart(fig_price, use_container_width=True)
+st.plotly_chart(line_figure(dates, prices, names, "최근 1년 주가 변화", "가격"), use_container_width=True)
 
 # 📈 누적 수익률 시각화
 st.subheader("📈 누적 수익률 (%)")
-df_return = (df_close / df_close.iloc[0] - 1) * 100
-df_return_long = df_return.reset_index().melt(id_vars="Date", var_name="기업", value_name="수익률")
-fig_return = px.line(df_return_long, x="Date", y="수익률", color="기업", title="최근 1년 누적 수익률")
-st.plotly_chart(fig_return, use_container_width=True)
+st.plotly_chart(line_figure(dates, cumulative_returns(prices) * 100, names, "최근 1년 누적 수익률", "수익률"),
+                use_container_width=True)
+
+# 📋 요약 지표
+st.subheader("📋 기업별 요약")
+st.dataframe(pd.DataFrame(summary(prices), index=names).style.format("{:.2%}"))
+
+# 🔁 롤링 수익률 · 변동성
+st.subheader("🔁 롤링 수익률 / 변동성")
+window = st.slider("롤링 기간 (거래일)", 5, 120, 20)
+if len(prices) > window + 1:
+    col_ret, col_vol = st.columns(2)
+    col_ret.plotly_chart(line_figure(dates[window:], rolling_returns(prices, window) * 100, names,
+                                     f"{window}일 롤링 수익률 (%)", "수익률"), use_container_width=True)
+    col_vol.plotly_chart(line_figure(dates[window:], rolling_volatility(returns, window) * 100, names,
+                                     f"{window}일 롤링 변동성 (연환산, %)", "변동성"), use_container_width=True)
+
+# 📉 낙폭
+st.subheader("📉 고점 대비 낙폭 (%)")
+col_dd, col_rdd = st.columns(2)
+col_dd.plotly_chart(line_figure(dates, drawdown(prices) * 100, names, "낙폭", "낙폭"), use_container_width=True)
+if len(prices) >= window:
+    col_rdd.plotly_chart(line_figure(dates[window - 1:], rolling_max_drawdown(prices, window) * 100, names,
+                                     f"{window}일 롤링 최대 낙폭 (%)", "낙폭"), use_container_width=True)
+
+# 🔗 상관행렬
+if len(names) > 1:
+    st.subheader("🔗 일간 수익률 상관행렬")
+    st.plotly_chart(px.imshow(correlation(returns), x=names, y=names, zmin=-1, zmax=1,
+                              color_continuous_scale="RdBu_r", text_auto=".2f"), use_container_width=True)
+
+# 💼 가중 포트폴리오
+st.subheader("💼 가중 포트폴리오 자산 곡선")
+weight_cols = st.columns(len(names))
+weights = [col.number_input(name, min_value=0.0, value=1.0, step=0.5, key=f"w_{name}")
+           for col, name in zip(weight_cols, names)]
+if sum(weights) > 0:
+    rebalance = st.checkbox("매일 목표 비중으로 재조정", value=False)
+    equity = portfolio_equity(prices, weights, rebalance=rebalance)
+    st.plotly_chart(line_figure(dates, (equity - 1) * 100, ["포트폴리오"], "포트폴리오 누적 수익률 (%)", "수익률"),
+                    use_container_width=True)
 
+profiling.finish()
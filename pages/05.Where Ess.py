@@ -1,73 +1,123 @@
 import streamlit as st
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.neighbors import KDTree  # ✅ 알고리즘: K-d 트리 (2차원 좌표 탐색용 트리)
-import folium
-from streamlit_folium import st_folium
-import math
-
-# ✅ 알고리즘: Haversine 공식 – 위도/경도 간 거리(km) 계산 알고리즘
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    d_phi = math.radians(lat2 - lat1)
-    d_lambda = math.radians(lon2 - lon1)
-    a = math.sin(d_phi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(d_lambda/2)**2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-# ✅ 알고리즘: 선택 정렬 (Selection Sort)
-# ✅ 자료구조: 리스트 (list) – dict 리스트 형태로 변환 후 수동 정렬
-def selection_sort_top_n(df, key, top_n):
-    data = df.to_dict(orient='records')  # DataFrame → list[dict]
-    n = len(data)
-    for i in range(min(top_n, n)):
-        max_idx = i
-        for j in range(i + 1, n):
-            if data[j][key] > data[max_idx][key]:
-                max_idx = j
-        data[i], data[max_idx] = data[max_idx], data[i]  # swap
-    return pd.DataFrame(data[:top_n])
+from utils.data import load_csv
+from utils.spatial import get_index, neighbour_summary, site_grid  # ✅ 자료구조: Ball 트리 (haversine 거리, 데이터셋별 캐시)
+from utils.ranking import group_top_k, rank_with_ties, top_k
+from utils.scoring import CriteriaStats, score, top_k_frequency, weight_scenarios
+from utils.interpolate import MAX_KRIGING_POINTS, build_surface
+from utils.raster import image_overlay, raster_png
+from utils import profiling
+
+
+# ✅ 알고리즘: 부분 선택 (argpartition) 상위 k + 동점 처리 전체 순위 + 지역별 상위 k
+# ✅ 자료구조: 점수 numpy 배열 – dict 리스트로 바꾸지 않고 행 번호만 돌려준다
+# 점수(=가중치·데이터)가 같으면 재실행해도 캐시된 결과를 그대로 쓴다
+@profiling.cached(st.cache_data)
+def rank_stations(scores, k, groups=None):
+    ranks = rank_with_ties(scores)
+    top = top_k(scores, k, with_ties=True)
+    by_group = None if groups is None else group_top_k(groups, scores, k)
+    return ranks, top, by_group
+
+
+# 기준 열 정규화 통계는 데이터가 같으면 재사용 (가중치만 바뀌면 다시 계산하지 않음)
+@profiling.cached(st.cache_resource)
+def criteria_stats(matrix):
+    return CriteriaStats(matrix)
+
+
+# ✅ 알고리즘: 후보지 일괄 k-NN + 역거리 가중 – 후보지·점수가 같으면 캐시 재사용
+@profiling.cached(st.cache_data(show_spinner="후보지 일괄 평가 중..."))
+def screen_sites(station_lat, station_lon, scores, site_lat, site_lon, k):
+    return neighbour_summary(get_index(station_lat, station_lon), site_lat, site_lon, scores, k=k)
+
+
+# ✅ 자료구조: 적합도 보간 격자 (IDW / 정규 크리깅) + 지도용 PNG – 점수·설정이 같으면 한 번만
+@profiling.cached(st.cache_resource(show_spinner="적합도 보간면 계산 중..."))
+def suitability_surface(station_lat, station_lon, scores, method, cell_m):
+    surface = build_surface(station_lat, station_lon, scores, cell_m=cell_m, method=method)
+    return surface, raster_png(surface.values, surface.bounds, cmap="RdYlGn")
+
+
+MAX_GRID_SITES = 500_000
+SURFACE_METHODS = {"역거리 가중 (IDW)": "idw", "정규 크리깅": "kriging"}
+
+METHOD_NAMES = {"곱 (기본)": "product", "가중합": "sum", "TOPSIS": "topsis"}
+DEFAULT_COST = ("평균기온편차(°C)", "강수량(mm)")
+
 
 st.set_page_config(layout="wide")
 st.title("📍 ESS 적합도 분석 ")
 st.caption("직접 위치를 정해 근접 위치에서 적합도를 정해줍니다 !")
+profiling.begin("05.Where Ess")
 
 uploaded_file = st.file_uploader("CSV 파일 업로드", type=["csv"])
 if uploaded_file:
-    df = pd.read_csv(uploaded_file)
+    # 지도 라이브러리는 파일이 올라와 실제로 그릴 때만 import
+    import folium
+    from streamlit_folium import st_folium
+
+    df = load_csv(uploaded_file)
 
     st.subheader("📊 데이터프레임 미리보기")
     st.dataframe(df.head())
 
-    # ✅ 알고리즘: Min-Max 정규화
-    # ✅ 자료구조: DataFrame (2차원 테이블)
-    scaler = MinMaxScaler()
-    df['온도편차(정규화)'] = scaler.fit_transform(df[['평균기온편차(°C)']])
-    df['강수량(정규화)'] = scaler.fit_transform(df[['강수량(mm)']])
-    df['ESS_적합도'] = (1 - df['온도편차(정규화)']) * (1 - df['강수량(정규화)'])
+    # ✅ 알고리즘: 다기준 점수 (열 전체 Min-Max 정규화 한 번 + 가중 곱/가중합/TOPSIS)
+    # ✅ 자료구조: 기준 행렬 (n × m numpy 배열)
+    st.subheader("⚖️ 적합도 기준 설정")
+    candidates = [c for c in df.select_dtypes("number").columns if c not in ("위도", "경도", "ESS_적합도")]
+    criteria = st.multiselect("기준 열", candidates, default=[c for c in DEFAULT_COST if c in candidates])
+    if not criteria:
+        st.warning("기준 열을 하나 이상 고르세요.")
+        st.stop()
+    weights, directions = [], []
+    for col, name in zip(st.columns(len(criteria)), criteria):
+        weights.append(col.slider(f"{name} 가중치", 0.0, 5.0, 1.0, 0.1))
+        better = col.radio(f"{name} 방향", ["작을수록 좋음", "클수록 좋음"], index=0 if name in DEFAULT_COST else 1,
+                           key=f"dir_{name}")
+        directions.append(1 if better == "클수록 좋음" else -1)
+    method = METHOD_NAMES[st.radio("집계 방식", list(METHOD_NAMES), horizontal=True)]
+
+    stats = criteria_stats(df[criteria].to_numpy(dtype=float))
+    with profiling.span("적합도 점수"):
+        df['ESS_적합도'] = score(stats, weights, directions, method)
 
     # ✅ 알고리즘: 지도 클릭 기반 탐색
     # ✅ 자료구조: 위도/경도 배열 (2차원 numpy array)
     st.subheader("🖱️ 지도 클릭 → 주변 고적합도 추천")
+    col_m, col_c, col_o = st.columns(3)
+    surface_method = SURFACE_METHODS[col_m.radio("보간 방식", list(SURFACE_METHODS), horizontal=True)]
+    if surface_method == "kriging" and len(df) > MAX_KRIGING_POINTS:
+        st.warning(f"⚠️ 관측 지점이 {len(df):,}개로 크리깅 한도({MAX_KRIGING_POINTS:,}개)를 넘어 역거리 가중(IDW)으로 보간합니다.")
+        surface_method = "idw"
+    cell_km = col_c.slider("보간 격자 간격 (km)", 1, 20, 5)
+    show_surface = col_o.checkbox("지도에 보간면 표시", value=True)
+    surface, surface_png = suitability_surface(df["위도"].to_numpy(), df["경도"].to_numpy(),
+                                               df["ESS_적합도"].to_numpy(), surface_method, cell_km * 1000)
+
     base_map = folium.Map(location=[df['위도'].mean(), df['경도'].mean()], zoom_start=7)
     folium.TileLayer("cartodb positron").add_to(base_map)
-    clicked = st_folium(base_map, height=400, returned_objects=["last_clicked"])
+    if show_surface:
+        image_overlay(surface_png, surface.bounds, name="ESS 적합도 보간면").add_to(base_map)
+    profiling.payload("기본 지도 (folium HTML)", base_map)
+    with profiling.span("st_folium 기본 지도"):
+        clicked = st_folium(base_map, height=400, returned_objects=["last_clicked"])
 
     if clicked and clicked["last_clicked"]:
         click_lat = clicked["last_clicked"]["lat"]
         click_lon = clicked["last_clicked"]["lng"]
         st.success(f"선택한 좌표: 위도 {click_lat:.4f}, 경도 {click_lon:.4f}")
+        estimate = surface.lookup(click_lat, click_lon)[0]
+        if estimate == estimate:  # 보간 격자 밖이면 NaN
+            st.metric("보간 추정 적합도 (선택 위치)", f"{estimate:.3f}")
 
-        # ✅ 알고리즘: K-d 트리 최근접 이웃 탐색 (탐색 알고리즘)
-        # ✅ 자료구조: KDTree (sklearn 구현체)
-        tree = KDTree(df[['위도', '경도']].values, leaf_size=2)
-        dist, idx = tree.query([[click_lat, click_lon]], k=5)
+        # ✅ 알고리즘: Ball 트리 최근접 이웃 탐색 (대원 거리)
+        # ✅ 자료구조: 공유 공간 인덱스 – 같은 데이터셋이면 클릭마다 트리를 다시 만들지 않음
+        dist, idx = get_index(df['위도'], df['경도']).knn(click_lat, click_lon, k=5)
 
         # ✅ 자료구조: DataFrame 슬라이싱 + 정렬
         nearby_df = df.iloc[idx[0]].copy()
-        nearby_df['거리(km 추정)'] = [
-            haversine(click_lat, click_lon, r['위도'], r['경도']) for _, r in nearby_df.iterrows()
-        ]
+        nearby_df['거리(km 추정)'] = dist[0] / 1000
         nearby_df = nearby_df.sort_values(by='ESS_적합도', ascending=False)
 
         st.subheader("📌 주변 추천 지점")
@@ -97,9 +147,84 @@ if uploaded_file:
             ).add_to(map2)
 
         st.subheader("📍 지도 시각화")
-        st_folium(map2, height=500)
+        profiling.payload("주변 지점 지도 (folium HTML)", map2)
+        with profiling.span("st_folium 주변 지점 지도"):
+            st_folium(map2, height=500)
+
+    # ✅ 부분 선택으로 ESS 적합도 순위 출력 (k 번째와 동점인 지점은 모두 표시)
+    col_k, col_group = st.columns(2)
+    top_n = col_k.slider("상위 몇 개", 1, 50, 10)
+    group_options = ["(없음)", "위도 1° 구간"] + [c for c in df.select_dtypes(exclude="number").columns if c != "지점정보"]
+    group_col = col_group.selectbox("지역별 순위 기준", group_options)
+    if group_col == "(없음)":
+        groups = None
+    elif group_col == "위도 1° 구간":
+        groups = df["위도"].floordiv(1).astype(int).astype(str).add("°N").to_numpy()
+    else:
+        groups = df[group_col].astype(str).to_numpy()
+    ranks, top, by_group = rank_stations(df["ESS_적합도"].to_numpy(), top_n, groups)
+    df["순위"] = ranks
+
+    st.subheader(f"🏆 ESS 적합도 순위 Top {top_n}")
+    st.dataframe(df.iloc[top][["순위", "지점정보", "ESS_적합도", "평균기온편차(°C)", "강수량(mm)"]])
+
+    if by_group is not None:
+        st.subheader(f"🗾 {group_col}별 Top {top_n}")
+        grouped = df.iloc[by_group][["순위", "지점정보", "ESS_적합도"]]
+        grouped.insert(0, group_col, groups[by_group])
+        st.dataframe(grouped, hide_index=True)
+
+    # 🎛️ 가중치 민감도 – 가중치를 흔든 시나리오 수백 개를 행렬 곱 한 번으로 채점
+    with st.expander("🎛️ 가중치 민감도 분석"):
+        col_s, col_p, col_k = st.columns(3)
+        n_scenarios = col_s.slider("시나리오 수", 10, 1000, 200, 10)
+        spread = col_p.slider("가중치 변동 폭 (±비율)", 0.1, 0.9, 0.5, 0.1)
+        sens_k = col_k.slider("상위 몇 개 안에 드는지", 1, 20, 5)
+        scenarios = weight_scenarios(weights, n_scenarios, spread)
+        with profiling.span("가중치 민감도"):
+            frequency = top_k_frequency(score(stats, scenarios, directions, method), sens_k)
+        robust = df[["지점정보", "순위", "ESS_적합도"]].assign(**{f"Top {sens_k} 포함 비율": frequency})
+        st.dataframe(robust[frequency > 0].sort_values(f"Top {sens_k} 포함 비율", ascending=False), hide_index=True)
+
+    # 📦 후보지 일괄 평가 – 클릭 대신 후보지 목록(또는 격자) 전체를 한 번에
+    st.markdown("---")
+    st.subheader("📦 후보지 일괄 평가")
+    source = st.radio("후보지", ["CSV 업로드 (위도·경도 열)", "관측 지점 범위 격자"], horizontal=True)
+    k_sites = st.slider("참고할 최근접 관측 지점 수", 1, min(20, len(df)), min(5, len(df)))
+    sites = None
+    if source.startswith("CSV"):
+        site_file = st.file_uploader("후보지 CSV 업로드", type=["csv"], key="sites")
+        if site_file:
+            sites = load_csv(site_file)
+            if not {"위도", "경도"}.issubset(sites.columns):
+                st.error("❌ 후보지 CSV에 '위도', '경도' 열이 있어야 합니다.")
+                sites = None
+    else:
+        spacing_km = st.slider("격자 간격 (km)", 1.0, 50.0, 10.0, 1.0)
+        grid_lat, grid_lon = site_grid(df["위도"].min(), df["경도"].min(), df["위도"].max(), df["경도"].max(),
+                                       spacing_km * 1000)
+        if len(grid_lat) > MAX_GRID_SITES:
+            st.warning(f"격자 점이 {len(grid_lat):,}개로 너무 많습니다. 간격을 늘리세요.")
+        else:
+            sites = pd.DataFrame({"위도": grid_lat, "경도": grid_lon})
+
+    if sites is not None:
+        summary = screen_sites(df["위도"].to_numpy(), df["경도"].to_numpy(), df["ESS_적합도"].to_numpy(),
+                               sites["위도"].to_numpy(dtype=float), sites["경도"].to_numpy(dtype=float), k_sites)
+        names = df["지점정보"].to_numpy()
+        result = sites.assign(**{
+            "적합도(역거리 가중)": summary["idw"],
+            "적합도(이웃 평균)": summary["mean"],
+            "적합도(보간면)": surface.lookup(sites["위도"].to_numpy(dtype=float), sites["경도"].to_numpy(dtype=float)),
+            "최근접 지점": names[summary["nearest"]],
+            "최근접 거리(km)": summary["nearest_m"] / 1000,
+            "이웃 중 최고 지점": names[summary["best"]],
+            "최고 지점 적합도": summary["best_value"],
+            "최고 지점 거리(km)": summary["best_m"] / 1000,
+        }).sort_values("적합도(역거리 가중)", ascending=False)
+        st.caption(f"후보지 {len(result):,}곳 평가 완료 (상위 1,000곳 표시)")
+        st.dataframe(result.head(1000).round(4), hide_index=True)
+        st.download_button("⬇️ 전체 결과 CSV 내려받기", result.to_csv(index=False).encode("utf-8-sig"),
+                           file_name="ess_candidate_sites.csv", mime="text/csv")
 
-    # ✅ 선택 정렬 알고리즘으로 ESS 적합도 순위 출력
-    st.subheader("🏆 ESS 적합도 순위 Top 10")
-    sorted_top10 = selection_sort_top_n(df, 'ESS_적합도', 10)
-    st.dataframe(sorted_top10[['지점정보', 'ESS_적합도', '평균기온편차(°C)', '강수량(mm)']])
+profiling.finish()
@@ -1,13 +1,22 @@
 import streamlit as st
 import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-from geopy.distance import geodesic
+import numpy as np
+import plotly.graph_objects as go
 import re
-import pydeck as pdk
+from utils import profiling
+from utils.data import content_key, load_csv
+from utils.mst import IncrementalMST
+from utils.plot import segments_xy, sample_pairs
+from utils.spatial import get_index
 
 st.set_page_config(page_title="MST 통신망 최적화 시뮬레이터", layout="wide")
 st.title("📡 MST 통신망 최적 구축 경로 시뮬레이션")
+profiling.begin("06_MST")
+
+# 기지국 수가 이보다 많으면 '자동' 모드에서 희소 후보 그래프를 사용
+SPARSE_THRESHOLD = 2000
+# 새 기지국을 추가할 때 이 거리(m) 안에 기존 기지국이 있으면 중복으로 본다
+DUPLICATE_RADIUS_M = 10
 
 # --- DMS to Decimal Converter ---
 def dms_to_decimal(dms):
@@ -29,10 +38,7 @@ st.markdown("""
 uploaded_file = st.file_uploader("📂 CSV 파일 업로드", type=["csv"])
 
 if uploaded_file:
-    try:
-        df = pd.read_csv(uploaded_file, encoding="utf-8")
-    except:
-        df = pd.read_csv(uploaded_file, encoding="cp949")
+    df = load_csv(uploaded_file)
 
     if {"기지국", "위도", "경도", "전송속도"}.issubset(df.columns):
 
@@ -51,42 +57,103 @@ if uploaded_file:
             st.warning("⚠️ 최소 2개 이상의 기지국이 필요합니다.")
             st.stop()
 
-        # --- Build graph with distance and speed ---
-        edges = []
-        coord_dict = {}
-        for i in range(len(df)):
-            coord_dict[df.loc[i, '기지국']] = (df.loc[i, '위도'], df.loc[i, '경도'])
-            for j in range(i + 1, len(df)):
-                coord1 = (df.loc[i, '위도'], df.loc[i, '경도'])
-                coord2 = (df.loc[j, '위도'], df.loc[j, '경도'])
-                distance = geodesic(coord1, coord2).meters
-                speed_i = float(df.loc[i, '전송속도'])
-                speed_j = float(df.loc[j, '전송속도'])
-                avg_speed = (speed_i + speed_j) / 2
-                weight = distance / avg_speed
-                edges.append((df.loc[i, '기지국'], df.loc[j, '기지국'], weight))
-
-        G = nx.Graph()
-        G.add_weighted_edges_from(edges)
-        mst = nx.minimum_spanning_tree(G, algorithm="prim")
+        # --- Build MST with distance and speed (vectorized, O(n) memory) ---
+        mode = st.radio(
+            "MST 계산 방식",
+            ["자동", "완전 그래프 (Prim)", "희소 후보 그래프 (k-NN/들로네 + Kruskal)"],
+            horizontal=True,
+        )
+        if mode == "자동":
+            mode = "완전 그래프 (Prim)" if len(df) <= SPARSE_THRESHOLD else "희소 후보 그래프 (k-NN/들로네 + Kruskal)"
+
+        sparse = mode != "완전 그래프 (Prim)"
+
+        # 같은 파일·같은 방식이면 세션에 저장된 증분 MST 를 그대로 사용
+        state_key = (content_key(uploaded_file.getvalue()), mode)
+        if st.session_state.get("mst_key") != state_key:
+            st.session_state.mst_key = state_key
+            with profiling.span("MST 구성"):
+                st.session_state.mst_state = IncrementalMST.build(
+                    df['기지국'].tolist(),
+                    df['위도'].to_numpy(dtype=float),
+                    df['경도'].to_numpy(dtype=float),
+                    df['전송속도'].astype(float).to_numpy(),
+                    sparse=sparse,
+                )
+        state = st.session_state.mst_state
+
+        if sparse and state.info.get("method") == "prim":
+            st.caption(
+                f"⚠️ 희소 후보 그래프로 MST 를 검증하지 못해 (검증 라운드 {state.info['rounds']}회) "
+                "완전 그래프 Prim 으로 대신 계산했습니다."
+            )
+        elif sparse:
+            st.caption(
+                f"후보 간선 {state.info['candidates']:,}개 · 방식: {state.info['method']} · "
+                f"검증 라운드 {state.info['rounds']}회 (완전 그래프 MST 와 동일함을 확인)"
+            )
+
+        # --- 기지국 편집 패널 (증분 MST 갱신) ---
+        with st.expander("✏️ 기지국 편집 (추가 · 삭제 · 전송속도 변경)"):
+            alive_ids = np.flatnonzero(state.alive).tolist()
+            label = lambda i: f"{state.names[i]} ({state.speed[i]:g} Mbps)"
+            col_add, col_del, col_speed = st.columns(3)
+
+            with col_add.form("mst_add"):
+                new_name = st.text_input("기지국 이름")
+                new_lat = st.number_input("위도", value=float(state.lat[alive_ids].mean()), format="%.6f")
+                new_lon = st.number_input("경도", value=float(state.lon[alive_ids].mean()), format="%.6f")
+                new_speed = st.number_input("전송속도", min_value=0.1, value=float(np.median(state.speed[alive_ids])))
+                if st.form_submit_button("➕ 추가") and new_name:
+                    # 같은 자리(반경 DUPLICATE_RADIUS_M)에 이미 기지국이 있으면 길이 0 링크가 생기므로 막는다
+                    dup_idx, _ = get_index(state.lat[alive_ids], state.lon[alive_ids]).radius(
+                        new_lat, new_lon, DUPLICATE_RADIUS_M)
+                    if len(dup_idx):
+                        st.warning(f"⚠️ {DUPLICATE_RADIUS_M}m 안에 이미 '{state.names[alive_ids[dup_idx[0]]]}' 기지국이 있습니다.")
+                    else:
+                        state.add_node(new_name, new_lat, new_lon, new_speed)
+
+            with col_del.form("mst_remove"):
+                target = st.selectbox("삭제할 기지국", alive_ids, format_func=label)
+                if st.form_submit_button("➖ 삭제") and len(state) > 2:
+                    state.remove_node(target)
+
+            with col_speed.form("mst_speed"):
+                target = st.selectbox("변경할 기지국", alive_ids, format_func=label)
+                changed = st.number_input("새 전송속도", min_value=0.1, value=float(np.median(state.speed[alive_ids])))
+                if st.form_submit_button("🔁 변경"):
+                    state.set_speed(target, changed)
+
+        alive = np.flatnonzero(state.alive)
+        df = pd.DataFrame({
+            '기지국': [state.names[i] for i in alive],
+            '위도': state.lat[alive],
+            '경도': state.lon[alive],
+            '전송속도': state.speed[alive],
+        })
+        # 살아 있는 정점 번호 → df 행 번호
+        row_of = np.full(len(state.names), -1)
+        row_of[alive] = np.arange(len(alive))
+        src, dst, weight = state.edges()
+        src, dst = row_of[src], row_of[dst]
+        lat = df['위도'].to_numpy()
+        lon = df['경도'].to_numpy()
 
         st.subheader("📈 MST 결과 테이블")
-        mst_edges = [
-            {"From": u, "To": v, "Weight": round(d['weight'], 2)}
-            for u, v, d in mst.edges(data=True)
-        ]
-        st.dataframe(pd.DataFrame(mst_edges))
+        st.dataframe(pd.DataFrame({
+            "From": df['기지국'].to_numpy()[src],
+            "To": df['기지국'].to_numpy()[dst],
+            "Weight": np.round(weight, 2),
+        }))
 
         # --- 지도 위에 MST 연결선까지 시각화 ---
         st.subheader("🗺️ 지도 기반 MST 연결 시각화")
-        line_data = []
-        for u, v in mst.edges():
-            coord_u = coord_dict[u]
-            coord_v = coord_dict[v]
-            line_data.append({
-                "from_lat": coord_u[0], "from_lon": coord_u[1],
-                "to_lat": coord_v[0], "to_lon": coord_v[1]
-            })
+        line_data = pd.DataFrame({
+            "from_lat": lat[src], "from_lon": lon[src],
+            "to_lat": lat[dst], "to_lon": lon[dst],
+        })
+
+        import pydeck as pdk  # 지도를 그릴 때만 import
 
         midpoint = df[['위도', '경도']].mean().values.tolist()
 
@@ -118,14 +185,28 @@ if uploaded_file:
         ))
 
         # --- Graph Visualization ---
+        # 간선 종류마다 NaN 구분 선분 트레이스 하나씩만 사용
         st.subheader("📊 네트워크 그래프")
-        pos = {row['기지국']: (row['경도'], row['위도']) for _, row in df.iterrows()}
-
-        fig, ax = plt.subplots(figsize=(10, 8))
-        nx.draw(G, pos, with_labels=True, node_color='lightgray', edge_color='gray', node_size=500, ax=ax)
-        nx.draw(mst, pos, with_labels=True, node_color='skyblue', edge_color='blue', width=2, node_size=700, ax=ax)
-        plt.title("MST 네트워크 그래프")
-        st.pyplot(fig)
+        show_background = st.checkbox("전체 그래프 간선도 함께 보기 (표본)", value=False)
+        edge_cap = st.slider("배경 간선 최대 개수", 1_000, 50_000, 5_000, step=1_000, disabled=not show_background)
+
+        fig = go.Figure()
+        if show_background:
+            bg_u, bg_v = sample_pairs(len(df), edge_cap)
+            bg_x, bg_y = segments_xy(lon[bg_u], lat[bg_u], lon[bg_v], lat[bg_v])
+            fig.add_trace(go.Scattergl(x=bg_x, y=bg_y, mode="lines", name=f"전체 그래프 ({len(bg_u):,}개 간선)",
+                                       line=dict(color="lightgray", width=1), hoverinfo="skip"))
+        mst_x, mst_y = segments_xy(lon[src], lat[src], lon[dst], lat[dst])
+        fig.add_trace(go.Scattergl(x=mst_x, y=mst_y, mode="lines", name="MST",
+                                   line=dict(color="blue", width=2), hoverinfo="skip"))
+        fig.add_trace(go.Scattergl(x=lon, y=lat, mode="markers", name="기지국",
+                                   marker=dict(color="skyblue", size=8, line=dict(color="black", width=1)),
+                                   text=df['기지국'], hoverinfo="text"))
+        fig.update_layout(title="MST 네트워크 그래프", height=700,
+                          xaxis=dict(title="경도"), yaxis=dict(title="위도", scaleanchor="x"))
+        st.plotly_chart(profiling.payload("네트워크 그래프", fig), use_container_width=True)
 
     else:
         st.error("❗ CSV 파일에 '기지국', '위도', '경도', '전송속도' 열이 필요합니다.")
+
+profiling.finish()
@@ -1,82 +1,262 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
-from mpl_toolkits.mplot3d import Axes3D
-import folium
-from folium.plugins import HeatMap
-from streamlit_folium import st_folium
-from geopy.distance import geodesic
+from utils.spatial import get_index
+from utils.assignment import LP_MAX_SOURCES, assign_shelters
+from utils.data import content_key, load_csv
+from utils import fire_model, profiling
+from utils.geocode import FIRE_PLACE_COLUMNS, Geocoder
+from utils.raster import RiskGrid, image_overlay, raster_png, smooth
+from utils.routing import EvacuationField, risk_penalized_cost, road_graph_from_geojson, road_graph_from_pbf
 
 st.set_page_config(layout="wide")
 st.title("다중선형회귀를 통한 산불 위험도 예측 및 다익스트라 대피소 안내 시스템")
+profiling.begin("07_SDGS")
 
 # 📁 파일 업로드
 st.sidebar.header("📁 데이터 업로드")
 fire_file = st.sidebar.file_uploader("① 산불위험지역 CSV 업로드", type="csv")
 shelter_file = st.sidebar.file_uploader("② 대피소 위치 CSV 업로드", type="csv")
+road_file = st.sidebar.file_uploader("③ 도로망 GeoJSON / OSM PBF 업로드 (선택)", type=["geojson", "json", "pbf"])
+risk_alpha = st.sidebar.slider("위험 지역 회피 강도", 0.0, 10.0, 4.0, 0.5)
+risk_radius = st.sidebar.slider("위험 영향 반경 (m)", 100, 2000, 500, 100)
+heat_mode = st.sidebar.radio("히트맵 표시", ["자동", "점 히트맵", "격자 이미지"], horizontal=True)
+cell_m = st.sidebar.slider("격자 칸 크기 (m)", 50, 2000, 200, 50)
+
+# 점이 이보다 많으면 HeatMap 대신 격자 이미지 (HTML 에 점을 모두 싣지 않음)
+HEATMAP_MAX_POINTS = 5000
+
+st.sidebar.header("🔥 위험도 모델")
+risk_model = st.sidebar.radio("위험도 계산 방식", ["기상 선형회귀 (습도·풍량)", "과거 산불 학습 모델 (fire_data.csv)"])
+if risk_model.startswith("과거"):
+    when_date = st.sidebar.date_input("예측 날짜")
+    when_hour = st.sidebar.slider("예측 시각 (시)", 0, 23, 14)
+    st.sidebar.caption("산불 CSV에 '시도'·'시군구' 열이 있으면 지역별 위험도를 반영합니다.")
+
+
+# 🛣️ 도로망 그래프와 다익스트라 거리장은 입력이 같으면 재실행 시 다시 계산하지 않음
+@profiling.cached(st.cache_resource(show_spinner="도로망 그래프 구성 중..."))
+def load_road_graph(data, name):
+    if name.endswith(".pbf"):
+        import tempfile
+        with tempfile.NamedTemporaryFile(suffix=".osm.pbf") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            return road_graph_from_pbf(tmp.name)
+    return road_graph_from_geojson(data)
+
+
+# 🔥 학습된 위험도 모델은 세션 간 공유 (없으면 fire_data.csv 로 한 번 학습)
+@profiling.cached(st.cache_resource(show_spinner="산불 위험도 모델 불러오는 중..."))
+def load_fire_model():
+    return fire_model.load()
+
+
+# 🧭 지명 → 좌표 (지명 사전 트라이 + 디스크 캐시), 세션 간 공유
+@profiling.cached(st.cache_resource(show_spinner="지명 사전 불러오는 중..."))
+def get_geocoder():
+    return Geocoder()
+
+
+@profiling.cached(st.cache_resource)
+def fit_weather_model(humidity_diff, wind_speed):
+    from sklearn.linear_model import LinearRegression
+
+    X = np.column_stack((humidity_diff, wind_speed))
+    y = 50 + (1.5 * humidity_diff + 3.5 * wind_speed)
+    return LinearRegression().fit(X, y)
+
+
+# 🟥 위험도 → 위경도 격자 최댓값 → 번진 PNG 한 장 (크기는 격자 해상도로만 정해짐)
+@profiling.cached(st.cache_data(show_spinner="위험도 격자 이미지 생성 중..."))
+def risk_raster(lat, lon, risk, cell):
+    grid = RiskGrid.around(lat, lon, cell_m=cell)
+    values = smooth(grid.aggregate(lat, lon, risk, agg="max"), sigma=1.5)
+    return raster_png(values, grid.bounds), grid.bounds
+
+
+@profiling.cached(st.cache_data(show_spinner="대피소 배정 계산 중..."))
+def run_assignment(src_lat, src_lon, demand, shelter_lat, shelter_lon, capacity, method):
+    return assign_shelters(src_lat, src_lon, demand, shelter_lat, shelter_lon, capacity, method=method)
+
+
+# _graph 는 해시하지 않으므로 road_key (도로 파일 내용 해시) 로 캐시를 구분한다
+@profiling.cached(st.cache_resource(show_spinner="대피소 거리장 계산 중 (다중 출발점 다익스트라)..."))
+def build_evacuation_field(_graph, road_key, shelter_lat, shelter_lon, fire_lat, fire_lon, risk, radius, alpha):
+    cost = risk_penalized_cost(_graph, fire_lat, fire_lon, risk, radius_m=radius, alpha=alpha)
+    return EvacuationField(_graph, shelter_lat, shelter_lon, cost)
+
 
 if fire_file and shelter_file:
-    df = pd.read_csv(fire_file)
-    shelters = pd.read_csv(shelter_file)
+    # 지도 라이브러리는 파일이 올라와 실제로 그릴 때만 import (빈 화면·페이지 전환을 가볍게)
+    import folium
+    from folium.plugins import HeatMap
+    from streamlit_folium import st_folium
+
+    df = load_csv(fire_file)
+    shelters = load_csv(shelter_file)
+
+    # fire_data.csv 처럼 좌표 없이 발생장소 지명만 있으면 지오코딩해서 위도·경도를 채운다
+    if not {"위도", "경도"}.issubset(df.columns) and set(FIRE_PLACE_COLUMNS).issubset(df.columns):
+        geocoder = get_geocoder()
+        if geocoder.gazetteer.fallback:
+            st.info("ℹ️ 대피소 도로명주소로 만든 대략적인 지명 사전으로 지오코딩합니다. 읍면·동리 단위 일치가 "
+                    "적을 수 있습니다. 행정구역 좌표 CSV 를 pages/gazetteer.csv 에 두면 그것을 씁니다.")
+        with profiling.span("지오코딩"):
+            located = geocoder.geocode(df, FIRE_PLACE_COLUMNS)
+        df = df.join(located).dropna(subset=["위도", "경도"]).reset_index(drop=True)
+        df["시도"] = df["발생장소_시도"].astype(str).str.strip()
+        df["시군구"] = df["발생장소_시군구"].astype(str).str.strip()
+        levels = located["정확도"].map({1: "시도", 2: "시군구", 3: "읍면", 4: "동리"}).value_counts()
+        st.caption("📍 발생장소 지오코딩 (일치 단계별 건수): " + ", ".join(f"{k} {v:,}" for k, v in levels.items()))
 
-    required_cols = {"위도", "경도", "습도편차", "풍량"}
+    use_weather = risk_model.startswith("기상")
+    required_cols = {"위도", "경도", "습도편차", "풍량"} if use_weather else {"위도", "경도"}
     if not required_cols.issubset(df.columns):
-        st.error("❌ 산불 CSV에 '위도', '경도', '습도편차', '풍량' 열이 모두 포함되어야 합니다.")
+        st.error(f"❌ 산불 CSV에 {', '.join(repr(c) for c in sorted(required_cols))} 열이 모두 포함되어야 합니다.")
         st.stop()
 
     if not {"위도", "경도"}.issubset(shelters.columns):
         st.error("❌ 대피소 CSV에 '위도', '경도' 열이 포함되어야 합니다.")
         st.stop()
 
-    # 🔢 선형 회귀 예측 (풍속 영향 크게 설정)
-    humidity_diff = df["습도편차"].values
-    wind_speed = df["풍량"].values
-    X = np.column_stack((humidity_diff, wind_speed))
-    y = 50 + (1.5 * humidity_diff + 3.5 * wind_speed)
-    model = LinearRegression().fit(X, y)
-    df["위험도"] = model.predict(X)
+    if use_weather:
+        # 🔢 선형 회귀 예측 (풍속 영향 크게 설정)
+        humidity_diff = df["습도편차"].values
+        wind_speed = df["풍량"].values
+        model = fit_weather_model(humidity_diff, wind_speed)
+        with profiling.span("위험도 예측"):
+            df["위험도"] = model.predict(np.column_stack((humidity_diff, wind_speed)))
+    else:
+        # 🔥 과거 산불(지역·월·시간·요일) 학습 모델로 일괄 점수 (0~1)
+        fire_risk = load_fire_model()
+        when = pd.Timestamp(when_date) + pd.Timedelta(hours=when_hour)
+        with profiling.span("위험도 예측"):
+            df["위험도"] = fire_model.score(fire_risk, fire_model.scoring_features(df, when))
+        st.caption(f"학습 모델: 사건 {fire_risk['rows']:,}건 · 학습 {fire_risk['trained_at']} · "
+                   f"설명된 이탈도 {fire_risk['deviance_explained']:.3f}")
 
     # 🗺️ 지도 시각화
     st.subheader("🗺️ 산불 히트맵 + 위험 중심점 → 반경 2km 대피소 연결")
     m = folium.Map(location=[df["위도"].mean(), df["경도"].mean()], zoom_start=11)
-    HeatMap(df[["위도", "경도", "위험도"]].values.tolist(), radius=15).add_to(m)
+    if heat_mode == "점 히트맵" or (heat_mode == "자동" and len(df) <= HEATMAP_MAX_POINTS):
+        with profiling.span("히트맵 점 구성"):
+            HeatMap(df[["위도", "경도", "위험도"]].values.tolist(), radius=15).add_to(m)
+    else:
+        image, bounds = risk_raster(df["위도"].to_numpy(), df["경도"].to_numpy(), df["위험도"].to_numpy(), cell_m)
+        image_overlay(image, bounds).add_to(m)
 
     # 중심점 표시
     max_idx = df["위험도"].idxmax()
     center_point = (df.loc[max_idx, "위도"], df.loc[max_idx, "경도"])
     folium.Marker(center_point, icon=folium.Icon(color="red"), tooltip="위험 중심점 🔥").add_to(m)
 
-    # 대피소 연결 (반경 2km 이내만)
-    for idx, row in shelters.iterrows():
-        shelter_coord = (row["위도"], row["경도"])
-        dist = geodesic(center_point, shelter_coord).meters
-        if dist <= 2000:
+    # 🛣️ 도로망이 있으면: 모든 위험 지점 → 가장 가까운 도달 가능 대피소 (위험도 벌점 반영)
+    route_table = None
+    if road_file:
+        road_bytes = road_file.getvalue()
+        road_graph = load_road_graph(road_bytes, road_file.name)
+        field = build_evacuation_field(
+            road_graph, content_key(road_bytes),
+            shelters["위도"].to_numpy(), shelters["경도"].to_numpy(),
+            df["위도"].to_numpy(), df["경도"].to_numpy(), df["위험도"].to_numpy(),
+            risk_radius, risk_alpha,
+        )
+        with profiling.span("도로 경로 배정"):
+            shelter_idx, route_cost, start_node = field.assign(df["위도"], df["경도"])
+        route_table = pd.DataFrame({
+            "위도": df["위도"], "경도": df["경도"], "위험도": df["위험도"].round(2),
+            "대피소": np.where(shelter_idx >= 0, shelters.index.to_numpy()[shelter_idx.clip(0)], -1),
+            "경로 비용(m 환산)": np.round(route_cost, 0),
+        })
+        if shelter_idx[max_idx] >= 0:
+            route = field.path(start_node[max_idx])
+            shelter_coord = (shelters["위도"].iat[shelter_idx[max_idx]], shelters["경도"].iat[shelter_idx[max_idx]])
+            folium.Marker(shelter_coord, icon=folium.Icon(color="blue"),
+                          tooltip=f"대피소 {shelters.index[shelter_idx[max_idx]]} (경로 비용 {route_cost[max_idx]:.0f})").add_to(m)
+            folium.PolyLine([center_point] + route, color="green", weight=5).add_to(m)
+        else:
+            st.warning("⚠️ 위험 중심점에서 도로로 도달 가능한 대피소가 없습니다.")
+
+    else:
+        # 대피소 연결 (반경 2km 이내만, 도로망이 없을 때 직선)
+        near_idx, near_dist = get_index(shelters["위도"], shelters["경도"]).radius(*center_point, 2000)
+        for idx, dist in zip(near_idx, near_dist):
+            shelter_coord = (shelters["위도"].iat[idx], shelters["경도"].iat[idx])
             folium.Marker(shelter_coord, icon=folium.Icon(color="blue"),
-                          tooltip=f"대피소 {idx} ({dist:.0f}m)").add_to(m)
+                          tooltip=f"대피소 {shelters.index[idx]} ({dist:.0f}m)").add_to(m)
             folium.PolyLine([center_point, shelter_coord], color="green").add_to(m)
 
-    st_folium(m, width=900, height=600)
+    profiling.payload("산불 지도 (folium HTML)", m)
+    with profiling.span("st_folium"):
+        st_folium(m, width=900, height=600)
 
-    # 📈 선형 회귀 시각화
+    if route_table is not None:
+        st.subheader("🛣️ 위험 지점별 최근접 대피소 (도로 경로)")
+        st.dataframe(route_table.sort_values("위험도", ascending=False))
+
+    # 🧮 수용 인원을 고려한 일괄 대피 배정
     st.markdown("---")
-    st.subheader("📈 산불위험도 선형회귀 분석")
-
-    x1_range = np.linspace(humidity_diff.min(), humidity_diff.max(), 30)
-    x2_range = np.linspace(wind_speed.min(), wind_speed.max(), 30)
-    x1_grid, x2_grid = np.meshgrid(x1_range, x2_range)
-    x_grid = np.column_stack((x1_grid.ravel(), x2_grid.ravel()))
-    y_pred_grid = model.predict(x_grid).reshape(x1_grid.shape)
-
-    fig = plt.figure(figsize=(8, 5))
-    ax = fig.add_subplot(111, projection="3d")
-    ax.view_init(elev=25, azim=135)
-    ax.scatter(humidity_diff, wind_speed, df["위험도"], color='blue', label='Data')
-    ax.plot_surface(x1_grid, x2_grid, y_pred_grid, alpha=0.5, cmap='rainbow')
-    ax.set_xlabel("Humidity Deviation")
-    ax.set_ylabel("Wind Speed")
-    ax.set_zlabel("Predicted Fire Risk")
-    ax.set_title("Linear Regression: Humidity/Wind → Fire Risk")
-    ax.legend()
-    st.pyplot(fig)
+    st.subheader("🧮 수용 인원 고려 일괄 대피소 배정")
+    if "수용인원" not in shelters.columns:
+        st.info("대피소 CSV에 '수용인원' 열이 있으면 위험 지점 전체를 수용 인원에 맞춰 배정합니다.")
+    else:
+        risk_min, risk_max = float(df["위험도"].min()), float(df["위험도"].max())
+        col_th, col_dem, col_method = st.columns(3)
+        threshold = col_th.slider("배정 대상 최소 위험도", risk_min, max(risk_max, risk_min + 1e-6), risk_min)
+        demand_col = next((c for c in ("인구", "인원", "대피인원") if c in df.columns), None)
+        per_point = col_dem.number_input("지점당 대피 인원", min_value=1, value=100, disabled=demand_col is not None)
+        method = col_method.radio("배정 방식", ["탐욕 (거리순)", "최소 비용 (선형계획)"], horizontal=True)
+
+        targets = df[df["위험도"] >= threshold]
+        demand = targets[demand_col].to_numpy(dtype=float) if demand_col else np.full(len(targets), float(per_point))
+        if method.startswith("최소") and len(targets) > LP_MAX_SOURCES:
+            st.warning(f"⚠️ 배정 대상이 {len(targets):,} 곳이라 선형계획 배정은 수 분 걸릴 수 있습니다. "
+                       "위험도 기준을 높이거나 탐욕 배정을 고려하세요.")
+        assignment, shelter_load, unassigned = run_assignment(
+            targets["위도"].to_numpy(), targets["경도"].to_numpy(), demand,
+            shelters["위도"].to_numpy(), shelters["경도"].to_numpy(), shelters["수용인원"].to_numpy(dtype=float),
+            "lp" if method.startswith("최소") else "greedy",
+        )
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("배정 대상 지점", f"{len(targets):,}")
+        c2.metric("배정 인원", f"{assignment['배정인원'].sum():,.0f}")
+        c3.metric("미배정 인원", f"{unassigned.sum():,.0f}")
+
+        assignment["출발지"] = targets.index.to_numpy()[assignment["출발지"].to_numpy(dtype=int)]
+        assignment["대피소"] = shelters.index.to_numpy()[assignment["대피소"].to_numpy(dtype=int)]
+        if "대피장소명" in shelters.columns:
+            assignment["대피장소명"] = shelters.loc[assignment["대피소"], "대피장소명"].to_numpy()
+            shelter_load.insert(0, "대피장소명", shelters["대피장소명"].to_numpy())
+        shelter_load.index = shelters.index
+        st.markdown("**배정표**")
+        st.dataframe(assignment)
+        st.markdown("**대피소별 부하**")
+        st.dataframe(shelter_load[shelter_load["배정인원"] > 0].sort_values("이용률", ascending=False))
+
+    # 📈 선형 회귀 시각화 (기상 모델일 때만)
+    if use_weather:
+        st.markdown("---")
+        st.subheader("📈 산불위험도 선형회귀 분석")
+        import matplotlib.pyplot as plt  # 3D 축(projection="3d")은 matplotlib 이 자동 등록
+
+        x1_range = np.linspace(humidity_diff.min(), humidity_diff.max(), 30)
+        x2_range = np.linspace(wind_speed.min(), wind_speed.max(), 30)
+        x1_grid, x2_grid = np.meshgrid(x1_range, x2_range)
+        x_grid = np.column_stack((x1_grid.ravel(), x2_grid.ravel()))
+        y_pred_grid = model.predict(x_grid).reshape(x1_grid.shape)
+
+        fig = plt.figure(figsize=(8, 5))
+        ax = fig.add_subplot(111, projection="3d")
+        ax.view_init(elev=25, azim=135)
+        ax.scatter(humidity_diff, wind_speed, df["위험도"], color='blue', label='Data')
+        ax.plot_surface(x1_grid, x2_grid, y_pred_grid, alpha=0.5, cmap='rainbow')
+        ax.set_xlabel("Humidity Deviation")
+        ax.set_ylabel("Wind Speed")
+        ax.set_zlabel("Predicted Fire Risk")
+        ax.set_title("Linear Regression: Humidity/Wind → Fire Risk")
+        ax.legend()
+        st.pyplot(fig)
+
+profiling.finish()
@@ -0,0 +1,56 @@
+import streamlit as st
+import plotly.express as px
+from utils import profiling
+from utils.data import load_csv
+from utils.incidents import build_incident_cube, parse_incidents
+
+st.set_page_config(layout="wide")
+st.title("🔥 산불 발생 통계 (fire_data.csv)")
+profiling.begin("08_fire_stats")
+
+
+# 사건 표 → 지역 × 월 × 원인 큐브 (파일·지역 단위당 한 번). 필터는 모두 큐브에서 계산
+@profiling.cached(st.cache_resource(show_spinner="산불 통계 큐브 만드는 중..."))
+def get_cube(path, region):
+    raw = load_csv(path)
+    with profiling.span("사건 정리"):
+        events = parse_incidents(raw)
+    with profiling.span("큐브 만들기"):
+        return build_incident_cube(events, region=region)
+
+
+level = st.sidebar.radio("지역 단위", ["시도", "시군구"], horizontal=True)
+cube = get_cube("pages/fire_data.csv", level)
+
+months = [str(m) for m in cube.months]
+start, end = st.sidebar.select_slider("기간", options=months, value=(months[0], months[-1]))
+regions = st.sidebar.multiselect("지역 (비우면 전체)", list(cube.regions))
+causes = st.sidebar.multiselect("발생 원인 (비우면 전체)", list(cube.causes))
+
+lo, hi = cube.month_span(start, end)
+filters = dict(lo=lo, hi=hi, regions=regions or None, causes=causes or None)
+
+# 요약 지표
+with profiling.span("큐브 집계"):
+    total = cube.total(**filters)
+    by_month = cube.breakdown("월", **filters).reset_index()
+    by_region = cube.breakdown("지역", **filters).sort_values("건수", ascending=False).head(20).reset_index()
+    by_cause = cube.breakdown("원인", **filters)
+c1, c2, c3 = st.columns(3)
+c1.metric("발생 건수", f"{total['건수']:,.0f}")
+c2.metric("피해면적 합계 (ha)", f"{total['피해면적']:,.2f}")
+c3.metric("평균 진화시간 (시간)", f"{total['평균 진화시간']:,.1f}")
+
+# 월별 추이
+st.plotly_chart(profiling.payload("월별 차트", px.bar(by_month, x="월", y="건수", hover_data=["피해면적", "평균 진화시간"],
+                                                   title="월별 발생 건수")))
+
+col_region, col_cause = st.columns(2)
+col_region.plotly_chart(px.bar(by_region, x="지역", y="건수", hover_data=["피해면적", "평균 피해면적"],
+                               title="지역별 발생 건수 (상위 20)"))
+col_cause.plotly_chart(px.pie(by_cause[by_cause["건수"] > 0].reset_index(), names="원인", values="건수",
+                              title="원인별 비중"))
+
+st.dataframe(by_region.round(2), use_container_width=True)
+
+profiling.finish()
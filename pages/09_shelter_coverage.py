@@ -0,0 +1,112 @@
+import streamlit as st
+import numpy as np
+import folium
+from streamlit_folium import st_folium
+from utils import profiling
+from utils.coverage import load_coverage
+from utils.data import load_csv
+from utils.raster import image_overlay, raster_png
+from utils.spatial import dataset_key
+
+st.set_page_config(layout="wide")
+st.title("🏫 화학사고 대피소 서비스 권역 · 미커버 지역 분석")
+st.caption("대피소마다 가장 가까운 지역(보로노이 권역)을 격자로 미리 계산해 두고, 권역별 수용 인원 대비 수요와 "
+           "대피소에서 먼 미커버 지역을 한 번에 보여줍니다.")
+profiling.begin("09_shelter_coverage")
+
+SHELTER_DATA = "pages/chemical_shelters.csv"
+DEMAND_COLUMNS = ("인구", "인원", "대피인원")
+
+
+# ✅ 자료구조: 최근접 대피소 격자 – 대피소 데이터·격자 간격당 한 번 (디스크 .npz 캐시 + 세션 간 공유)
+@profiling.cached(st.cache_resource(show_spinner="대피소 권역 격자 계산 중..."))
+def get_coverage(lat, lon, capacity, cell_m):
+    return load_coverage(lat, lon, capacity, cell_m=cell_m)
+
+
+# 거리 격자 → 지도용 PNG 두 장 (권역 안 거리, 미커버 칸) – 설정이 같으면 재사용
+@profiling.cached(st.cache_data(show_spinner="권역 지도 이미지 생성 중..."))
+def coverage_images(_coverage, key, threshold_m, study_m):
+    covered = np.where(_coverage.distance <= threshold_m, _coverage.distance / 1000, np.nan)
+    gaps = np.where(_coverage.gap_mask(threshold_m, study_m), 1.0, np.nan)
+    return (raster_png(covered, _coverage.bounds, cmap="YlGn_r", vmin=0, vmax=threshold_m / 1000),
+            raster_png(gaps, _coverage.bounds, cmap="Reds", vmin=0, vmax=1, opacity=0.6))
+
+
+st.sidebar.header("📁 데이터")
+shelter_file = st.sidebar.file_uploader("대피소 CSV (비우면 chemical_shelters.csv)", type="csv")
+demand_file = st.sidebar.file_uploader("수요 지점 CSV (위도·경도, 선택: 인구)", type="csv")
+st.sidebar.header("⚙️ 설정")
+cell_km = st.sidebar.select_slider("격자 간격 (km)", [0.5, 1.0, 2.0, 5.0], value=1.0)
+threshold_km = st.sidebar.slider("대피 가능 거리 (km)", 1.0, 30.0, 5.0, 0.5)
+study_km = st.sidebar.slider("분석 범위: 대피소에서 최대 (km)", threshold_km, 100.0, max(30.0, threshold_km), 1.0,
+                             help="격자 가장자리의 바다·국외 칸을 미커버로 세지 않도록, 이보다 먼 칸은 분석에서 뺍니다.")
+
+shelters = load_csv(shelter_file or SHELTER_DATA)
+if not {"위도", "경도", "수용인원"}.issubset(shelters.columns):
+    st.error("❌ 대피소 CSV에 '위도', '경도', '수용인원' 열이 있어야 합니다.")
+    st.stop()
+shelters = shelters.dropna(subset=["위도", "경도"]).reset_index(drop=True)
+names = (shelters["대피장소명"] if "대피장소명" in shelters.columns else shelters.index).astype(str).to_numpy()
+
+coverage = get_coverage(shelters["위도"].to_numpy(dtype=float), shelters["경도"].to_numpy(dtype=float),
+                        shelters["수용인원"].to_numpy(dtype=float), cell_km * 1000)
+threshold_m, study_m = threshold_km * 1000, study_km * 1000
+
+# 수요: 업로드한 지점 (인구 열이 없으면 지점당 1)
+load, unserved = None, None
+if demand_file:
+    demand = load_csv(demand_file)
+    if not {"위도", "경도"}.issubset(demand.columns):
+        st.error("❌ 수요 CSV에 '위도', '경도' 열이 있어야 합니다.")
+        st.stop()
+    demand = demand.dropna(subset=["위도", "경도"])
+    demand_col = next((c for c in DEMAND_COLUMNS if c in demand.columns), None)
+    weights = demand[demand_col].to_numpy(dtype=float) if demand_col else np.ones(len(demand))
+    with profiling.span("수요 → 담당 대피소"):
+        load, unserved, _, _ = coverage.demand_load(demand["위도"].to_numpy(dtype=float),
+                                                    demand["경도"].to_numpy(dtype=float), weights, threshold_m)
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("대피소", f"{len(shelters):,}곳")
+c2.metric("총 수용인원", f"{coverage.capacity.sum():,.0f}")
+c3.metric(f"{threshold_km:g} km 밖 미커버 면적", f"{coverage.gap_area_km2(threshold_m, study_m):,.0f} km²")
+if load is not None:
+    total = load.sum() + unserved
+    c4.metric("미커버 수요", f"{unserved:,.0f}", f"{unserved / max(total, 1):.1%}", delta_color="inverse")
+
+# 🗺️ 전국 권역 지도 – 격자 PNG 두 장이라 대피소 수·격자 크기와 무관하게 가볍다
+covered_png, gaps_png = coverage_images(coverage, (dataset_key(coverage.lat, coverage.lon), cell_km),
+                                        threshold_m, study_m)
+m = folium.Map(location=[shelters["위도"].mean(), shelters["경도"].mean()], zoom_start=7)
+image_overlay(covered_png, coverage.bounds, name=f"{threshold_km:g} km 안 대피소까지 거리").add_to(m)
+image_overlay(gaps_png, coverage.bounds, name="미커버 지역").add_to(m)
+folium.LayerControl().add_to(m)
+profiling.payload("권역 지도 (folium HTML)", m)
+with profiling.span("st_folium"):
+    clicked = st_folium(m, height=600, returned_objects=["last_clicked"])
+
+# 🖱️ 클릭 지점의 담당 대피소 (k-d 트리 최근접, O(log n))
+if clicked and clicked["last_clicked"]:
+    lat, lon = clicked["last_clicked"]["lat"], clicked["last_clicked"]["lng"]
+    shelter, dist = coverage.serving(lat, lon)
+    i = int(shelter[0])
+    status = "✅ 대피 가능 거리 안" if dist[0] <= threshold_m else "⚠️ 미커버 (대피 가능 거리 밖)"
+    st.success(f"({lat:.4f}, {lon:.4f}) 담당 대피소: **{names[i]}** · {dist[0] / 1000:.2f} km · "
+               f"수용 {coverage.capacity[i]:,.0f}명 · {status}")
+
+# 📋 권역별 수용 인원 대비 수요
+st.subheader("📋 대피소 권역별 요약")
+st.caption(f"권역 면적은 대피 가능 거리({threshold_km:g} km) 안에서 그 대피소가 가장 가까운 칸의 넓이입니다.")
+table = coverage.summary(threshold_m, load)
+table.insert(0, "대피장소명", names)
+if "도로명주소" in shelters.columns:
+    table.insert(1, "도로명주소", shelters["도로명주소"].to_numpy())
+sort_col = "수요/수용" if load is not None else "권역 면적(km²)"
+st.dataframe(table.sort_values(sort_col, ascending=False).round(2), hide_index=True, use_container_width=True)
+if load is not None:
+    over = table[table["수요/수용"] > 1]
+    st.caption(f"수요가 수용 인원을 넘는 권역 {len(over):,}곳 · 초과 인원 합계 "
+               f"{(over['수요'] - over['수용인원']).sum():,.0f}명")
+
+profiling.finish()
@@ -0,0 +1 @@
+# 여러 페이지가 함께 쓰는 계산 모듈 모음 (Streamlit 없이도 import 가능)
@@ -0,0 +1,90 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 연율화에 쓰는 연간 거래일 수
+TRADING_DAYS = 252
+
+# 모든 함수는 날짜 × 종목 (T × N) float64 배열을 받고, 행 방향(axis=0)이 시간이다.
+
+
+# 첫날 대비 누적 수익률 (0.1 = 10%)
+def cumulative_returns(prices):
+    prices = np.asarray(prices, dtype=float)
+    return prices / prices[0] - 1
+
+
+# 일간 단순 수익률 (T-1 × N)
+def daily_returns(prices):
+    prices = np.asarray(prices, dtype=float)
+    return prices[1:] / prices[:-1] - 1
+
+
+# window 일 롤링 수익률 (T-window × N) – 배열 두 조각의 나눗셈 한 번
+def rolling_returns(prices, window):
+    prices = np.asarray(prices, dtype=float)
+    return prices[window:] / prices[:-window] - 1
+
+
+# ✅ 알고리즘: 누적합으로 구하는 롤링 평균·표준편차 (창 크기와 무관하게 O(T·N))
+def rolling_volatility(returns, window, annualize=True):
+    r = np.asarray(returns, dtype=float)
+    zero = np.zeros((1, r.shape[1]))
+    s1 = np.concatenate((zero, np.cumsum(r, axis=0)))
+    s2 = np.concatenate((zero, np.cumsum(r * r, axis=0)))
+    sum1 = s1[window:] - s1[:-window]
+    sum2 = s2[window:] - s2[:-window]
+    var = np.maximum(sum2 - sum1 * sum1 / window, 0) / (window - 1)
+    vol = np.sqrt(var)
+    return vol * np.sqrt(TRADING_DAYS) if annualize else vol
+
+
+# 고점 대비 낙폭 (0 ~ -1)
+def drawdown(prices):
+    prices = np.asarray(prices, dtype=float)
+    return prices / np.maximum.accumulate(prices, axis=0) - 1
+
+
+# 전체 기간 최대 낙폭 (N,)
+def max_drawdown(prices):
+    return drawdown(prices).min(axis=0)
+
+
+# ✅ 알고리즘: stride 트릭 창(view) 위의 롤링 최대 낙폭 – 복사 없이 (T-window+1) × N × window 창
+def rolling_max_drawdown(prices, window):
+    windows = sliding_window_view(np.asarray(prices, dtype=float), window, axis=0)
+    peaks = np.maximum.accumulate(windows, axis=-1)
+    return (windows / peaks - 1).min(axis=-1)
+
+
+# 종목 간 일간 수익률 상관행렬 (N × N)
+def correlation(returns):
+    return np.corrcoef(np.asarray(returns, dtype=float), rowvar=False)
+
+
+def _normalize(weights):
+    w = np.atleast_2d(np.asarray(weights, dtype=float))
+    return w / w.sum(axis=1, keepdims=True)
+
+
+# 가중 포트폴리오 자산 곡선 (시작 = 1)
+# weights 가 (N,) 이면 (T,), (K × N) 이면 포트폴리오 K 개를 한 번에 (T × K)
+# rebalance=False: 매수 후 보유, True: 매일 목표 비중으로 재조정
+def portfolio_equity(prices, weights, rebalance=False):
+    prices = np.asarray(prices, dtype=float)
+    w = _normalize(weights)
+    if rebalance:
+        equity = np.cumprod(1 + daily_returns(prices) @ w.T, axis=0)
+        equity = np.vstack((np.ones((1, len(w))), equity))
+    else:
+        equity = (prices / prices[0]) @ w.T
+    return equity[:, 0] if np.ndim(weights) == 1 else equity
+
+
+# 종목별 요약 지표: 총수익률, 연환산 변동성, 최대 낙폭
+def summary(prices):
+    returns = daily_returns(prices)
+    return {
+        "총수익률": cumulative_returns(prices)[-1],
+        "연환산 변동성": returns.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS),
+        "최대 낙폭": max_drawdown(prices),
+    }
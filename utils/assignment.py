@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from utils.spatial import SpatialIndex
+
+# 한 라운드 후보 간선 총수 상한 (메모리 · 배정 시간 보호)
+MAX_CANDIDATES = 2_000_000
+# 선형계획 배정은 출발지 2만 곳에서 3분 가까이 걸린다 – 이보다 많으면 페이지에서 먼저 경고
+LP_MAX_SOURCES = 5_000
+
+
+# 출발지마다 가까운 대피소 k 곳 → 후보 간선 (출발지, 대피소, 거리 m)
+def candidate_pairs(source_lat, source_lon, shelter_index, k):
+    dist, idx = shelter_index.knn(source_lat, source_lon, k=k)
+    k = idx.shape[1]
+    src = np.repeat(np.arange(len(idx)), k)
+    return src, idx.ravel(), dist.ravel()
+
+
+# 반대 방향: 대피소 j 마다 가까운 출발지 k[j] 곳 → 후보 간선
+# 수요가 수용보다 많을 때, 대피소마다 제 여유 수용 인원을 채울 만큼만 후보를 만든다
+# k 가 비슷한 대피소끼리 (2의 거듭제곱 구간) 묶어 조회하므로 조회량은 필요한 간선의 2배 이내
+def reverse_candidate_pairs(source_lat, source_lon, shelter_lat, shelter_lon, k):
+    k = np.clip(np.asarray(k, dtype=np.int64), 1, len(source_lat))
+    index = SpatialIndex(source_lat, source_lon)
+    bucket = np.ceil(np.log2(k)).astype(np.int64)
+    src, dst, dist = [], [], []
+    for b in np.unique(bucket).tolist():
+        rows = np.flatnonzero(bucket == b)
+        d, idx = index.knn(shelter_lat[rows], shelter_lon[rows], k=int(k[rows].max()))
+        keep = np.arange(idx.shape[1]) < k[rows, None]
+        src.append(idx[keep])
+        dst.append(np.repeat(rows, k[rows]))
+        dist.append(d[keep])
+    return np.concatenate(src), np.concatenate(dst), np.concatenate(dist)
+
+
+# ✅ 알고리즘: 거리 오름차순 탐욕 배정 – 가장 짧은 후보 간선부터 남은 수요와
+# 남은 수용 인원 중 작은 만큼 배정 (한 출발지 수요가 여러 대피소로 나뉠 수 있음)
+def _greedy_pass(src, dst, dist, demand_left, capacity_left):
+    order = np.argsort(dist, kind="stable")
+    demand, capacity = demand_left.tolist(), capacity_left.tolist()  # 파이썬 스칼라로 반복
+    rows = []
+    for s, j, d in zip(src[order].tolist(), dst[order].tolist(), dist[order].tolist()):
+        amount = min(demand[s], capacity[j])
+        if amount <= 0:
+            continue
+        demand[s] -= amount
+        capacity[j] -= amount
+        rows.append((s, j, amount, d))
+    demand_left[:] = demand
+    capacity_left[:] = capacity
+    return rows
+
+
+# ✅ 알고리즘: 최소 비용 수송 문제 (선형계획, HiGHS) – 후보 간선 위에서 총 이동 거리 최소화
+# 배정하지 못한 수요에는 큰 벌점을 주어 항상 해가 존재하게 한다
+def _lp_pass(src, dst, dist, demand_left, capacity_left):
+    from scipy.optimize import linprog
+    from scipy.sparse import coo_matrix, hstack, identity
+
+    n_src, n_dst, m = len(demand_left), len(capacity_left), len(src)
+    penalty = (dist.max() if m else 1.0) * 10 + 1
+    # 변수: 간선별 배정량 m 개 + 출발지별 미배정량 n_src 개
+    a_eq = hstack([coo_matrix((np.ones(m), (src, np.arange(m))), shape=(n_src, m)), identity(n_src)]).tocsr()
+    a_ub = hstack([coo_matrix((np.ones(m), (dst, np.arange(m))), shape=(n_dst, m)),
+                   coo_matrix((n_dst, n_src))]).tocsr()
+    res = linprog(
+        np.concatenate((dist, np.full(n_src, penalty))),
+        A_ub=a_ub, b_ub=capacity_left, A_eq=a_eq, b_eq=demand_left,
+        bounds=(0, None), method="highs",
+    )
+    if not res.success:
+        raise RuntimeError(f"배정 선형계획을 풀지 못했습니다: {res.message}")
+    x = np.round(res.x[:m], 6)
+    used = np.flatnonzero(x > 0)
+    np.subtract.at(demand_left, src[used], x[used])
+    np.subtract.at(capacity_left, dst[used], x[used])
+    return [(src[e], dst[e], x[e], dist[e]) for e in used.tolist()]
+
+
+# 수용 인원을 지키며 출발지(위험 지점·인구 격자) 수요를 대피소에 배정
+# 후보가 모자라 남은 수요가 있으면, 남은 출발지 × 여유 있는 대피소로 후보를 다시 만들어 반복
+# 남은 수요가 남은 수용 인원보다 많으면 대피소 쪽에서 후보를 만든다 (수요 초과 상황)
+# 어느 쪽이든 한 번에 푸는 후보 간선은 MAX_CANDIDATES 개를 넘지 않는다 (정방향은 출발지를 묶음으로 나눠 차례로 배정)
+# 반환값: (배정표 DataFrame, 대피소별 부하 DataFrame, 출발지별 미배정 인원 Series)
+def assign_shelters(source_lat, source_lon, demand, shelter_lat, shelter_lon, capacity,
+                    k=10, method="greedy", max_rounds=5):
+    source_lat = np.asarray(source_lat, dtype=float)
+    source_lon = np.asarray(source_lon, dtype=float)
+    shelter_lat = np.asarray(shelter_lat, dtype=float)
+    shelter_lon = np.asarray(shelter_lon, dtype=float)
+    demand_left = np.asarray(demand, dtype=float).copy()
+    capacity = np.asarray(capacity, dtype=float)
+    capacity_left = capacity.copy()
+    solve = _lp_pass if method == "lp" else _greedy_pass
+
+    rows = []
+    for _ in range(max_rounds):
+        open_src = np.flatnonzero(demand_left > 0)
+        open_dst = np.flatnonzero(capacity_left > 0)
+        if len(open_src) == 0 or len(open_dst) == 0:
+            break
+        before = demand_left.sum()
+        if demand_left[open_src].sum() > capacity_left[open_dst].sum():
+            # 대피소마다 제 여유 인원을 두 번 채울 만큼의 출발지 (출발지 수요는 중앙값으로 어림)
+            per_source = max(np.median(demand_left[open_src]), 1e-9)
+            k_rev = np.ceil(2 * capacity_left[open_dst] / per_source)
+            if k_rev.sum() > MAX_CANDIDATES:
+                k_rev = np.floor(k_rev * (MAX_CANDIDATES / k_rev.sum()))
+            src, dst, dist = reverse_candidate_pairs(source_lat[open_src], source_lon[open_src],
+                                                     shelter_lat[open_dst], shelter_lon[open_dst], k_rev)
+            rows += solve(open_src[src], open_dst[dst], dist, demand_left, capacity_left)
+        else:
+            # 출발지를 묶음으로 나눠 묶음마다 후보 간선이 MAX_CANDIDATES 개를 넘지 않게 한다
+            index = SpatialIndex(shelter_lat[open_dst], shelter_lon[open_dst])
+            batch = max(1, MAX_CANDIDATES // k)
+            for start in range(0, len(open_src), batch):
+                part = open_src[start:start + batch]
+                src, dst, dist = candidate_pairs(source_lat[part], source_lon[part], index, k)
+                rows += solve(part[src], open_dst[dst], dist, demand_left, capacity_left)
+        if demand_left.sum() >= before:
+            break
+        k *= 2
+
+    assignment = pd.DataFrame(rows, columns=["출발지", "대피소", "배정인원", "거리(m)"])
+    load = np.bincount(assignment["대피소"].to_numpy(dtype=np.int64), weights=assignment["배정인원"],
+                       minlength=len(capacity))
+    shelter_load = pd.DataFrame({"수용인원": capacity, "배정인원": load, "이용률": load / np.maximum(capacity, 1)})
+    unassigned = pd.Series(demand_left, name="미배정인원")
+    return assignment, shelter_load, unassigned
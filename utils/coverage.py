@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.geo import EARTH_RADIUS_M, chord_to_meters, unit_xyz
+from utils.interpolate import cell_centers
+from utils.raster import RiskGrid
+from utils.spatial import dataset_key
+
+# 데이터셋·격자 간격별 최근접 대피소 격자 디스크 캐시 (좌표 내용 해시 → .npz)
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "coverage"
+
+
+# ✅ 자료구조: 최근접 대피소 격자 (이산 보로노이 도형)
+# 칸마다 가장 가까운 대피소 번호와 거리(m)를 한 번에 계산해 두고
+# 권역 면적 · 미커버 지역 · 칸 단위 조회는 모두 이 배열에서 bincount / 인덱싱으로 끝낸다.
+# 정확한 "이 지점은 어느 대피소 권역인가" 는 단위구 좌표 k-d 트리 최근접 탐색 (O(log n))
+# (현 길이가 대원 거리와 단조 관계라 최근접이 같고, 거리는 chord_to_meters 로 되돌린다)
+class CoverageMap:
+    def __init__(self, grid, nearest, distance, lat, lon, capacity):
+        from scipy.spatial import cKDTree
+
+        self.grid = grid
+        self.nearest = nearest    # (rows × cols) int32, 행 0 = 남쪽
+        self.distance = distance  # (rows × cols) float32, m
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.capacity = np.asarray(capacity, dtype=float)
+        self.tree = cKDTree(unit_xyz(self.lat, self.lon))
+
+    @classmethod
+    def build(cls, lat, lon, capacity, cell_m=2000.0, pad_cells=10):
+        grid = RiskGrid.around(lat, lon, cell_m=cell_m, pad_cells=pad_cells)
+        shape = (grid.rows, grid.cols)
+        coverage = cls(grid, None, None, lat, lon, capacity)
+        nearest, distance = coverage.serving(*cell_centers(grid))
+        coverage.nearest = nearest.astype(np.int32).reshape(shape)
+        coverage.distance = distance.astype(np.float32).reshape(shape)
+        return coverage
+
+    @property
+    def bounds(self):
+        return self.grid.bounds
+
+    # 칸 면적 (km²) – 위도마다 경도 폭이 cos(위도) 로 줄어든다, 모양 (rows, 1)
+    def cell_area_km2(self):
+        lat = self.grid.south + (np.arange(self.grid.rows) + 0.5) * self.grid.dlat
+        height = np.radians(self.grid.dlat) * EARTH_RADIUS_M
+        width = np.radians(self.grid.dlon) * EARTH_RADIUS_M * np.cos(np.radians(lat))
+        return (height * width / 1e6)[:, None]
+
+    # 정확한 담당 대피소: k-d 트리 최근접 → (대피소 번호, 거리 m)
+    def serving(self, lat, lon):
+        chord, idx = self.tree.query(unit_xyz(np.atleast_1d(lat), np.atleast_1d(lon)), k=1, workers=-1)
+        return idx, chord_to_meters(chord)
+
+    # 칸 조회 (O(1), 칸 크기만큼 근사) → (대피소 번호, 거리 m), 격자 밖은 (-1, NaN)
+    def lookup(self, lat, lon):
+        cell = self.grid.cell_of(np.atleast_1d(lat), np.atleast_1d(lon))
+        inside = cell >= 0
+        safe = np.maximum(cell, 0)
+        return (np.where(inside, self.nearest.ravel()[safe], -1),
+                np.where(inside, self.distance.ravel()[safe], np.nan))
+
+    # 분석 범위 (대피소에서 study_m 이내) – 격자 가장자리의 바다·국외 칸을 뺀다
+    def _study(self, study_m=None):
+        return np.ones(self.distance.shape, dtype=bool) if study_m is None else self.distance <= study_m
+
+    # 대피소별 권역 면적 (km²) – threshold_m 이내 칸만 세면 "도달 가능한 권역"
+    def service_areas(self, threshold_m=None):
+        area = np.broadcast_to(self.cell_area_km2(), self.distance.shape)
+        keep = self._study(threshold_m)
+        return np.bincount(self.nearest[keep], weights=area[keep], minlength=len(self.lat))
+
+    # 미커버 칸: 가장 가까운 대피소도 threshold_m 보다 먼 칸 (분석 범위 안)
+    def gap_mask(self, threshold_m, study_m=None):
+        return (self.distance > threshold_m) & self._study(study_m)
+
+    def gap_area_km2(self, threshold_m, study_m=None):
+        area = np.broadcast_to(self.cell_area_km2(), self.distance.shape)
+        return float(area[self.gap_mask(threshold_m, study_m)].sum())
+
+    # 수요 지점 → 담당 대피소별 수요 합 (threshold_m 밖 수요는 미커버로 따로)
+    # 반환: (대피소별 수요, 미커버 수요 합, 지점별 담당 대피소 번호 · 거리 m)
+    def demand_load(self, lat, lon, demand, threshold_m):
+        shelter, dist = self.serving(lat, lon)
+        demand = np.asarray(demand, dtype=float)
+        covered = dist <= threshold_m
+        load = np.bincount(shelter[covered], weights=demand[covered], minlength=len(self.lat))
+        return load, float(demand[~covered].sum()), shelter, dist
+
+    # 대피소별 요약표: 권역 면적 · 수용인원 · (있으면) 수요와 수요/수용 비율
+    def summary(self, threshold_m, load=None):
+        area = self.service_areas(threshold_m)
+        out = pd.DataFrame({
+            "권역 면적(km²)": area,
+            "수용인원": self.capacity,
+            "km²당 수용인원": self.capacity / np.where(area > 0, area, np.nan),
+        })
+        if load is not None:
+            out["수요"] = load
+            out["수요/수용"] = load / np.where(self.capacity > 0, self.capacity, np.nan)
+        return out
+
+
+# ✅ 데이터셋당 한 번: 같은 좌표·격자 간격이면 디스크(.npz)에 저장된 격자를 그대로 읽는다
+def load_coverage(lat, lon, capacity, cell_m=2000.0, pad_cells=10):
+    lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+    path = CACHE_DIR / f"{dataset_key(lat, lon)}_{int(cell_m)}_{pad_cells}.npz"
+    grid = RiskGrid.around(lat, lon, cell_m=cell_m, pad_cells=pad_cells)
+    if path.exists():
+        stored = np.load(path)
+        if stored["nearest"].shape == (grid.rows, grid.cols):
+            return CoverageMap(grid, stored["nearest"], stored["distance"], lat, lon, capacity)
+    coverage = CoverageMap.build(lat, lon, capacity, cell_m=cell_m, pad_cells=pad_cells)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, nearest=coverage.nearest, distance=coverage.distance)
+    except OSError:
+        pass
+    return coverage
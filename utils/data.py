@@ -0,0 +1,107 @@
+import functools
+import hashlib
+import io
+from pathlib import Path
+
+import pandas as pd
+
+from utils import profiling
+
+# 파싱한 CSV 를 Parquet 으로 저장해 두는 로컬 캐시 폴더 (내용 해시 → 파일)
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "tables"
+
+# 한국 공공데이터 CSV 에서 주로 쓰이는 인코딩 순서
+ENCODINGS = ("utf-8-sig", "cp949", "euc-kr")
+
+# 좌표 열 – 숫자로 바뀌면 정수처럼 보여도 float 로 둔다 (도분초 문자열은 그대로 두고 페이지가 변환)
+COORD_COLS = ("위도", "경도")
+# 파싱 규칙이 바뀌면 올린다 – 예전 규칙으로 만든 Parquet 캐시를 다시 쓰지 않도록
+PARSE_VERSION = 2
+
+try:
+    import streamlit as st
+    _memo = st.cache_data(show_spinner=False, max_entries=32)
+except ImportError:  # Streamlit 없이 (벤치마크·스크립트) 쓸 때 – cache_data 처럼 복사본을 돌려준다
+    def _memo(func):
+        cached = functools.lru_cache(maxsize=32)(func)
+        return functools.wraps(func)(lambda *args: cached(*args).copy())
+
+
+# 경로 / 업로드 파일 / 파일 객체 / bytes → bytes
+def read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "read"):
+        return source.read()
+    return Path(source).read_bytes()
+
+
+def content_key(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+# 앞부분만 디코딩해 보고 인코딩 결정 (utf-8 → cp949 → euc-kr)
+def sniff_encoding(raw, sample=1 << 16):
+    head = raw[:sample]
+    for enc in ENCODINGS:
+        try:
+            head.decode(enc)
+            return enc
+        except UnicodeDecodeError as e:
+            # 표본 끝에서 멀티바이트 글자가 잘린 경우는 통과
+            if e.start >= len(head) - 4:
+                return enc
+    return ENCODINGS[0]
+
+
+# "1,234" 같은 천 단위 쉼표 숫자 열과 좌표 열을 숫자형으로 변환
+# 값이 하나라도 숫자가 아니면 (날짜·전화번호·지명·도분초 좌표 등) 그대로 둔다
+def coerce_numeric(df):
+    for col in df.columns:
+        s = df[col]
+        if s.dtype != object and not pd.api.types.is_string_dtype(s):
+            continue
+        cleaned = s.astype("string").str.replace(",", "", regex=False).str.strip()
+        numeric = pd.to_numeric(cleaned, errors="coerce")
+        if numeric.notna().sum() == cleaned.notna().sum() and cleaned.notna().any():
+            if col not in COORD_COLS and numeric.notna().all() and (numeric % 1 == 0).all():
+                numeric = numeric.astype("int64")
+            df[col] = numeric
+    return df
+
+
+def parse_csv(raw):
+    df = pd.read_csv(io.BytesIO(raw), encoding=sniff_encoding(raw))
+    return coerce_numeric(df)
+
+
+# Parquet 캐시가 있으면 읽고, 없으면 CSV 를 파싱해 저장 (pyarrow 가 없으면 캐시 생략)
+def _load(key, raw):
+    path = CACHE_DIR / f"{key}.v{PARSE_VERSION}.parquet"
+    try:
+        with profiling.span("Parquet 읽기"):
+            return pd.read_parquet(path)
+    except (ImportError, OSError, ValueError):
+        pass
+    with profiling.span("CSV 파싱"):
+        df = parse_csv(raw)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, index=False)
+    except (ImportError, OSError, ValueError, TypeError):
+        pass
+    return df
+
+
+# 세션 메모리 캐시 – 같은 내용이면 위젯 조작으로 재실행돼도 다시 파싱하지 않음
+@profiling.cached(_memo, name="load_csv")
+def _load_memo(key, _raw):
+    return _load(key, _raw)
+
+
+# ✅ 자료구조: 내용 해시 기반 2단 캐시 (메모리 → Parquet → CSV)
+def load_csv(source):
+    raw = read_bytes(source)
+    return _load_memo(content_key(raw), raw)
@@ -0,0 +1,174 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 학습된 모델(계수표 + 특성 스키마)을 저장하는 위치
+MODEL_DIR = Path(__file__).resolve().parent.parent / ".cache" / "models"
+MODEL_PATH = MODEL_DIR / "fire_risk.json"
+FIRE_DATA = Path(__file__).resolve().parent.parent / "pages" / "fire_data.csv"
+
+# 특성 스키마 – 모두 범주형으로 보고 로그-선형 모델의 수준별 계수를 학습한다
+FEATURES = ["시도", "시군구", "월", "시", "요일"]
+WEEKDAYS = "월화수목금토일"
+
+# 특성 처리 규칙이 바뀌면 올린다 – 저장된 모델의 버전이 다르면 다시 학습
+MODEL_VERSION = 2
+
+# 한 번에 점수를 매길 행 수 (메모리 상한)
+SCORE_CHUNK = 1_000_000
+
+
+# fire_data.csv 원본 열 → 사건별 특성 + 피해면적
+# 시군구는 시도마다 이름이 겹치므로 ("중구", "동구" …) "시도 시군구" 로 묶는다
+def fire_features(raw):
+    hour = pd.to_numeric(raw["발생일시_시간"].astype(str).str.split(":").str[0], errors="coerce")
+    month = pd.to_numeric(raw["발생일시_월"], errors="coerce")
+    province = raw["발생장소_시도"].astype(str).str.strip()  # "충남 " 같은 공백 정리 (점수 매길 때와 같은 이름)
+    out = pd.DataFrame({
+        "시도": province,
+        "시군구": province + " " + raw["발생장소_시군구"].astype(str).str.strip(),
+        "월": month,
+        "시": hour,
+        "요일": raw["발생일시_요일"].astype(str),
+        "피해면적": pd.to_numeric(raw["피해면적_합계"], errors="coerce"),
+    }).dropna()
+    out["월"] = out["월"].astype(int)
+    out["시"] = out["시"].astype(int)
+    return out
+
+
+# 점수를 매길 표 → 특성 표. 없는 열은 예측 시점(when)으로 채우고, 지역이 없으면 '미상'(기준 수준)
+def scoring_features(df, when=None):
+    when = when or datetime.now()
+    out = pd.DataFrame(index=df.index)
+    out["시도"] = df["시도"].astype(str).str.strip() if "시도" in df else "미상"
+    out["시군구"] = out["시도"] + " " + df["시군구"].astype(str).str.strip() if "시군구" in df else "미상"
+    out["월"] = df["월"] if "월" in df else when.month
+    out["시"] = df["시"] if "시" in df else when.hour
+    out["요일"] = df["요일"].astype(str) if "요일" in df else WEEKDAYS[when.weekday()]
+    return out[FEATURES]
+
+
+# 관측된 지역 × 12개월 × 24시간 × 7요일 전체 격자와 격자별 발생 건수
+def _count_grid(events):
+    regions = events[["시도", "시군구"]].drop_duplicates()
+    grid = pd.MultiIndex.from_product(
+        [np.arange(len(regions)), range(1, 13), range(24), list(WEEKDAYS)], names=["r", "월", "시", "요일"]
+    ).to_frame(index=False)
+    grid = pd.concat([regions.iloc[grid["r"]].reset_index(drop=True), grid.drop(columns="r")], axis=1)
+    counts = events.groupby(FEATURES).size().rename("건수")
+    return grid.join(counts, on=FEATURES).fillna({"건수": 0})
+
+
+def _one_hot(frame, levels):
+    from scipy.sparse import csr_matrix
+
+    cols, offset = [], 0
+    for feature in FEATURES:
+        codes = pd.Categorical(frame[feature], categories=levels[feature]).codes.astype(np.int64)
+        cols.append(np.where(codes >= 0, codes + offset, -1))
+        offset += len(levels[feature])
+    cols = np.column_stack(cols)
+    rows = np.repeat(np.arange(len(frame)), len(FEATURES))
+    keep = cols.ravel() >= 0
+    return csr_matrix((np.ones(keep.sum()), (rows[keep], cols.ravel()[keep])), shape=(len(frame), offset))
+
+
+# ✅ 학습: 발생 건수 포아송 회귀 (지역·월·시간·요일 로그-선형)
+# + 시도별 평균 피해면적(전국 평균 쪽으로 축소) → 시간당 기대 피해면적의 로그가 위험 점수
+# 결과는 수준별 계수표(JSON)로 저장 – 점수 계산에 scikit-learn 이 필요 없다
+def train(raw=None, path=MODEL_PATH, alpha=1e-3, shrink=20):
+    from sklearn.linear_model import PoissonRegressor
+
+    if raw is None:
+        from utils.data import load_csv
+        raw = load_csv(FIRE_DATA)
+    events = fire_features(raw)
+    grid = _count_grid(events)
+    levels = {f: sorted(grid[f].unique().tolist()) for f in FEATURES}
+    glm = PoissonRegressor(alpha=alpha, max_iter=1000).fit(_one_hot(grid, levels), grid["건수"])
+
+    coef, offset = {}, 0
+    for f in FEATURES:
+        coef[f] = dict(zip(map(str, levels[f]), glm.coef_[offset:offset + len(levels[f])].tolist()))
+        offset += len(levels[f])
+
+    # 시도별 평균 피해면적 (건수가 적으면 전국 평균으로 당김)
+    area = events.groupby("시도")["피해면적"].agg(["sum", "count"])
+    overall = events["피해면적"].mean()
+    severity = np.log((area["sum"] + shrink * overall) / (area["count"] + shrink))
+    model = {
+        "version": MODEL_VERSION,
+        "features": FEATURES,
+        "intercept": float(glm.intercept_),
+        "coef": coef,
+        "severity": {str(k): float(v) for k, v in severity.items()},
+        "severity_default": float(np.log(overall)),
+        "rows": int(len(events)),
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "deviance_explained": float(glm.score(_one_hot(grid, levels), grid["건수"])),
+    }
+    log_risk = _log_risk(model, grid[FEATURES])
+    model["score_min"], model["score_max"] = float(log_risk.min()), float(log_risk.max())
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(model, ensure_ascii=False, indent=1), encoding="utf-8")
+    return model
+
+
+# 저장된 모델 불러오기 (없거나 버전이 다르면 학습 후 저장)
+def load(path=MODEL_PATH):
+    if Path(path).exists():
+        model = json.loads(Path(path).read_text(encoding="utf-8"))
+        if model.get("version") == MODEL_VERSION:
+            return model
+    return train(path=path)
+
+
+# 수준 → 계수 배열 조회 (처음 보는 수준은 default, 계수는 0 = 기준)
+# 행 전체를 문자열로 바꾸지 않고 고유값만 factorize 해서 조회한다
+def _lookup(table, values, default=0.0):
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=False)
+    weights = np.array([table.get(str(u), default) for u in uniques], dtype=float)
+    return weights[codes]
+
+
+def _log_risk(model, features):
+    out = np.full(len(features), model["intercept"])
+    for f in model["features"]:
+        out += _lookup(model["coef"][f], features[f])
+    out += _lookup(model["severity"], features["시도"], model["severity_default"])
+    return out
+
+
+# ✅ 일괄 점수: chunk 행씩 계수 조회·덧셈 → 0~1 위험도 (학습 격자 점수 범위 기준)
+def score(model, features, chunk=SCORE_CHUNK):
+    missing = set(model["features"]) - set(features.columns)
+    if missing:
+        raise ValueError(f"모델 특성 열이 없습니다: {sorted(missing)}")
+    out = np.empty(len(features))
+    for start in range(0, len(features), chunk):
+        out[start:start + chunk] = _log_risk(model, features.iloc[start:start + chunk])
+    span = max(model["score_max"] - model["score_min"], 1e-9)
+    return np.clip((out - model["score_min"]) / span, 0, 1)
+
+
+# 명령행: python -m utils.fire_model train
+#        python -m utils.fire_model score 입력.csv 출력.csv
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) == 2 and sys.argv[1] == "train":
+        info = train()
+        print(f"학습 완료: 사건 {info['rows']}건, 설명된 이탈도 {info['deviance_explained']:.3f} → {MODEL_PATH}")
+    elif len(sys.argv) == 4 and sys.argv[1] == "score":
+        from utils.data import load_csv
+
+        frame = load_csv(sys.argv[2])
+        frame["위험도"] = score(load(), scoring_features(frame))
+        frame.to_csv(sys.argv[3], index=False, encoding="utf-8-sig")
+    else:
+        print("사용법: python -m utils.fire_model train | score <입력.csv> <출력.csv>")
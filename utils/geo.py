@@ -0,0 +1,27 @@
+import numpy as np
+
+# 지구 평균 반지름 (m)
+EARTH_RADIUS_M = 6371008.8
+
+
+# ✅ 알고리즘: Haversine 공식 (NumPy 벡터화)
+# 스칼라·배열 모두 받으며 브로드캐스팅 규칙을 그대로 따른다. 반환 단위는 m
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=float)) for a in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# 위도/경도 → 단위구 위의 3차원 좌표 (n × 3)
+# 한 점 → 여러 점 거리를 반복해서 구할 때는 좌표를 한 번만 변환해 두고 chord_to_meters 를 쓴다
+def unit_xyz(lat, lon):
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+# 현의 길이(chord) → 대원 거리(m). haversine 과 같은 값
+def chord_to_meters(chord):
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.minimum(chord / 2, 1.0))
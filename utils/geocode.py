@@ -0,0 +1,196 @@
+import difflib
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+# 지명 사전 CSV (열: 시도, 시군구, 읍면, 동리, 위도, 경도 – 하위 단위는 비어 있어도 됨)
+# 저장소에는 들어 있지 않다 – 직접 구한 행정구역 좌표 파일을 이 경로에 두면 쓴다
+# 없으면 (기본) 대피소 도로명주소(pages/chemical_shelters.csv)로 대략적인 사전을 만든다 (Gazetteer.fallback = True)
+GAZETTEER_PATH = ROOT / "pages" / "gazetteer.csv"
+SHELTER_DATA = ROOT / "pages" / "chemical_shelters.csv"
+CACHE_PATH = ROOT / ".cache" / "geocode.json"
+
+LEVELS = ("시도", "시군구", "읍면", "동리")
+FUZZY_CUTOFF = 0.75
+
+# 시도 정식 명칭·옛 명칭 → 약칭 (fire_data.csv 표기)
+PROVINCES = {
+    "서울특별시": "서울", "부산광역시": "부산", "대구광역시": "대구", "인천광역시": "인천",
+    "광주광역시": "광주", "대전광역시": "대전", "울산광역시": "울산", "세종특별자치시": "세종",
+    "경기도": "경기", "강원도": "강원", "강원특별자치도": "강원", "충청북도": "충북", "충청남도": "충남",
+    "전라북도": "전북", "전북특별자치도": "전북", "전라남도": "전남", "경상북도": "경북", "경상남도": "경남",
+    "제주도": "제주", "제주특별자치도": "제주",
+}
+ABBREVIATIONS = set(PROVINCES.values())
+SUFFIX = re.compile(r"(특별자치시|특별자치도|특별시|광역시|시|군|구|읍|면|동|리|가)$")
+
+
+# 지명 정규화: 공백 단위 토큰마다 행정 접미사를 떼고 다시 잇는다 ("청주시 상당구" → "청주 상당")
+def normalize(name, level="시군구"):
+    if name is None or (isinstance(name, float) and np.isnan(name)):
+        return ""
+    name = str(name).strip()
+    if level == "시도":
+        # 정식 명칭 → 약칭, 오타가 있어도 앞 두 글자가 약칭이면 그것으로 ("서울틀별시" → "서울")
+        return PROVINCES.get(name, name[:2] if name[:2] in ABBREVIATIONS else name)
+    tokens = []
+    for token in name.split():
+        stripped = SUFFIX.sub("", token)
+        tokens.append(stripped if stripped else token)
+    return " ".join(tokens)
+
+
+# (시도, 시군구, 읍면, 동리) → 트라이 경로 [(단계 번호, 토큰), ...]
+# 빈 단계는 빼고, "청주 상당" 처럼 여러 토큰인 시군구는 토큰마다 한 단계씩 내려간다
+def _path(place):
+    path = []
+    for level, value in enumerate(place[:len(LEVELS)]):
+        for token in normalize(value, LEVELS[level]).split() if level else [normalize(value, "시도")]:
+            if token:
+                path.append((level, token))
+    return path
+
+
+# ✅ 자료구조: 행정구역 트라이 – 단계마다 이름 → 자식 노드 사전 (해시 조회)
+# 모든 노드는 아래 지점들의 좌표 합·개수를 가져 어느 단계에서 멈춰도 중심 좌표를 낸다
+class _Node:
+    __slots__ = ("children", "lat", "lon", "n")
+
+    def __init__(self):
+        self.children = {}
+        self.lat = self.lon = 0.0
+        self.n = 0
+
+    def add(self, lat, lon):
+        self.lat += lat
+        self.lon += lon
+        self.n += 1
+
+    @property
+    def point(self):
+        return self.lat / self.n, self.lon / self.n
+
+
+class Gazetteer:
+    def __init__(self, table, fallback=False):
+        self.fallback = fallback  # 지명 사전 CSV 대신 대피소 주소로 만든 대체 사전인지
+        self.root = _Node()
+        columns = [table[level] if level in table else pd.Series("", index=table.index) for level in LEVELS]
+        for place, lat, lon in zip(zip(*columns), table["위도"].to_numpy(float), table["경도"].to_numpy(float)):
+            if np.isnan(lat) or np.isnan(lon):
+                continue
+            node = self.root
+            node.add(lat, lon)
+            for _, token in _path(place):
+                node = node.children.setdefault(token, _Node())
+                node.add(lat, lon)
+        self.key = hashlib.blake2b(table[[c for c in (*LEVELS, "위도", "경도") if c in table]]
+                                   .to_csv(index=False).encode(), digest_size=16).hexdigest()
+
+    # 자식 중 이름 찾기: 해시 → 유일한 접두 일치 → 유사도 (difflib)
+    @staticmethod
+    def _child(node, name):
+        if name in node.children:
+            return node.children[name]
+        prefixed = [key for key in node.children if key.startswith(name) or name.startswith(key)]
+        if len(prefixed) == 1:
+            return node.children[prefixed[0]]
+        close = difflib.get_close_matches(name, list(node.children), n=1, cutoff=FUZZY_CUTOFF)
+        return node.children[close[0]] if close else None
+
+    # (시도, 시군구, 읍면, 동리) → (위도, 경도, 정확도)
+    # 정확도 = 마지막으로 일치한 단계 (1 시도 … 4 동리, 0 실패)
+    # 토큰이 사전에 없으면 한 번은 건너뛰고 다음 토큰을 같은 자리에서 찾는다
+    # (예: 사전에는 읍면 없이 "시군구 → 동" 으로만 있는 도시 지역)
+    def resolve(self, place):
+        node, depth, skipped = self.root, 0, False
+        for level, token in _path(place):
+            child = self._child(node, token)
+            if child is None:
+                if skipped:
+                    break
+                skipped = True
+                continue
+            node, depth = child, level + 1
+        if depth == 0:
+            return np.nan, np.nan, 0
+        lat, lon = node.point
+        return lat, lon, depth
+
+
+# 도로명주소 "충청남도 공주시 무령로 103(웅진동)" → (시도, 시군구, 읍면, 동리)
+def parse_address(address):
+    text = str(address)
+    dong = re.search(r"\(([^)]+)\)", text)
+    dong = dong.group(1).split(",")[0].strip() if dong else ""
+    tokens = re.sub(r"\(.*?\)", " ", text).split()
+    if not tokens:
+        return "", "", "", ""
+    sido, rest = tokens[0], tokens[1:]
+    sigungu = []
+    while rest and re.search(r"(시|군|구)$", rest[0]) and len(sigungu) < 2:
+        sigungu.append(rest.pop(0))
+    eupmyeon = rest[0] if rest and re.search(r"(읍|면)$", rest[0]) else ""
+    return sido, " ".join(sigungu), eupmyeon, dong if re.search(r"(동|리|가)$", dong) else ""
+
+
+def gazetteer_from_addresses(addresses, lat, lon):
+    parts = pd.DataFrame([parse_address(a) for a in addresses], columns=list(LEVELS))
+    parts["위도"] = np.asarray(lat, dtype=float)
+    parts["경도"] = np.asarray(lon, dtype=float)
+    return parts
+
+
+def load_gazetteer(path=GAZETTEER_PATH):
+    from utils.data import load_csv
+
+    if Path(path).exists():
+        return Gazetteer(load_csv(path))
+    shelters = load_csv(SHELTER_DATA)
+    return Gazetteer(gazetteer_from_addresses(shelters["도로명주소"], shelters["위도"], shelters["경도"]),
+                     fallback=True)
+
+
+# ✅ 지오코딩: 고유 지명 조합만 풀고, 결과는 디스크 캐시(JSON)에 보관
+# 캐시는 지명 사전 내용 해시에 묶여 사전이 바뀌면 새로 만든다
+class Geocoder:
+    def __init__(self, gazetteer=None, cache_path=CACHE_PATH):
+        self.gazetteer = gazetteer or load_gazetteer()
+        self.cache_path = Path(cache_path)
+        self.cache = {}
+        self.lock = threading.Lock()  # 여러 세션이 같은 Geocoder 를 공유할 때 캐시 쓰기 보호
+        if self.cache_path.exists():
+            stored = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if stored.get("gazetteer") == self.gazetteer.key:
+                self.cache = stored["places"]
+
+    def _save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_path.write_text(json.dumps({"gazetteer": self.gazetteer.key, "places": self.cache},
+                                              ensure_ascii=False), encoding="utf-8")
+
+    # columns: 지명 단계 순서의 열 이름 (시도, 시군구, 읍면, 동리 – 뒤쪽은 생략 가능)
+    # 반환: 입력과 같은 행 순서의 (위도, 경도, 정확도) DataFrame, 정확도 = 일치한 단계 수
+    def geocode(self, frame, columns):
+        parts = [frame[c].astype("string").fillna("").str.strip() for c in columns]
+        keys = parts[0].str.cat(parts[1:], sep="|")
+        codes, uniques = pd.factorize(keys)
+        missing = [key for key in uniques if key not in self.cache]
+        if missing:
+            with self.lock:
+                for key in missing:
+                    lat, lon, depth = self.gazetteer.resolve(key.split("|"))
+                    self.cache[key] = [None if np.isnan(lat) else lat, None if np.isnan(lon) else lon, depth]
+                self._save()
+        resolved = np.array([self.cache[key] for key in uniques], dtype=float).reshape(-1, 3)
+        return pd.DataFrame(resolved[codes], columns=["위도", "경도", "정확도"], index=frame.index)
+
+
+# fire_data.csv 원본 열 이름
+FIRE_PLACE_COLUMNS = ("발생장소_시도", "발생장소_시군구", "발생장소_읍면", "발생장소_동리")
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+# 큐브에 모으는 값 (합계) – 건수는 따로 센다
+MEASURES = ("피해면적", "진화시간")
+
+# 이보다 긴 진화시간은 입력 오류로 본다 (예: 종료 연도 2223) – 시간 단위
+MAX_DURATION_H = 24 * 30
+
+
+# "15:41" 같은 시:분 문자열 → (시, 분) 실수 배열 (잘못된 값은 NaN)
+# 서로 다른 값은 하루 1440 개뿐이므로 고유값만 정규식으로 풀고 코드로 펼친다
+def _hour_minute(text):
+    codes, uniques = pd.factorize(text.astype(str))
+    parts = pd.Series(uniques).str.extract(r"(\d{1,2}):(\d{2})").astype(float).to_numpy()
+    return parts[codes, 0], parts[codes, 1]
+
+
+def _timestamp(raw, prefix):
+    hour, minute = _hour_minute(raw[f"{prefix}_시간"])
+    return pd.to_datetime(pd.DataFrame({
+        "year": raw[f"{prefix}_년"], "month": raw[f"{prefix}_월"], "day": raw[f"{prefix}_일"],
+        "hour": hour, "minute": minute,
+    }), errors="coerce")
+
+
+# ✅ 전처리: fire_data.csv 의 나뉜 날짜·시간 열 → 발생시각/진화시각 (datetime64) + 진화시간(시간 단위)
+# 지역·원인은 category 로 바꿔 수십 년치 전국 자료도 메모리를 적게 쓴다
+def parse_incidents(raw):
+    start = _timestamp(raw, "발생일시")
+    end = _timestamp(raw, "진화종료시간")
+    duration = (end - start).dt.total_seconds() / 3600
+    province = raw["발생장소_시도"].fillna("미상").astype(str).str.strip()  # "충남 " 같은 공백 정리
+    district = raw["발생장소_시군구"].fillna("미상").astype(str).str.strip()
+    events = pd.DataFrame({
+        "발생시각": start,
+        "진화시각": end,
+        # 종료가 발생보다 앞서거나 지나치게 길면 입력 오류로 보고 비움
+        "진화시간": duration.where((duration >= 0) & (duration <= MAX_DURATION_H)),
+        "시도": province.astype("category"),
+        "시군구": (province + " " + district).astype("category"),
+        "원인": raw["발생원인_세부원인"].fillna("미상").astype("category"),
+        "원인구분": raw["발생원인_구분"].fillna("미상").astype("category"),
+        "피해면적": pd.to_numeric(raw["피해면적_합계"], errors="coerce"),
+    })
+    return events[events["발생시각"].notna()].reset_index(drop=True)
+
+
+# ✅ 자료구조: 사건 큐브 (지역 × 월 × 원인) 건수·합계의 월 방향 누적합
+# 월 축은 첫 사건 월부터 마지막 사건 월까지 연속 (빈 달도 칸을 둔다)
+# prefix[..., t, :] = 0..t-1 월 합 → 임의 기간 합이 뺄셈 한 번, 필터는 원본 행을 다시 훑지 않는다
+# 측정값마다 값이 있는 사건 수("<측정값>_n")도 함께 두어 평균에서 결측을 빼고 나눈다
+class IncidentCube:
+    def __init__(self, regions, months, causes, arrays):
+        self.regions = np.asarray(regions, dtype=object)
+        self.months = pd.PeriodIndex(months, freq="M")
+        self.causes = np.asarray(causes, dtype=object)
+        self.prefix = {name: self._prefix(values) for name, values in arrays.items()}
+        self.region_index = {name: i for i, name in enumerate(self.regions)}
+        self.cause_index = {name: i for i, name in enumerate(self.causes)}
+
+    @staticmethod
+    def _prefix(values):
+        shape = (values.shape[0], 1, values.shape[2])
+        return np.concatenate((np.zeros(shape, dtype=values.dtype), np.cumsum(values, axis=1)), axis=1)
+
+    # 월 [start, end] (양끝 포함, "2023-03" 같은 문자열 가능) → 월 인덱스 구간 [lo, hi)
+    def month_span(self, start=None, end=None):
+        lo = 0 if start is None else int(self.months.searchsorted(pd.Period(start, freq="M"), side="left"))
+        hi = len(self.months) if end is None else int(self.months.searchsorted(pd.Period(end, freq="M"), side="right"))
+        return lo, max(lo, hi)
+
+    def _rows(self, regions):
+        return slice(None) if regions is None else np.array([self.region_index[r] for r in regions], dtype=np.int64)
+
+    def _cols(self, causes):
+        return slice(None) if causes is None else np.array([self.cause_index[c] for c in causes], dtype=np.int64)
+
+    # 기간 합 (지역 × 원인) – 누적합 뺄셈
+    def range_sum(self, measure="건수", lo=0, hi=None, regions=None, causes=None):
+        hi = len(self.months) if hi is None else hi
+        prefix = self.prefix[measure][self._rows(regions)][:, :, self._cols(causes)]
+        return prefix[:, hi, :] - prefix[:, lo, :]
+
+    # 필터 결과를 축 하나로 펼친 표: by = "지역" | "원인" | "월"
+    # 열: 건수, 측정값 합계, 평균 (결측 제외)
+    def breakdown(self, by, lo=0, hi=None, regions=None, causes=None):
+        hi = len(self.months) if hi is None else hi
+        columns = {}
+        for name in self.prefix:
+            if by == "월":
+                prefix = self.prefix[name][self._rows(regions)][:, lo:hi + 1][:, :, self._cols(causes)]
+                columns[name] = np.diff(prefix.sum(axis=(0, 2)))
+            else:
+                table = self.range_sum(name, lo, hi, regions, causes)
+                columns[name] = table.sum(axis=1) if by == "지역" else table.sum(axis=0)
+        if by == "월":
+            index = pd.Index(self.months[lo:hi].astype(str), name="월")
+        elif by == "지역":
+            index = pd.Index(self.regions[self._rows(regions)], name="지역")
+        else:
+            index = pd.Index(self.causes[self._cols(causes)], name="원인")
+        return _with_means(pd.DataFrame(columns, index=index))
+
+    # 필터 전체 합계 한 줄 (건수, 측정값 합계, 평균)
+    def total(self, lo=0, hi=None, regions=None, causes=None):
+        sums = {name: [self.range_sum(name, lo, hi, regions, causes).sum()] for name in self.prefix}
+        return _with_means(pd.DataFrame(sums)).iloc[0]
+
+
+# "<측정값>_n" 열을 평균 열로 바꾼다 (값이 있는 사건이 없으면 NaN)
+def _with_means(out):
+    for name in MEASURES:
+        valid = out.pop(f"{name}_n")
+        out[f"평균 {name}"] = out[name] / valid.where(valid > 0)
+    return out
+
+
+# ✅ 전처리: 사건 표 → IncidentCube (코드화 + bincount, 행 수에 선형)
+# region 은 "시도" 또는 "시군구", cause 는 "원인"(세부원인) 또는 "원인구분"
+def build_incident_cube(events, region="시도", cause="원인"):
+    region_codes, regions = pd.factorize(events[region], sort=True)
+    cause_codes, causes = pd.factorize(events[cause], sort=True)
+    when = events["발생시각"]
+    month_number = (when.dt.year * 12 + when.dt.month - 1).to_numpy(dtype=np.int64)
+    first = month_number.min()
+    months = pd.period_range(pd.Period(year=first // 12, month=first % 12 + 1, freq="M"),
+                             periods=month_number.max() - first + 1, freq="M")
+
+    shape = (len(regions), len(months), len(causes))
+    flat = np.ravel_multi_index((region_codes, month_number - first, cause_codes), shape)
+    size = int(np.prod(shape))
+    arrays = {"건수": np.bincount(flat, minlength=size).reshape(shape)}
+    for name in MEASURES:
+        values = events[name].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        arrays[name] = np.bincount(flat[valid], weights=values[valid], minlength=size).reshape(shape)
+        arrays[f"{name}_n"] = np.bincount(flat[valid], minlength=size).reshape(shape)
+    return IncidentCube(regions, months, causes, arrays)
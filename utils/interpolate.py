@@ -0,0 +1,106 @@
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_M, unit_xyz
+from utils.raster import RiskGrid
+from utils.spatial import get_index
+
+# 전역 크리깅은 (n+1)² 연립방정식이므로 관측 지점이 이보다 많으면 IDW 를 쓴다
+MAX_KRIGING_POINTS = 1000
+
+
+# 격자 칸 중심 좌표 (행 0 = 남쪽) → 1차원 (위도, 경도)
+def cell_centers(grid):
+    lat = grid.south + (np.arange(grid.rows) + 0.5) * grid.dlat
+    lon = grid.west + (np.arange(grid.cols) + 0.5) * grid.dlon
+    lat, lon = np.meshgrid(lat, lon, indexing="ij")
+    return lat.ravel(), lon.ravel()
+
+
+# ✅ 알고리즘: 역거리 가중 (IDW) – 질의점마다 최근접 k 개 (Ball 트리) 값을 거리^-power 로 가중 평균
+def idw(lat, lon, values, query_lat, query_lon, k=8, power=2.0):
+    values = np.asarray(values, dtype=float)
+    dist, idx = get_index(lat, lon).knn(query_lat, query_lon, k=k)
+    weight = 1.0 / np.maximum(dist, 1.0) ** power
+    return (values[idx] * weight).sum(axis=1) / weight.sum(axis=1)
+
+
+def _chord_m(lat1, lon1, lat2, lon2):
+    a, b = unit_xyz(lat1, lon1), unit_xyz(lat2, lon2)
+    return np.linalg.norm(a[:, None, :] - b[None, :, :], axis=2) * EARTH_RADIUS_M
+
+
+def _exponential(h, nugget, sill, rng):
+    return nugget + sill * (1 - np.exp(-3 * h / rng))
+
+
+# 경험적 준변동도(거리 구간별 ½ 평균 제곱 차) → 지수 모형 (너깃, 부분 문턱, 상관 거리) 적합
+def fit_variogram(lat, lon, values, bins=10):
+    from scipy.optimize import curve_fit
+
+    values = np.asarray(values, dtype=float)
+    h = _chord_m(lat, lon, lat, lon)
+    iu = np.triu_indices(len(values), k=1)
+    h, gamma = h[iu], 0.5 * (values[:, None] - values[None, :])[iu] ** 2
+    edges = np.quantile(h, np.linspace(0, 1, bins + 1))
+    which = np.clip(np.searchsorted(edges, h, side="right") - 1, 0, bins - 1)
+    count = np.bincount(which, minlength=bins)
+    keep = count > 0
+    lag = (np.bincount(which, weights=h, minlength=bins) / np.maximum(count, 1))[keep]
+    semi = (np.bincount(which, weights=gamma, minlength=bins) / np.maximum(count, 1))[keep]
+    guess = (0.0, max(values.var(), 1e-12), max(np.median(h), 1.0))
+    try:
+        params, _ = curve_fit(_exponential, lag, semi, p0=guess,
+                              bounds=([0, 1e-12, 1.0], [np.inf, np.inf, np.inf]), maxfev=5000)
+    except (RuntimeError, ValueError):
+        params = guess
+    return tuple(float(p) for p in params)
+
+
+# ✅ 알고리즘: 정규 크리깅 – 지수 준변동도로 (n+1) 연립방정식을 한 번 풀고
+# 모든 질의점의 가중치를 오른쪽 항 행렬 하나로 (질의 G 개 → (n+1) × G 해)
+def ordinary_kriging(lat, lon, values, query_lat, query_lon, variogram=None, chunk=20_000):
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n > MAX_KRIGING_POINTS:
+        raise ValueError(f"관측 지점이 {n}개로 많아 크리깅 대신 IDW 를 쓰세요 (최대 {MAX_KRIGING_POINTS}개)")
+    nugget, sill, rng = variogram or fit_variogram(lat, lon, values)
+    system = np.ones((n + 1, n + 1))
+    system[:n, :n] = _exponential(_chord_m(lat, lon, lat, lon), nugget, sill, rng)
+    np.fill_diagonal(system[:n, :n], 0.0)
+    system[n, n] = 0.0
+    inverse = np.linalg.pinv(system)  # 작은 시스템 한 번 – 거의 특이해도 안정적으로
+    out = np.empty(len(query_lat))
+    for start in range(0, len(query_lat), chunk):
+        stop = min(start + chunk, len(query_lat))
+        rhs = np.ones((n + 1, stop - start))
+        rhs[:n] = _exponential(_chord_m(lat, lon, query_lat[start:stop], query_lon[start:stop]), nugget, sill, rng)
+        out[start:stop] = values @ (inverse @ rhs)[:n]
+    return out
+
+
+# ✅ 자료구조: 미리 계산한 보간 격자 – 클릭·일괄 질의는 칸 번호 계산 한 번 (O(1)) 으로 값 조회
+class Surface:
+    def __init__(self, grid, values):
+        self.grid = grid
+        self.values = values  # (rows × cols), 행 0 = 남쪽
+
+    @property
+    def bounds(self):
+        return self.grid.bounds
+
+    # (위도, 경도) 배열 → 보간값 배열 (격자 밖은 NaN)
+    def lookup(self, lat, lon):
+        cell = self.grid.cell_of(np.atleast_1d(lat), np.atleast_1d(lon))
+        flat = self.values.ravel()
+        return np.where(cell >= 0, flat[np.maximum(cell, 0)], np.nan)
+
+
+# 관측 지점 범위(+여백) 위 cell_m 격자에 보간면 만들기 – method: "idw" | "kriging"
+def build_surface(lat, lon, values, cell_m=5000.0, method="idw", pad_cells=10, k=8, power=2.0):
+    grid = RiskGrid.around(lat, lon, cell_m=cell_m, pad_cells=pad_cells)
+    q_lat, q_lon = cell_centers(grid)
+    if method == "kriging":
+        estimate = ordinary_kriging(lat, lon, values, q_lat, q_lon)
+    else:
+        estimate = idw(lat, lon, values, q_lat, q_lon, k=k, power=power)
+    return Surface(grid, estimate.reshape(grid.rows, grid.cols))
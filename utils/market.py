@@ -0,0 +1,152 @@
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 종가를 쌓아 두는 로컬 SQLite 파일
+STORE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "market.sqlite"
+
+
+# ✅ 데이터 소스: fetch(tickers, start, end) → 날짜 × 종목 종가 DataFrame (end 포함)
+class YahooSource:
+    name = "yahoo"
+
+    def fetch(self, tickers, start, end):
+        import yfinance as yf
+
+        raw = yf.download(list(tickers), start=start, end=end + pd.Timedelta(days=1),
+                          auto_adjust=True, progress=False)
+        if raw.empty:
+            return pd.DataFrame(columns=list(tickers), dtype=float)
+        close = raw["Close"]
+        if isinstance(close, pd.Series):  # 단일 종목은 컬럼 구조 없음
+            close = close.to_frame(tickers[0])
+        return close
+
+
+# 폴더 안 <티커>.csv (Date, Close 열) 를 읽는 로컬 소스 – 테스트·오프라인 시연용
+class CsvSource:
+    name = "csv"
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+
+    def fetch(self, tickers, start, end):
+        frames = {}
+        for ticker in tickers:
+            path = self.folder / f"{ticker}.csv"
+            if path.exists():
+                s = pd.read_csv(path, parse_dates=["Date"], index_col="Date")["Close"]
+                frames[ticker] = s.loc[start:end]
+        return pd.DataFrame(frames, columns=list(tickers), dtype=float)
+
+
+# 종목별 고정 시드 기하 브라운 운동 – 네트워크 없이 쓰는 대체 소스 (같은 날짜엔 항상 같은 값)
+class SyntheticSource:
+    name = "synthetic"
+
+    def __init__(self, base_date="2000-01-03"):
+        self.base_date = pd.Timestamp(base_date)
+
+    def fetch(self, tickers, start, end):
+        days = pd.bdate_range(self.base_date, end)
+        frames = {}
+        for ticker in tickers:
+            seed = int.from_bytes(ticker.encode()[:8].ljust(8, b"\0"), "little") % (2 ** 32)
+            rng = np.random.default_rng(seed)
+            drift, vol = rng.uniform(-0.0002, 0.0008), rng.uniform(0.01, 0.03)
+            log_ret = rng.normal(drift, vol, len(days))
+            frames[ticker] = pd.Series(100 * np.exp(np.cumsum(log_ret)), index=days).loc[start:end]
+        return pd.DataFrame(frames, columns=list(tickers), dtype=float)
+
+
+# ✅ 자료구조: 로컬 가격 저장소 (SQLite)
+# prices(종목, 날짜, 종가) + coverage(종목, 받아 둔 시작일, 끝일)
+# 요청 구간 중 coverage 밖의 날짜만 소스에서 받아 덧붙인다 (휴장일 때문에 가격 행만으로는 판단 불가)
+class PriceStore:
+    def __init__(self, source, path=STORE_PATH):
+        self.source = source
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as con:
+            con.execute("CREATE TABLE IF NOT EXISTS prices ("
+                        "source TEXT, ticker TEXT, date TEXT, close REAL, PRIMARY KEY (source, ticker, date))")
+            con.execute("CREATE TABLE IF NOT EXISTS coverage ("
+                        "source TEXT, ticker TEXT, start TEXT, end TEXT, PRIMARY KEY (source, ticker))")
+            # 가격이 한 행도 없는 coverage (예전에 실패한 다운로드를 받은 것으로 기록한 것) 는 지운다
+            con.execute("DELETE FROM coverage WHERE NOT EXISTS (SELECT 1 FROM prices "
+                        "WHERE prices.source = coverage.source AND prices.ticker = coverage.ticker)")
+
+    # Streamlit 은 스레드마다 실행되므로 연결은 호출마다 새로 열고 닫는다
+    # (sqlite3 연결의 with 는 커밋/롤백만 하므로 closing 으로 파일 핸들까지 돌려준다)
+    @contextmanager
+    def _connect(self):
+        with closing(sqlite3.connect(self.path)) as con, con:
+            yield con
+
+    def _coverage(self, con, ticker):
+        row = con.execute("SELECT start, end FROM coverage WHERE source=? AND ticker=?",
+                          (self.source.name, ticker)).fetchone()
+        return (pd.Timestamp(row[0]), pd.Timestamp(row[1])) if row else None
+
+    # 종목별로 빠진 구간 계산 → 같은 구간끼리 묶어 한 번에 받기
+    def missing_ranges(self, tickers, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        todo = {}
+        with self._connect() as con:
+            for ticker in tickers:
+                cov = self._coverage(con, ticker)
+                if cov is None:
+                    gaps = [(start, end)]
+                else:
+                    gaps = []
+                    if start < cov[0]:
+                        gaps.append((start, cov[0] - pd.Timedelta(days=1)))
+                    if end > cov[1]:
+                        gaps.append((cov[1] + pd.Timedelta(days=1), end))
+                for gap in gaps:
+                    todo.setdefault(gap, []).append(ticker)
+        return todo
+
+    def refresh(self, tickers, start, end):
+        todo = self.missing_ranges(tickers, start, end)
+        for (gap_start, gap_end), group in todo.items():
+            frame = self.source.fetch(group, gap_start, gap_end)
+            rows = [
+                (self.source.name, ticker, day.strftime("%Y-%m-%d"), float(value))
+                for ticker in frame.columns
+                for day, value in frame[ticker].dropna().items()
+            ]
+            # 오늘 종가는 아직 확정 전일 수 있으므로 어제까지만 받아 둔 것으로 기록
+            covered_end = min(gap_end, pd.Timestamp.today().normalize() - pd.Timedelta(days=1))
+            # 받아 온 가격이 한 행도 없는 종목 (다운로드 실패·상장 전 등) 은 다음에 다시 받도록 기록하지 않는다
+            fetched = {ticker for ticker in frame.columns if frame[ticker].notna().any()}
+            with self._connect() as con:
+                con.executemany("INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?)", rows)
+                if covered_end < gap_start:
+                    continue
+                for ticker in (t for t in group if t in fetched):
+                    cov = self._coverage(con, ticker)
+                    new = (gap_start, covered_end) if cov is None else (min(cov[0], gap_start), max(cov[1], covered_end))
+                    con.execute("INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?)",
+                                (self.source.name, ticker, new[0].strftime("%Y-%m-%d"), new[1].strftime("%Y-%m-%d")))
+        return sum(len(group) for group in todo.values())
+
+    # 날짜 × 종목 float64 종가 행렬 (한 종목이라도 거래한 날짜 전체, 없는 값은 NaN)
+    def closes(self, tickers, start, end):
+        self.refresh(tickers, start, end)
+        marks = ",".join("?" * len(tickers))
+        with self._connect() as con:
+            long = pd.read_sql_query(
+                f"SELECT date, ticker, close FROM prices WHERE source=? AND ticker IN ({marks}) "
+                "AND date BETWEEN ? AND ? ORDER BY date",
+                con,
+                params=[self.source.name, *tickers,
+                        pd.Timestamp(start).strftime("%Y-%m-%d"), pd.Timestamp(end).strftime("%Y-%m-%d")],
+            )
+        wide = long.pivot(index="date", columns="ticker", values="close").reindex(columns=list(tickers))
+        wide.index = pd.to_datetime(wide.index)
+        wide.index.name = "Date"
+        return wide.astype(np.float64)
@@ -0,0 +1,373 @@
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_M, chord_to_meters, unit_xyz
+
+
+# ✅ 알고리즘: 밀집 그래프용 Prim (O(n²) 시간, O(n) 메모리)
+# 완전 그래프의 간선을 미리 만들지 않고, 트리에 새로 들어온 정점 → 남은 정점들의
+# 거리/평균속도 가중치만 그때그때 계산한다. 남은 정점은 배열 앞쪽에 모아 두고
+# 트리에 들어간 정점은 맨 뒤 원소와 자리를 바꿔 O(1) 로 뺀다.
+# 반환값: (출발 인덱스, 도착 인덱스, 가중치) 배열 – 길이 n-1
+def prim_mst(lat, lon, speed):
+    xyz = unit_xyz(lat, lon)
+    speed = np.asarray(speed, dtype=float).copy()
+    n = len(xyz)
+    m = max(n - 1, 0)
+
+    src = np.empty(m, dtype=np.int64)
+    dst = np.empty(m, dtype=np.int64)
+    weight = np.empty(m)
+    if n < 2:
+        return src, dst, weight
+
+    # 0번 정점에서 시작 – 나머지 정점만 남긴다
+    cur_xyz, cur_speed, cur = xyz[0], speed[0], 0
+    ids = np.arange(1, n)
+    xyz = xyz[1:].copy()
+    speed = speed[1:]
+    best = np.full(n - 1, np.inf)
+    parent = np.zeros(n - 1, dtype=np.int64)
+
+    for k in range(m):
+        size = n - 1 - k
+        chord = np.linalg.norm(xyz[:size] - cur_xyz, axis=1)
+        row = chord_to_meters(chord) / ((cur_speed + speed[:size]) / 2)
+        closer = row < best[:size]
+        best[:size][closer] = row[closer]
+        parent[:size][closer] = cur
+
+        p = int(np.argmin(best[:size]))
+        src[k], dst[k], weight[k] = parent[p], ids[p], best[p]
+        cur, cur_xyz, cur_speed = ids[p], xyz[p].copy(), speed[p]
+
+        last = size - 1
+        for arr in (ids, xyz, speed, best, parent):
+            arr[p] = arr[last]
+    return src, dst, weight
+
+
+# ✅ 자료구조: Union-Find (Disjoint Set) – 부모 배열 하나로 표현
+class UnionFind:
+    def __init__(self, n):
+        self.parent = np.arange(n, dtype=np.int64)
+        self.rank = np.zeros(n, dtype=np.int8)
+        self.components = n
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # 경로 절반 압축
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.rank[ra] < self.rank[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if self.rank[ra] == self.rank[rb]:
+            self.rank[ra] += 1
+        self.components -= 1
+        return True
+
+
+# ✅ 알고리즘: Kruskal – 간선 배열(u, v, w)을 가중치 순으로 훑으며 Union-Find 로 사이클 제거
+# 반환값: 선택된 간선의 인덱스 배열, 남은 연결 요소 수
+def kruskal(n, u, v, w):
+    uf = UnionFind(n)
+    chosen = []
+    for e in np.argsort(w, kind="stable"):
+        if uf.union(u[e], v[e]):
+            chosen.append(e)
+            if uf.components == 1:
+                break
+    return np.asarray(chosen, dtype=np.int64), uf.components
+
+
+# 간선 목록 정리: (작은 인덱스, 큰 인덱스) 로 맞추고 중복·자기 자신 간선 제거
+def _unique_edges(u, v):
+    a, b = np.minimum(u, v), np.maximum(u, v)
+    keep = a != b
+    pairs = np.unique(np.column_stack((a[keep], b[keep])), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+# ✅ 알고리즘: k-최근접 이웃 후보 그래프 (3차원 단위구 좌표 KD 트리)
+# 반환값: 후보 간선 (u, v), 정점별 k번째 이웃까지의 현 길이
+def knn_candidates(tree, xyz, k):
+    k = min(k + 1, len(xyz))
+    chord, idx = tree.query(xyz, k=k)
+    u = np.repeat(np.arange(len(xyz)), k - 1)
+    v = idx[:, 1:].ravel()
+    u, v = _unique_edges(u, v)
+    return u, v, chord[:, -1]
+
+
+# ✅ 알고리즘: 구면 들로네 삼각분할 = 단위구 위 점들의 볼록 껍질
+def delaunay_candidates(xyz):
+    from scipy.spatial import ConvexHull
+
+    simplices = ConvexHull(xyz).simplices
+    u = np.concatenate((simplices[:, 0], simplices[:, 1], simplices[:, 2]))
+    v = np.concatenate((simplices[:, 1], simplices[:, 2], simplices[:, 0]))
+    return _unique_edges(u, v)
+
+
+def _edge_weights(xyz, speed, u, v):
+    chord = np.linalg.norm(xyz[u] - xyz[v], axis=1)
+    return chord_to_meters(chord) / ((speed[u] + speed[v]) / 2)
+
+
+# ✅ 알고리즘: Borůvka 한 단계 – 끊어진 k-NN 숲의 각 연결 요소에서
+# 다른 요소의 가장 가까운 정점으로 가는 간선을 후보에 더한다
+def _bridge_candidates(xyz, u, v):
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    from scipy.spatial import cKDTree
+
+    n = len(xyz)
+    _, labels = connected_components(coo_matrix((np.ones(len(u)), (u, v)), shape=(n, n)), directed=False)
+    bridge_u, bridge_v = [], []
+    for c in np.unique(labels):
+        inside = np.flatnonzero(labels == c)
+        outside = np.flatnonzero(labels != c)
+        _, idx = cKDTree(xyz[outside]).query(xyz[inside], k=1)
+        bridge_u.append(inside)
+        bridge_v.append(outside[idx])
+    return np.concatenate(bridge_u), np.concatenate(bridge_v)
+
+
+# 트리의 각 정점 → 루트 경로 위 최대 간선 가중치
+def _root_path_max(n, u, v, w, root):
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import breadth_first_order
+
+    adj = coo_matrix((np.ones(len(u)), (u, v)), shape=(n, n)).tocsr()
+    order, pred = breadth_first_order(adj, root, directed=False)
+    edge_w = dict(zip(zip(np.minimum(u, v).tolist(), np.maximum(u, v).tolist()), w.tolist()))
+    path_max = np.zeros(n)
+    for node in order[1:].tolist():
+        p = int(pred[node])
+        path_max[node] = max(path_max[p], edge_w[(min(p, node), max(p, node))])
+    return path_max
+
+
+# ✅ 알고리즘: 희소 후보 그래프 위의 MST (+ 검증, 실패 시 완전 그래프 Prim 으로 대체)
+# - 전송속도가 모두 같으면 가중치는 거리에 비례 → 구면 들로네 그래프가 MST 를 반드시 포함
+# - 그 외에는 k-NN 후보 그래프로 Kruskal 을 돌린 뒤, 후보 밖 간선 (i, j) 가
+#   w_ij ≥ max(P_i, P_j) (P = 트리에서 루트까지 경로 최대 가중치) 를 만족하는지 확인한다.
+#   w_ij < P_i 가 될 수 있는 쌍은 반경 P_i·(s_i + s_max)/2 안에만 있으므로 그 쌍만 후보에
+#   추가하고 다시 Kruskal 을 돌린다. 추가할 쌍이 없으면 전체 그래프의 MST 와 같다.
+# - k-NN 숲이 끊어져 있으면 연결 요소 사이 최근접 간선을 더해 잇는다
+#   (요소가 max_components 개를 넘거나 검증할 쌍이 pair_budget·n 을 넘으면 Prim 으로 대체)
+# 반환값: (출발, 도착, 가중치) 배열과 계산 정보(dict)
+def sparse_mst(lat, lon, speed, k=8, max_components=64, pair_budget=50):
+    from scipy.spatial import cKDTree
+
+    xyz = unit_xyz(lat, lon)
+    speed = np.asarray(speed, dtype=float)
+    n = len(xyz)
+    info = {"method": "sparse", "candidates": 0, "verified": False, "rounds": 0}
+    empty = np.empty(0, dtype=np.int64)
+    if n < 2:
+        return empty, empty, np.empty(0), info
+
+    if np.ptp(speed) == 0 and n >= 4:
+        try:
+            u, v = delaunay_candidates(xyz)
+            w = _edge_weights(xyz, speed, u, v)
+            chosen, components = kruskal(n, u, v, w)
+            if components == 1:
+                info.update(method="delaunay", candidates=len(u), verified=True, rounds=1)
+                return u[chosen], v[chosen], w[chosen], info
+        except Exception:
+            pass  # 공면·중복 좌표 등으로 삼각분할 실패 → k-NN 경로로 진행
+
+    tree = cKDTree(xyz)
+    s_max = speed.max()
+    u, v, knn_chord = knn_candidates(tree, xyz, k)
+    w = _edge_weights(xyz, speed, u, v)
+    chosen, components = kruskal(n, u, v, w)
+    while 1 < components <= max_components:
+        bridge_u, bridge_v = _bridge_candidates(xyz, u[chosen], v[chosen])
+        u, v = _unique_edges(np.concatenate((u, bridge_u)), np.concatenate((v, bridge_v)))
+        w = _edge_weights(xyz, speed, u, v)
+        chosen, components = kruskal(n, u, v, w)
+
+    budget = pair_budget * n
+    while components == 1:
+        info["rounds"] += 1
+        root = int(np.argmin(knn_chord))
+        path_max = _root_path_max(n, u[chosen], v[chosen], w[chosen], root)
+        radius_m = path_max * (speed + s_max) / 2
+        radius_chord = 2 * np.sin(np.minimum(radius_m / (2 * EARTH_RADIUS_M), np.pi / 2))
+        risky = np.flatnonzero(radius_chord > knn_chord)
+        if len(risky) == 0:
+            info["verified"] = True
+            break
+
+        neighbours = tree.query_ball_point(xyz[risky], radius_chord[risky])
+        counts = np.fromiter((len(nb) for nb in neighbours), dtype=np.int64, count=len(risky))
+        if counts.sum() > budget:
+            break
+        budget -= counts.sum()
+
+        extra_u = np.repeat(risky, counts)
+        extra_v = np.fromiter((j for nb in neighbours for j in nb), dtype=np.int64, count=counts.sum())
+        extra_w = _edge_weights(xyz, speed, extra_u, extra_v)
+        lighter = extra_w < np.maximum(path_max[extra_u], path_max[extra_v])
+        known = set(zip(u.tolist(), v.tolist()))
+        new_u, new_v = _unique_edges(extra_u[lighter], extra_v[lighter])
+        fresh = np.fromiter(((a, b) not in known for a, b in zip(new_u.tolist(), new_v.tolist())),
+                            dtype=bool, count=len(new_u))
+        if not fresh.any():
+            info["verified"] = True
+            break
+        u = np.concatenate((u, new_u[fresh]))
+        v = np.concatenate((v, new_v[fresh]))
+        w = np.concatenate((w, _edge_weights(xyz, speed, new_u[fresh], new_v[fresh])))
+        chosen, components = kruskal(n, u, v, w)
+
+    if not info["verified"]:
+        src, dst, weight = prim_mst(lat, lon, speed)
+        info.update(method="prim", candidates=n * (n - 1) // 2, verified=True)
+        return src, dst, weight, info
+
+    info["candidates"] = len(u)
+    return u[chosen], v[chosen], w[chosen], info
+
+
+# ✅ 자료구조: 증분 MST – 기지국 추가/삭제/전송속도 변경 시 영향받는 부분만 다시 잇는다
+# - 추가, 속도 증가(가중치 감소): 새 MST ⊆ 기존 트리 ∪ 바뀐 간선 → 2n 개 간선으로 Kruskal
+# - 삭제, 속도 감소(가중치 증가): 해당 정점의 트리 간선만 끊고, 갈라진 조각들을
+#   조각 사이 최소 간선으로 다시 연결 (가장 큰 조각 밖의 정점 행만 계산)
+# 정점 번호는 처음 부여된 인덱스를 유지하고 삭제된 정점은 alive=False 로 표시한다.
+class IncrementalMST:
+    def __init__(self, names, lat, lon, speed, src, dst, weight, info=None):
+        self.names = list(names)
+        self.lat = np.asarray(lat, dtype=float).copy()
+        self.lon = np.asarray(lon, dtype=float).copy()
+        self.speed = np.asarray(speed, dtype=float).copy()
+        self.xyz = unit_xyz(self.lat, self.lon)
+        self.alive = np.ones(len(self.names), dtype=bool)
+        self.adj = {i: {} for i in range(len(self.names))}
+        self.info = info or {}
+        for a, b, w in zip(src.tolist(), dst.tolist(), weight.tolist()):
+            self._link(a, b, w)
+
+    @classmethod
+    def build(cls, names, lat, lon, speed, sparse=False):
+        if sparse:
+            src, dst, weight, info = sparse_mst(lat, lon, speed)
+        else:
+            src, dst, weight = prim_mst(lat, lon, speed)
+            info = {"method": "prim"}
+        return cls(names, lat, lon, speed, src, dst, weight, info)
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def _link(self, a, b, w):
+        self.adj[a][b] = w
+        self.adj[b][a] = w
+
+    def _unlink_all(self, i):
+        for j in self.adj[i]:
+            del self.adj[j][i]
+        self.adj[i] = {}
+
+    # 정점 i → 모든 정점 가중치 (삭제된 정점과 자기 자신은 inf)
+    def _row(self, i, cols=None):
+        cols = np.arange(len(self.names)) if cols is None else cols
+        chord = np.linalg.norm(self.xyz[cols] - self.xyz[i], axis=1)
+        row = chord_to_meters(chord) / ((self.speed[i] + self.speed[cols]) / 2)
+        row[~self.alive[cols] | (cols == i)] = np.inf
+        return row
+
+    def edges(self):
+        src, dst, weight = [], [], []
+        for a, nbrs in self.adj.items():
+            for b, w in nbrs.items():
+                if a < b:
+                    src.append(a)
+                    dst.append(b)
+                    weight.append(w)
+        return np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64), np.asarray(weight)
+
+    def total_weight(self):
+        return float(self.edges()[2].sum())
+
+    # 기존 트리 간선 + 정점 i 의 모든 간선으로 Kruskal
+    def _relink_with(self, i):
+        src, dst, weight = self.edges()
+        cols = np.flatnonzero(self.alive & (np.arange(len(self.names)) != i))
+        u = np.concatenate((src, np.full(len(cols), i)))
+        v = np.concatenate((dst, cols))
+        w = np.concatenate((weight, self._row(i, cols)))
+        chosen, _ = kruskal(len(self.names), u, v, w)
+        self.adj = {k: {} for k in range(len(self.names))}
+        for e in chosen.tolist():
+            self._link(int(u[e]), int(v[e]), float(w[e]))
+
+    # 끊어진 조각들을 조각 사이 최소 간선으로 잇는다
+    def _reconnect(self):
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        n = len(self.names)
+        src, dst, _ = self.edges()
+        _, labels = connected_components(coo_matrix((np.ones(len(src)), (src, dst)), shape=(n, n)), directed=False)
+        alive_ids = np.flatnonzero(self.alive)
+        comps, sizes = np.unique(labels[alive_ids], return_counts=True)
+        if len(comps) <= 1:
+            return
+
+        largest = comps[np.argmax(sizes)]
+        cand_u, cand_v, cand_w = [], [], []
+        for a in alive_ids[labels[alive_ids] != largest].tolist():
+            row = self._row(a, alive_ids)
+            row[labels[alive_ids] == labels[a]] = np.inf
+            for c in comps:
+                if c == labels[a]:
+                    continue
+                in_c = labels[alive_ids] == c
+                j = int(np.argmin(np.where(in_c, row, np.inf)))
+                cand_u.append(a)
+                cand_v.append(int(alive_ids[j]))
+                cand_w.append(float(row[j]))
+
+        # 조각 = 하나의 정점으로 보고 Kruskal
+        cand_u, cand_v, cand_w = np.asarray(cand_u), np.asarray(cand_v), np.asarray(cand_w)
+        chosen, _ = kruskal(n, labels[cand_u], labels[cand_v], cand_w)
+        for e in chosen.tolist():
+            self._link(int(cand_u[e]), int(cand_v[e]), float(cand_w[e]))
+
+    def add_node(self, name, lat, lon, speed):
+        i = len(self.names)
+        self.names.append(name)
+        self.lat = np.append(self.lat, float(lat))
+        self.lon = np.append(self.lon, float(lon))
+        self.speed = np.append(self.speed, float(speed))
+        self.xyz = np.vstack((self.xyz, unit_xyz([lat], [lon])))
+        self.alive = np.append(self.alive, True)
+        self.adj[i] = {}
+        if len(self) > 1:
+            self._relink_with(i)
+        return i
+
+    def remove_node(self, i):
+        self.alive[i] = False
+        self._unlink_all(i)
+        self._reconnect()
+
+    def set_speed(self, i, speed):
+        old = self.speed[i]
+        self.speed[i] = float(speed)
+        if speed >= old:
+            self._unlink_all(i)
+            self._relink_with(i)
+        else:
+            self._unlink_all(i)
+            self._reconnect()
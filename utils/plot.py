@@ -0,0 +1,64 @@
+import numpy as np
+
+
+# ✅ 자료구조: NaN 구분자 선분 배열
+# 선분 m 개를 [x0, x1, NaN, x0, x1, NaN, ...] 길이 3m 배열 하나로 펼친다.
+# Plotly go.Scatter(mode="lines") 트레이스 하나로 모든 선분을 그릴 수 있다.
+def segments_xy(x0, y0, x1, y1):
+    x = np.column_stack((x0, x1, np.full(len(x0), np.nan))).ravel()
+    y = np.column_stack((y0, y1, np.full(len(y0), np.nan))).ravel()
+    return x, y
+
+
+# 정점 n 개 완전 그래프에서 간선 최대 cap 개를 뽑는다 (전체를 만들지 않음)
+# 간선 수가 cap 이하면 전부, 아니면 무작위 표본 (중복·자기 자신 간선 제외)
+def sample_pairs(n, cap, seed=0):
+    if n * (n - 1) // 2 <= cap:
+        return np.triu_indices(n, k=1)
+    rng = np.random.default_rng(seed)
+    u = rng.integers(0, n, size=cap)
+    v = rng.integers(0, n - 1, size=cap)
+    v[v >= u] += 1  # u 와 다른 정점으로 균등 추출
+    pairs = np.unique(np.column_stack((np.minimum(u, v), np.maximum(u, v))), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+# 넓은 배열(T × N)을 열마다 선 하나로 – long 형식 DataFrame 으로 바꾸지 않는다
+def line_figure(x, values, names, title="", y_title=""):
+    import plotly.graph_objects as go
+
+    values = np.asarray(values)
+    values = values.reshape(len(values), -1)
+    fig = go.Figure([go.Scatter(x=x, y=values[:, j], mode="lines", name=str(name)) for j, name in enumerate(names)])
+    fig.update_layout(title=title, yaxis_title=y_title, legend_title_text="기업")
+    return fig
+
+
+# 칸 여러 개(스택·큐)를 도형 목록 한 번 + 텍스트 트레이스 하나로 – 원소 수와 무관하게 트레이스 1 개
+# horizontal=True 면 왼쪽 → 오른쪽, 아니면 위 → 아래 순서로 values 를 놓는다
+def block_figure(values, horizontal, title, color, hidden=0):
+    import plotly.graph_objects as go
+
+    count = len(values)
+    pos = np.arange(count)
+    if horizontal:
+        x, y = pos + 0.5, np.full(count, 0.5)
+        shapes = [dict(type="rect", x0=i, y0=0, x1=i + 1, y1=1) for i in range(count)]
+    else:
+        x, y = np.full(count, 0.5), count - pos - 0.5
+        shapes = [dict(type="rect", x0=0, y0=count - i - 1, x1=1, y1=count - i) for i in range(count)]
+    for shape in shapes:
+        shape.update(line=dict(color="black"), fillcolor=color, layer="below")
+    fig = go.Figure(go.Scatter(x=x, y=y, text=[str(v) for v in values], mode="text", textfont=dict(size=18),
+                               hoverinfo="skip"))
+    if hidden:
+        title += f" · 나머지 {hidden:,}개 생략"
+    span = max(count, 1)
+    fig.update_layout(
+        shapes=shapes, title=title, showlegend=False,
+        height=200 if horizontal else max(300, 60 * span),
+        xaxis=dict(showticklabels=False, range=[0, span if horizontal else 1], showgrid=False, zeroline=False),
+        yaxis=dict(showticklabels=False, range=[0, 1 if horizontal else span], showgrid=False, zeroline=False),
+        margin=dict(l=0, r=0, t=50, b=0),
+    )
+    return fig
@@ -0,0 +1,60 @@
+import re
+
+import numpy as np
+
+
+# ✅ 자료구조: 인구 큐브 (지역 × 성별 × 연령) 정수 배열 + 연령 방향 누적합
+# prefix[r, s, i] = 연령 인덱스 0..i-1 인구 합 → 임의 연령 구간 합이 뺄셈 한 번 (O(1))
+class PopulationCube:
+    def __init__(self, regions, sexes, ages, labels, data):
+        self.regions = np.asarray(regions, dtype=object)
+        self.sexes = tuple(sexes)
+        self.ages = np.asarray(ages)
+        self.labels = list(labels)
+        self.data = data
+        self.prefix = np.concatenate(
+            (np.zeros(data.shape[:2] + (1,), dtype=data.dtype), np.cumsum(data, axis=2)), axis=2
+        )
+        self.index = {name: i for i, name in enumerate(self.regions)}
+
+    def rows(self, regions):
+        return np.array([self.index[r] for r in np.atleast_1d(regions)], dtype=np.int64)
+
+    # 연령 값 [age_min, age_max] → 연령 인덱스 구간 [lo, hi) (ages 는 오름차순)
+    def age_span(self, age_min, age_max):
+        lo = int(np.searchsorted(self.ages, age_min, side="left"))
+        hi = int(np.searchsorted(self.ages, age_max, side="right"))
+        return lo, hi
+
+    # 지역(여러 개 가능) × 성별 구간 합 – 모양 (지역 수, 성별 수)
+    def range_sum(self, regions, lo, hi):
+        r = self.rows(regions)
+        return self.prefix[r, :, hi] - self.prefix[r, :, lo]
+
+    # 한 지역의 연령별 값 (성별 수 × 구간 길이) – 복사 없는 뷰
+    def slice(self, region, lo, hi):
+        return self.data[self.index[region], :, lo:hi]
+
+
+# 열 이름 끝의 연령 표기("0세", "100세 이상", "0~9세") → 시작 연령
+def _age_of(col):
+    m = re.search(r"(\d+)(?:~\d+)?세", col.split("_")[-1])
+    return int(m.group(1)) if m else None
+
+
+# ✅ 전처리: 행정구역 × (성별_연령 열) 넓은 표 → PopulationCube
+# sexes 는 열 이름 안의 성별 표기 ("남", "여" 또는 합계 "계")
+def build_cube(df, sexes=("남", "여"), region_col="행정구역"):
+    columns = {}
+    for sex in sexes:
+        cols = [(age, col) for col in df.columns if f"_{sex}_" in col and "세" in col
+                for age in [_age_of(col)] if age is not None]
+        cols.sort()
+        columns[sex] = cols
+    ages = [age for age, _ in columns[sexes[0]]]
+    labels = [col.split("_")[-1] for _, col in columns[sexes[0]]]
+
+    data = np.stack([
+        df[[col for _, col in columns[sex]]].to_numpy(dtype=np.int64) for sex in sexes
+    ], axis=1)
+    return PopulationCube(df[region_col].to_numpy(), sexes, ages, labels, data)
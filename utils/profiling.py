@@ -0,0 +1,238 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+# 재실행 1회 계측 결과를 쌓는 JSON lines 파일 (한 줄 = 구간·캐시·전송량 기록 하나)
+LOG_PATH = Path(__file__).resolve().parent.parent / ".cache" / "profile.jsonl"
+# 환경 변수 APP_PROFILE=1 이면 사이드바 토글이 켜진 상태로 시작
+ENV_FLAG = "APP_PROFILE"
+
+# 재실행은 세션마다 자기 스레드에서 돌므로 계측기도 스레드별로 하나
+_local = threading.local()
+_NULL = contextlib.nullcontext()
+# 페이지별 재실행 시간 (프로세스 전체, 계측 토글과 무관) – 처음 한 번이 콜드, 나머지는 웜
+_latency = {}
+_latency_lock = threading.Lock()
+
+
+def active():
+    return getattr(_local, "recorder", None)
+
+
+# ✅ 계측기: 재실행 한 번 동안의 이름 붙은 시간 구간 · 캐시 적중/실패 · 브라우저 전송량
+# memory=True 면 tracemalloc 으로 구간마다 최대 추가 할당량도 잰다 (다른 세션 스레드 할당도 섞임)
+class Recorder:
+    def __init__(self, page, memory=False):
+        self.page = page
+        self.run = uuid.uuid4().hex[:12]
+        self.memory = memory
+        self.spans = []     # (이름, 깊이, 시작 오프셋 s, 소요 s, 최대 추가 할당 MB)
+        self.caches = {}    # 이름 → [호출, 실패(계산), 누적 s]
+        self.payloads = []  # (이름, 종류, 바이트)
+        self.depth = 0
+        self._peaks = []    # 열린 구간마다 지금까지 본 tracemalloc 최대값
+        self._started_tracing = memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name):
+        base = 0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)  # 바깥 구간 최대값을 접어 두고 초기화
+            tracemalloc.reset_peak()
+            self._peaks.append(current)
+            base = current
+        row = [name, self.depth, time.perf_counter() - self.started, 0.0, None]
+        self.spans.append(row)
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            row[3] = time.perf_counter() - start
+            self.depth -= 1
+            if self.memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                row[4] = (peak - base) / 2**20
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+
+    def cache_call(self, name, seconds):
+        entry = self.caches.setdefault(name, [0, 0, 0.0])
+        entry[0] += 1
+        entry[2] += seconds
+
+    def cache_miss(self, name):
+        self.caches.setdefault(name, [0, 0, 0.0])[1] += 1
+
+    def payload(self, name, kind, size):
+        self.payloads.append((name, kind, size))
+
+    def stop(self):
+        total = time.perf_counter() - self.started
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return total
+
+    # JSON lines 용 기록 목록 (재실행 id · 페이지 공통)
+    def records(self, total):
+        common = {"run": self.run, "page": self.page, "ts": time.time()}
+        rows = [{**common, "kind": "run", "seconds": total}]
+        rows += [{**common, "kind": "span", "name": name, "depth": depth, "offset": offset,
+                  "seconds": seconds, "peak_mb": peak_mb} for name, depth, offset, seconds, peak_mb in self.spans]
+        rows += [{**common, "kind": "cache", "name": name, "calls": calls, "misses": misses, "seconds": seconds}
+                 for name, (calls, misses, seconds) in self.caches.items()]
+        rows += [{**common, "kind": "payload", "name": name, "type": kind, "bytes": size}
+                 for name, kind, size in self.payloads]
+        return rows
+
+
+# 계측이 꺼져 있으면 미리 만든 nullcontext 하나를 돌려줄 뿐 (구간 측정 비용 없음)
+def span(name):
+    recorder = active()
+    return _NULL if recorder is None else recorder.span(name)
+
+
+# st.cache_data / st.cache_resource 를 감싸 호출 수 · 실패(실제 계산) 수 · 시간을 센다
+# 사용: @cached(st.cache_data(show_spinner="...")) – 함수 본문이 돌면 실패, 아니면 적중
+def cached(cache, name=None):
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            recorder = active()
+            if recorder is not None:
+                recorder.cache_miss(label)
+            return func(*args, **kwargs)
+
+        memoized = cache(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = active()
+            if recorder is None:
+                return memoized(*args, **kwargs)
+            with recorder.span(f"캐시 {label}"):
+                start = time.perf_counter()
+                result = memoized(*args, **kwargs)
+                recorder.cache_call(label, time.perf_counter() - start)
+            return result
+
+        wrapper.clear = getattr(memoized, "clear", None)
+        return wrapper
+    return decorate
+
+
+# 브라우저로 보내는 객체의 직렬화 크기 (계측이 켜졌을 때만 계산 – 지도·차트를 한 번 더 직렬화함)
+def _payload_size(obj):
+    if isinstance(obj, (bytes, bytearray)):
+        return "bytes", len(obj)
+    if isinstance(obj, str):
+        return "text", len(obj.encode("utf-8"))
+    if hasattr(obj, "get_root"):  # folium 지도
+        return "folium", len(obj.get_root().render().encode("utf-8"))
+    if hasattr(obj, "to_plotly_json"):  # plotly Figure
+        return "plotly", len(obj.to_json().encode("utf-8"))
+    if hasattr(obj, "memory_usage"):  # DataFrame
+        return "dataframe", int(obj.memory_usage(deep=True).sum())
+    return type(obj).__name__, len(json.dumps(obj, default=str).encode("utf-8"))
+
+
+def payload(name, obj):
+    recorder = active()
+    if recorder is not None:
+        recorder.payload(name, *_payload_size(obj))
+    return obj
+
+
+# 페이지 맨 위에서 호출: 사이드바 맨 위 계측 영역 + (켜져 있으면) 이번 재실행 계측기 시작
+# 결과 표는 finish() 가 같은 영역에 채운다
+def begin(page):
+    import streamlit as st
+
+    _local.page, _local.page_started = page, time.perf_counter()
+    # 지난 재실행이 st.stop() 으로 끝나 finish() 를 못 거쳤으면 tracemalloc 부터 정리
+    unfinished = st.session_state.pop("_profile_recorder", None)
+    if unfinished is not None:
+        unfinished.stop()
+    box = st.sidebar.expander("⏱️ 성능 계측")
+    enabled = box.toggle("계측 켜기", key="profile_enabled", value=os.environ.get(ENV_FLAG) == "1")
+    _local.recorder = None
+    _local.box = box
+    if enabled:
+        memory = box.checkbox("메모리 추적 (tracemalloc, 느려짐)", key="profile_memory")
+        box.checkbox("JSON lines 로 저장", key="profile_log", help=str(LOG_PATH))
+        _local.recorder = st.session_state["_profile_recorder"] = Recorder(page, memory=memory)
+    return _local.recorder
+
+
+def _record_latency(page, seconds):
+    with _latency_lock:
+        if page in _latency:
+            _latency[page]["warm"].append(seconds)
+        else:
+            _latency[page] = {"cold": seconds, "warm": []}
+
+
+# 페이지별 콜드(프로세스 첫 재실행) · 웜(이후 재실행 중앙값) 시간 표
+def page_latency():
+    import numpy as np
+    import pandas as pd
+
+    with _latency_lock:
+        rows = [(page, entry["cold"] * 1e3, np.median(entry["warm"]) * 1e3 if entry["warm"] else np.nan,
+                 len(entry["warm"]) + 1) for page, entry in sorted(_latency.items())]
+    return pd.DataFrame(rows, columns=["페이지", "콜드(ms)", "웜 중앙값(ms)", "재실행 수"])
+
+
+# 페이지 맨 끝에서 호출: 재실행 시간 기록 · 예열 시작 · 계측 결과를 사이드바에 그리고 (선택 시) JSON lines 로 추가
+# st.stop() 으로 끝난 재실행은 여기까지 오지 않으므로 기록되지 않는다
+def finish():
+    import pandas as pd
+    import streamlit as st
+
+    from utils import warmup
+
+    page = getattr(_local, "page", None)
+    if page is not None:
+        _record_latency(page, time.perf_counter() - _local.page_started)
+        _local.page = None
+    warmup.start()  # 첫 화면을 다 그린 뒤에만 (프로세스당 한 번)
+    recorder, box = active(), getattr(_local, "box", None)
+    _local.recorder = None
+    st.session_state.pop("_profile_recorder", None)
+    if recorder is None or box is None:
+        return
+    total = recorder.stop()
+    box.metric("재실행 전체", f"{total * 1e3:,.0f} ms")
+    if recorder.spans:
+        spans = pd.DataFrame(recorder.spans, columns=["구간", "깊이", "시작(s)", "소요(ms)", "최대 할당(MB)"])
+        spans["구간"] = ["· " * d + name for name, d in zip(spans["구간"], spans["깊이"])]
+        spans["소요(ms)"] *= 1e3
+        if not recorder.memory:
+            spans = spans.drop(columns="최대 할당(MB)")
+        box.dataframe(spans.drop(columns="깊이").round(2), hide_index=True)
+    if recorder.caches:
+        box.dataframe(pd.DataFrame([(name, calls, calls - misses, misses, seconds * 1e3)
+                                    for name, (calls, misses, seconds) in recorder.caches.items()],
+                                   columns=["캐시", "호출", "적중", "실패", "시간(ms)"]).round(2), hide_index=True)
+    if recorder.payloads:
+        box.dataframe(pd.DataFrame([(name, kind, size / 1024) for name, kind, size in recorder.payloads],
+                                   columns=["전송", "종류", "크기(KB)"]).round(1), hide_index=True)
+    if st.session_state.get("profile_log"):
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with LOG_PATH.open("a", encoding="utf-8") as log:
+            for row in recorder.records(total):
+                log.write(json.dumps(row, ensure_ascii=False) + "\n")
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+
+# 큰 값이 앞에 오도록 NaN 을 -inf 로 (NaN 은 항상 마지막)
+def _keys(values, largest=True):
+    values = np.asarray(values, dtype=float)
+    keys = values if largest else -values
+    return np.where(np.isnan(keys), -np.inf, keys)
+
+
+# ✅ 알고리즘: argpartition 부분 선택 – k 번째 값까지만 나눈 뒤 k 개만 정렬, O(n + k log k)
+# with_ties=True 면 k 번째와 같은 값은 모두 포함한다
+def top_k(values, k, largest=True, with_ties=False):
+    keys = _keys(values, largest)
+    n = len(keys)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-keys, kind="stable")
+    kth = keys[np.argpartition(-keys, k - 1)[k - 1]]
+    above = np.flatnonzero(keys > kth)
+    tied = np.flatnonzero(keys == kth)
+    # k 번째 값과 같은 행은 앞쪽(원래 순서)부터 채운다 – 결과가 항상 같도록
+    chosen = np.concatenate((above, tied if with_ties else tied[:k - len(above)]))
+    return chosen[np.lexsort((chosen, -keys[chosen]))]  # 값 내림차순, 같으면 원래 순서
+
+
+# 전체 순위 (동점은 같은 순위, 다음 순위는 건너뜀: 1, 2, 2, 4 …)
+# 내림차순 정렬 한 번 → 같은 값 묶음의 첫 위치가 그 묶음의 순위
+def rank_with_ties(values, largest=True):
+    keys = _keys(values, largest)
+    order = np.argsort(-keys, kind="stable")
+    ordered = keys[order]
+    first = np.r_[True, ordered[1:] != ordered[:-1]]
+    ranks = np.empty(len(keys), dtype=np.int64)
+    ranks[order] = np.maximum.accumulate(np.where(first, np.arange(len(keys)), 0)) + 1
+    return ranks
+
+
+# 그룹(지역)마다 상위 k 개 – 그룹 코드·값으로 한 번 정렬해 그룹 안 위치가 k 미만인 행만
+# 반환: 행 인덱스 (그룹 순서, 그룹 안에서는 값 내림차순)
+def group_top_k(groups, values, k, largest=True):
+    codes, _ = pd.factorize(np.asarray(groups), sort=True)
+    keys = _keys(values, largest)
+    order = np.lexsort((-keys, codes))
+    sorted_codes = codes[order]
+    starts = np.r_[0, np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1]
+    position = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    return order[position < k]
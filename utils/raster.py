@@ -0,0 +1,127 @@
+import base64
+import io
+
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_M
+
+# 격자 한 변의 최대 칸 수 (이미지 크기 상한)
+MAX_CELLS = 1024
+
+
+# ✅ 자료구조: 위경도 고정 격자
+# 점 n 개를 (행, 열) 칸 번호로 바꿔 bincount 로 합·개수·최댓값을 모은다.
+# 결과 크기는 격자 해상도에만 의존하고 점 개수와는 무관하다.
+class RiskGrid:
+    def __init__(self, south, west, north, east, cell_m=200.0):
+        mid_lat = np.radians((south + north) / 2)
+        self.dlat = np.degrees(cell_m / EARTH_RADIUS_M)
+        self.dlon = self.dlat / max(np.cos(mid_lat), 1e-6)
+        self.rows = int(min(MAX_CELLS, max(1, np.ceil((north - south) / self.dlat))))
+        self.cols = int(min(MAX_CELLS, max(1, np.ceil((east - west) / self.dlon))))
+        # 칸 수 상한에 걸리면 칸을 키워 범위를 덮는다
+        self.dlat = max(self.dlat, (north - south) / self.rows)
+        self.dlon = max(self.dlon, (east - west) / self.cols)
+        self.south, self.west = south, west
+
+    @classmethod
+    def around(cls, lat, lon, cell_m=200.0, pad_cells=2):
+        lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+        pad = np.degrees(cell_m / EARTH_RADIUS_M) * pad_cells
+        pad_lon = pad / max(np.cos(np.radians(lat.mean())), 1e-6)
+        return cls(lat.min() - pad, lon.min() - pad_lon, lat.max() + pad, lon.max() + pad_lon, cell_m)
+
+    @property
+    def bounds(self):
+        return [[self.south, self.west],
+                [self.south + self.rows * self.dlat, self.west + self.cols * self.dlon]]
+
+    # 점 → 평탄화된 칸 번호 (격자 밖이면 -1)
+    def cell_of(self, lat, lon):
+        r = np.floor((np.asarray(lat, dtype=float) - self.south) / self.dlat).astype(np.int64)
+        c = np.floor((np.asarray(lon, dtype=float) - self.west) / self.dlon).astype(np.int64)
+        inside = (r >= 0) & (r < self.rows) & (c >= 0) & (c < self.cols)
+        return np.where(inside, r * self.cols + c, -1)
+
+    # agg: "sum" | "mean" | "max" | "count" → (rows × cols) 배열, 빈 칸은 NaN (count/sum 은 0)
+    def aggregate(self, lat, lon, values=None, agg="max"):
+        cell = self.cell_of(lat, lon)
+        keep = cell >= 0
+        cell = cell[keep]
+        size = self.rows * self.cols
+        count = np.bincount(cell, minlength=size)
+        if agg == "count":
+            return count.reshape(self.rows, self.cols).astype(float)
+        values = np.asarray(values, dtype=float)[keep]
+        if agg == "sum":
+            out = np.bincount(cell, weights=values, minlength=size)
+        elif agg == "mean":
+            out = np.bincount(cell, weights=values, minlength=size) / np.maximum(count, 1)
+            out[count == 0] = np.nan
+        elif agg == "max":
+            out = np.full(size, np.nan)
+            order = np.lexsort((values, cell))  # 칸별로 정렬 → 각 칸의 마지막이 최댓값
+            last = np.r_[cell[order][1:] != cell[order][:-1], True]
+            out[cell[order][last]] = values[order][last]
+        else:
+            raise ValueError(f"지원하지 않는 집계 방식: {agg}")
+        return out.reshape(self.rows, self.cols)
+
+
+# 빈 칸(NaN)을 제외하고 가우시안으로 번지게 해 히트맵처럼 보이도록 (정규화 합성곱)
+def smooth(grid, sigma=1.0):
+    if sigma <= 0:
+        return grid
+    from scipy.ndimage import gaussian_filter
+
+    filled = np.nan_to_num(grid)
+    weight = gaussian_filter((~np.isnan(grid)).astype(float), sigma)
+    out = gaussian_filter(filled, sigma) / np.maximum(weight, 1e-12)
+    out[weight < 0.05] = np.nan
+    return out
+
+
+# 격자 값 → RGBA 이미지 (행 0 이 남쪽이므로 위아래를 뒤집는다), NaN 은 투명
+def to_rgba(grid, cmap="YlOrRd", vmin=None, vmax=None, opacity=0.75):
+    from matplotlib import colormaps
+
+    vmin = np.nanmin(grid) if vmin is None else vmin
+    vmax = np.nanmax(grid) if vmax is None else vmax
+    norm = (grid - vmin) / max(vmax - vmin, 1e-12)
+    rgba = colormaps[cmap](np.clip(np.nan_to_num(norm), 0, 1))
+    rgba[..., 3] = np.where(np.isnan(grid), 0.0, opacity)
+    return (rgba[::-1] * 255).astype(np.uint8)
+
+
+def png_data_url(rgba):
+    from matplotlib.image import imsave
+
+    buf = io.BytesIO()
+    imsave(buf, rgba, format="png")
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+
+# 위도 등간격 행 → 웹 메르카토르 y 등간격 행 (가까운 행 재표본)
+# 지도 타일은 메르카토르라 넓은 범위에서 그대로 얹으면 남북으로 어긋난다
+def to_mercator_rows(grid, south, north):
+    def merc(lat):
+        return np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+
+    rows = grid.shape[0]
+    y = np.linspace(merc(south), merc(north), rows + 1)
+    centers = np.degrees(2 * np.arctan(np.exp((y[:-1] + y[1:]) / 2)) - np.pi / 2)
+    src = np.clip(((centers - south) / (north - south) * rows).astype(int), 0, rows - 1)
+    return grid[src]
+
+
+# 격자 → 지도에 바로 얹을 PNG data URL (메르카토르 보정 포함)
+def raster_png(grid, bounds, **style):
+    (south, _), (north, _) = bounds
+    return png_data_url(to_rgba(to_mercator_rows(grid, south, north), **style))
+
+
+# folium 지도에 얹을 이미지 오버레이 – HTML 크기는 격자 해상도로만 정해진다
+def image_overlay(image, bounds, name="위험도 격자"):
+    import folium
+
+    return folium.raster_layers.ImageOverlay(image, bounds=bounds, name=name, pixelated=False)
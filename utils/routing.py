@@ -0,0 +1,139 @@
+import json
+
+import numpy as np
+
+from utils.geo import haversine
+from utils.spatial import get_index
+
+# 좌표를 이 소수 자릿수로 반올림해 같은 점이면 같은 교차점(노드)으로 본다 (약 1cm)
+SNAP_DECIMALS = 7
+# 길이 0 간선 방지 (csgraph 는 0 가중치를 간선 없음으로 볼 수 있음)
+MIN_EDGE_M = 1e-3
+
+
+# ✅ 자료구조: CSR 인접 배열 도로 그래프
+# indptr[i]:indptr[i+1] 구간의 indices / length 가 노드 i 의 이웃과 간선 길이(m)
+class RoadGraph:
+    def __init__(self, lat, lon, u, v):
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.edge_u = np.asarray(u, dtype=np.int64)
+        self.edge_v = np.asarray(v, dtype=np.int64)
+        self.edge_len = np.maximum(
+            haversine(self.lat[self.edge_u], self.lon[self.edge_u], self.lat[self.edge_v], self.lon[self.edge_v]),
+            MIN_EDGE_M,
+        )
+
+    def __len__(self):
+        return len(self.lat)
+
+    # 간선 비용 배열 → 무방향 CSR 행렬 (중복 간선은 가장 싼 것만)
+    def csr(self, cost=None):
+        from scipy.sparse import csr_matrix
+
+        cost = self.edge_len if cost is None else cost
+        u = np.concatenate((self.edge_u, self.edge_v))
+        v = np.concatenate((self.edge_v, self.edge_u))
+        c = np.concatenate((cost, cost))
+        order = np.lexsort((c, v, u))
+        u, v, c = u[order], v[order], c[order]
+        first = np.ones(len(u), dtype=bool)
+        first[1:] = (u[1:] != u[:-1]) | (v[1:] != v[:-1])
+        return csr_matrix((c[first], (u[first], v[first])), shape=(len(self), len(self)))
+
+    def nearest_node(self, lat, lon):
+        dist, idx = get_index(self.lat, self.lon).knn(lat, lon, k=1)
+        return idx[:, 0], dist[:, 0]
+
+
+# GeoJSON 의 LineString / MultiLineString 을 노드·간선 배열로 변환
+def road_graph_from_geojson(data):
+    if isinstance(data, (bytes, str)):
+        data = json.loads(data)
+    lines = []
+    for feature in data.get("features", []):
+        geom = feature.get("geometry") or {}
+        if geom.get("type") == "LineString":
+            lines.append(geom["coordinates"])
+        elif geom.get("type") == "MultiLineString":
+            lines.extend(geom["coordinates"])
+
+    seg_a, seg_b = [], []
+    for coords in lines:
+        pts = np.asarray(coords, dtype=float)[:, :2]  # GeoJSON 은 [경도, 위도] 순서
+        if len(pts) >= 2:
+            seg_a.append(pts[:-1])
+            seg_b.append(pts[1:])
+    if not seg_a:
+        raise ValueError("GeoJSON 에 LineString 도로가 없습니다.")
+
+    a = np.round(np.concatenate(seg_a), SNAP_DECIMALS)
+    b = np.round(np.concatenate(seg_b), SNAP_DECIMALS)
+    nodes, inverse = np.unique(np.concatenate((a, b)), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    u, v = inverse[:len(a)], inverse[len(a):]
+    keep = u != v
+    return RoadGraph(nodes[:, 1], nodes[:, 0], u[keep], v[keep])
+
+
+# OSM PBF 추출본 – pyrosm 이 설치된 경우에만 지원
+def road_graph_from_pbf(path, network_type="walking"):
+    try:
+        from pyrosm import OSM
+    except ImportError as e:
+        raise ImportError("OSM PBF 파일을 읽으려면 pyrosm 패키지가 필요합니다. (pip install pyrosm)") from e
+    edges = OSM(path).get_network(network_type=network_type)
+    return road_graph_from_geojson(json.loads(edges[["geometry"]].to_json()))
+
+
+# ✅ 알고리즘: 위험도 벌점 – 간선 중점에서 radius_m 안 가장 가까운 산불 지점의 위험도(0~1 정규화)로
+# 비용 = 길이 × (1 + alpha × 위험도). 위험 지역을 지나는 경로일수록 비싸진다.
+def risk_penalized_cost(graph, fire_lat, fire_lon, risk, radius_m=500.0, alpha=4.0):
+    risk = np.asarray(risk, dtype=float)
+    span = np.ptp(risk)
+    norm = (risk - risk.min()) / span if span > 0 else np.ones_like(risk)
+    mid_lat = (graph.lat[graph.edge_u] + graph.lat[graph.edge_v]) / 2
+    mid_lon = (graph.lon[graph.edge_u] + graph.lon[graph.edge_v]) / 2
+    dist, idx = get_index(fire_lat, fire_lon).knn(mid_lat, mid_lon, k=1)
+    edge_risk = np.where(dist[:, 0] <= radius_m, norm[idx[:, 0]], 0.0)
+    return graph.edge_len * (1 + alpha * edge_risk)
+
+
+# ✅ 알고리즘: 다중 출발점 다익스트라 – 모든 대피소에서 동시에 출발해 한 번에
+# 모든 노드의 (가장 가까운 대피소까지 비용, 이전 노드, 해당 대피소)를 구한다
+class EvacuationField:
+    def __init__(self, graph, shelter_lat, shelter_lon, cost=None, max_snap_m=500.0):
+        from scipy.sparse.csgraph import dijkstra
+
+        self.graph = graph
+        node, snap = graph.nearest_node(shelter_lat, shelter_lon)
+        self.shelter_ids = np.flatnonzero(snap <= max_snap_m)  # 도로에 붙일 수 있는 대피소만
+        self.shelter_node = node[self.shelter_ids]
+        sources = np.unique(self.shelter_node)
+
+        self.dist = np.full(len(graph), np.inf)
+        self.pred = np.full(len(graph), -9999, dtype=np.int64)
+        self.origin = np.full(len(graph), -1, dtype=np.int64)
+        if len(sources):
+            self.dist, self.pred, self.origin = dijkstra(
+                graph.csr(cost), directed=False, indices=sources,
+                return_predecessors=True, min_only=True,
+            )
+        # 노드 → 대피소 행 번호 (같은 노드에 여러 대피소가 붙으면 첫 번째)
+        self._shelter_at = dict(zip(self.shelter_node[::-1].tolist(), self.shelter_ids[::-1].tolist()))
+
+    # 여러 지점 → (대피소 행 번호, 비용, 출발 노드). 도달 불가면 대피소 -1, 비용 inf
+    def assign(self, lat, lon):
+        node, _ = self.graph.nearest_node(lat, lon)
+        cost = self.dist[node]
+        shelter = np.array([self._shelter_at.get(int(o), -1) for o in self.origin[node]], dtype=np.int64)
+        shelter[~np.isfinite(cost)] = -1
+        return shelter, cost, node
+
+    # 노드 → 대피소까지 경로 좌표 [(위도, 경도), ...]
+    def path(self, node):
+        nodes = [int(node)]
+        while self.pred[nodes[-1]] >= 0:
+            nodes.append(int(self.pred[nodes[-1]]))
+        nodes = np.asarray(nodes)
+        return list(zip(self.graph.lat[nodes].tolist(), self.graph.lon[nodes].tolist()))
@@ -0,0 +1,73 @@
+import numpy as np
+
+METHODS = ("product", "sum", "topsis")
+
+
+# 기준 열 행렬(n × m)의 정규화 통계 – 데이터가 같으면 한 번만 계산해 재사용
+# 결측은 통계에서 빼고, 점수 계산 때는 가장 나쁜 값(0)으로 본다
+class CriteriaStats:
+    def __init__(self, matrix):
+        matrix = np.asarray(matrix, dtype=float)
+        self.matrix = matrix
+        self.min = np.nanmin(matrix, axis=0)
+        self.max = np.nanmax(matrix, axis=0)
+        self.norm2 = np.sqrt(np.nansum(matrix ** 2, axis=0))  # TOPSIS 벡터 정규화용
+
+    # ✅ 알고리즘: 열 전체 Min-Max 정규화 한 번 (benefit: 클수록 좋음, cost: 작을수록 좋음)
+    # directions: 열마다 +1 (benefit) / -1 (cost)
+    def minmax(self, directions):
+        span = np.where(self.max > self.min, self.max - self.min, 1.0)
+        scaled = (self.matrix - self.min) / span
+        scaled = np.where(np.asarray(directions) > 0, scaled, 1 - scaled)
+        return np.nan_to_num(scaled, nan=0.0)
+
+
+# 가중치 한 벡터 (m,) 또는 시나리오 여러 개 (S × m) → (S × m)
+def _weights(weights, normalize=False):
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    if normalize:
+        weights = weights / np.maximum(weights.sum(axis=1, keepdims=True), 1e-12)
+    return weights
+
+
+# ✅ 알고리즘: 다기준 점수 – 시나리오 S 개를 행렬 곱 한 번으로
+#   product: Π x_j^w_j (가중치가 모두 1 이면 기존 (1-온도)(1-강수) 와 같은 값)
+#   sum:     Σ w_j x_j / Σ w_j
+#   topsis:  이상해·최악해까지 가중 거리로 만든 근접도 d⁻ / (d⁺ + d⁻) (가중치 크기에 무관)
+# 반환: weights 가 1차원이면 (n,), 2차원이면 (S × n)
+def score(stats, weights, directions, method="product"):
+    single = np.ndim(weights) == 1
+    w = _weights(weights, normalize=method == "sum")
+    if method == "product":
+        with np.errstate(divide="ignore"):
+            logs = np.log(stats.minmax(directions))
+        out = np.exp(np.where(np.isinf(logs), -1e12, logs) @ w.T).T
+    elif method == "sum":
+        out = (stats.minmax(directions) @ w.T).T
+    elif method == "topsis":
+        r = np.nan_to_num(stats.matrix / np.where(stats.norm2 > 0, stats.norm2, 1.0))
+        benefit = np.asarray(directions) > 0
+        best = np.where(benefit, r.max(axis=0), r.min(axis=0))
+        worst = np.where(benefit, r.min(axis=0), r.max(axis=0))
+        # 가중치를 곱해도 이상해·최악해 열은 그대로이므로 거리² = (차이²) @ w²
+        d_best = np.sqrt(((r - best) ** 2) @ (w ** 2).T)
+        d_worst = np.sqrt(((r - worst) ** 2) @ (w ** 2).T)
+        out = (d_worst / np.maximum(d_best + d_worst, 1e-12)).T
+    else:
+        raise ValueError(f"지원하지 않는 집계 방식: {method} (가능: {', '.join(METHODS)})")
+    return out[0] if single else out
+
+
+# 기준 가중치 주변 시나리오 S 개 (각 가중치를 ±spread 비율 안에서 균등하게 흔듦)
+def weight_scenarios(base, count, spread=0.5, seed=0):
+    base = np.asarray(base, dtype=float)
+    rng = np.random.default_rng(seed)
+    return base * rng.uniform(1 - spread, 1 + spread, size=(count, len(base)))
+
+
+# ✅ 민감도: 시나리오마다 상위 k 에 든 횟수 – (S × n) 점수에서 행마다 argpartition 한 번
+def top_k_frequency(scores, k):
+    scores = np.atleast_2d(scores)
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.bincount(top.ravel(), minlength=scores.shape[1]) / len(scores)
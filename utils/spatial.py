@@ -0,0 +1,112 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_M
+
+# 최근에 쓴 인덱스 몇 개만 메모리에 유지 (데이터셋 해시 → SpatialIndex)
+MAX_CACHED = 8
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _as_radians(lat, lon):
+    lat = np.atleast_1d(np.asarray(lat, dtype=float))
+    lon = np.atleast_1d(np.asarray(lon, dtype=float))
+    return np.radians(np.column_stack((lat, lon)))
+
+
+# 좌표 배열 내용으로 만든 캐시 키
+def dataset_key(lat, lon):
+    coords = np.ascontiguousarray(np.column_stack((np.asarray(lat, dtype=float), np.asarray(lon, dtype=float))))
+    return hashlib.blake2b(coords.tobytes(), digest_size=16).hexdigest()
+
+
+# ✅ 자료구조: Ball 트리 (haversine 거리) – 구면 위 대원 거리로 바로 탐색
+# 모든 거리는 m 단위로 주고받는다.
+class SpatialIndex:
+    def __init__(self, lat, lon):
+        from sklearn.neighbors import BallTree
+
+        self.points = _as_radians(lat, lon)
+        self.tree = BallTree(self.points, metric="haversine")
+
+    def __len__(self):
+        return len(self.points)
+
+    # k-최근접 이웃 (여러 질의점 한꺼번에) → (거리 m, 인덱스) 배열, 모양 (질의 수, k)
+    def knn(self, lat, lon, k=5):
+        k = min(k, len(self))
+        dist, idx = self.tree.query(_as_radians(lat, lon), k=k)
+        return dist * EARTH_RADIUS_M, idx
+
+    # 반경 radius_m 안의 점 (여러 질의점) → 질의점별 (인덱스, 거리 m) 배열 목록, 가까운 순
+    def radius_batch(self, lat, lon, radius_m):
+        idx, dist = self.tree.query_radius(
+            _as_radians(lat, lon), r=np.asarray(radius_m, dtype=float) / EARTH_RADIUS_M,
+            return_distance=True, sort_results=True,
+        )
+        return [(i, d * EARTH_RADIUS_M) for i, d in zip(idx, dist)]
+
+    # 한 점 기준 반경 탐색 → (인덱스, 거리 m)
+    def radius(self, lat, lon, radius_m):
+        return self.radius_batch(lat, lon, radius_m)[0]
+
+    # 반경 안 점 개수만 (여러 질의점)
+    def count_within(self, lat, lon, radius_m):
+        return self.tree.query_radius(_as_radians(lat, lon), r=np.asarray(radius_m, dtype=float) / EARTH_RADIUS_M,
+                                      count_only=True)
+
+
+# 같은 좌표 데이터셋이면 이미 만든 트리를 재사용
+def get_index(lat, lon):
+    key = dataset_key(lat, lon)
+    with _lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = SpatialIndex(lat, lon)
+    with _lock:
+        _cache[key] = index
+        while len(_cache) > MAX_CACHED:
+            _cache.popitem(last=False)
+    return index
+
+
+# 후보지 격자: 범위 [south, north] × [west, east] 를 spacing_m 간격으로 → (위도, 경도) 1차원 배열
+def site_grid(south, west, north, east, spacing_m):
+    dlat = np.degrees(spacing_m / EARTH_RADIUS_M)
+    dlon = dlat / max(np.cos(np.radians((south + north) / 2)), 1e-6)
+    lat, lon = np.meshgrid(np.arange(south, north + dlat / 2, dlat), np.arange(west, east + dlon / 2, dlon), indexing="ij")
+    return lat.ravel(), lon.ravel()
+
+
+# ✅ 일괄 근접 요약: 후보지 전체에 k-NN 한 번 (chunk 개씩) → 후보지마다
+# 가장 가까운 지점·거리, 이웃 값의 역거리 가중 평균(IDW, 거리² 반비례), 이웃 중 최고값 지점·거리
+def neighbour_summary(index, lat, lon, values, k=5, chunk=200_000):
+    lat = np.atleast_1d(np.asarray(lat, dtype=float))
+    lon = np.atleast_1d(np.asarray(lon, dtype=float))
+    values = np.asarray(values, dtype=float)
+    n = len(lat)
+    out = {name: np.empty(n) for name in ("nearest_m", "idw", "mean", "best_value", "best_m")}
+    out["nearest"] = np.empty(n, dtype=np.int64)
+    out["best"] = np.empty(n, dtype=np.int64)
+    rows = np.arange(min(chunk, n))
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        dist, idx = index.knn(lat[start:stop], lon[start:stop], k=k)
+        near = values[idx]
+        weight = 1.0 / np.maximum(dist, 1.0) ** 2  # 지점 바로 위(0 m)는 1 m 로 본다
+        best = np.argmax(near, axis=1)
+        r = rows[:stop - start]
+        out["nearest"][start:stop] = idx[:, 0]
+        out["nearest_m"][start:stop] = dist[:, 0]
+        out["idw"][start:stop] = (near * weight).sum(axis=1) / weight.sum(axis=1)
+        out["mean"][start:stop] = near.mean(axis=1)
+        out["best"][start:stop] = idx[r, best]
+        out["best_value"][start:stop] = near[r, best]
+        out["best_m"][start:stop] = dist[r, best]
+    return out
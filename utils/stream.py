@@ -0,0 +1,91 @@
+import numpy as np
+
+
+# ✅ 자료구조: 고정 크기 링 버퍼 (capacity × N) – 새 행 추가 O(N), 오래된 행은 덮어씀
+class RingBuffer:
+    def __init__(self, capacity, width, dtype=float):
+        self.data = np.full((capacity, width), np.nan, dtype=dtype)
+        self.stamps = np.empty(capacity, dtype=object)
+        self.capacity = capacity
+        self.size = 0
+        self.head = 0  # 다음에 쓸 위치
+
+    def append(self, stamp, row):
+        self.data[self.head] = row
+        self.stamps[self.head] = stamp
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    # 오래된 것 → 최신 순서로 정렬한 복사본 (그릴 때만 호출)
+    def view(self):
+        if self.size < self.capacity:
+            return self.stamps[:self.size], self.data[:self.size]
+        order = np.r_[self.head:self.capacity, 0:self.head]
+        return self.stamps[order], self.data[order]
+
+
+# ✅ 알고리즘: 누적 통계 – 봉 하나당 O(N) (지나간 봉 수와 무관)
+# 기준가·최신가·최고가, Welford 방식 일간 수익률 평균/분산
+class RunningStats:
+    def __init__(self, width):
+        self.count = 0
+        self.base = np.full(width, np.nan)
+        self.last = np.full(width, np.nan)
+        self.peak = np.full(width, np.nan)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.n_ret = np.zeros(width)
+
+    def update(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        valid = ~np.isnan(prices)
+        first = valid & np.isnan(self.base)
+        self.base[first] = prices[first]
+
+        has_prev = valid & ~np.isnan(self.last)
+        ret = np.where(has_prev, prices / np.where(has_prev, self.last, 1) - 1, 0.0)
+        self.n_ret += has_prev
+        delta = ret - self.mean
+        self.mean += np.where(has_prev, delta / np.maximum(self.n_ret, 1), 0)
+        self.m2 += np.where(has_prev, delta * (ret - self.mean), 0)
+
+        self.last[valid] = prices[valid]
+        self.peak = np.fmax(self.peak, prices)
+        self.count += 1
+
+    def cumulative_return(self):
+        return self.last / self.base - 1
+
+    def drawdown(self):
+        return self.last / self.peak - 1
+
+    def volatility(self):
+        return np.sqrt(self.m2 / np.maximum(self.n_ret - 1, 1))
+
+
+# 날짜 × 종목 DataFrame / 배열 → (시각, 가격 벡터) 봉 제너레이터
+def replay_bars(frame):
+    values = frame.to_numpy(dtype=float)
+    for stamp, row in zip(frame.index, values):
+        yield stamp, row
+
+
+# ⏯️ 리플레이 상태 – 봉 소스(제너레이터)에서 k 개씩 꺼내 통계·버퍼를 갱신
+class BarReplay:
+    def __init__(self, bars, names, window=250):
+        self.bars = iter(bars)
+        self.names = list(names)
+        self.stats = RunningStats(len(self.names))
+        self.returns = RingBuffer(window, len(self.names))
+        self.finished = False
+
+    def step(self, k=1):
+        for _ in range(k):
+            bar = next(self.bars, None)
+            if bar is None:
+                self.finished = True
+                break
+            stamp, prices = bar
+            self.stats.update(prices)
+            self.returns.append(stamp, self.stats.cumulative_return())
+        return self.stats.count
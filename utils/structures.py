@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import time
+from collections import deque
+
+
+# ✅ 자료구조: 스택 (LIFO) – deque 오른쪽 끝에서 넣고 빼기, 모두 O(1)
+class Stack:
+    kind = "Stack"
+
+    def __init__(self, values=()):
+        self.items = deque(values)
+
+    def __len__(self):
+        return len(self.items)
+
+    def push(self, value):
+        self.items.append(value)
+
+    def push_many(self, values):
+        self.items.extend(values)
+
+    def pop(self):
+        return self.items.pop()
+
+    def pop_many(self, count):
+        count = min(count, len(self.items))
+        return [self.items.pop() for _ in range(count)]
+
+    # 먼저 나올 것부터 size 개 (꼭대기 → 아래)
+    def window(self, size):
+        return list(itertools.islice(reversed(self.items), size))
+
+
+# ✅ 자료구조: 큐 (FIFO) – deque 오른쪽에 넣고 왼쪽에서 빼기 (list.pop(0) 의 O(n) 이동 없음)
+class Queue(Stack):
+    kind = "Queue"
+
+    def pop(self):
+        return self.items.popleft()
+
+    def pop_many(self, count):
+        count = min(count, len(self.items))
+        return [self.items.popleft() for _ in range(count)]
+
+    # 먼저 나올 것부터 size 개 (앞 → 뒤)
+    def window(self, size):
+        return list(itertools.islice(self.items, size))
+
+
+# ✅ 자료구조: 우선순위 큐 (이진 힙, heapq) – 넣기·빼기 O(log n), 우선순위가 같으면 먼저 넣은 것부터
+class PriorityQueue:
+    kind = "Priority Queue"
+
+    def __init__(self, values=()):
+        self.heap = []
+        self.counter = itertools.count()
+        self.push_many(values)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, value, priority=None):
+        heapq.heappush(self.heap, (value if priority is None else priority, next(self.counter), value))
+
+    # 여러 개는 리스트 뒤에 붙인 뒤 heapify 한 번 (O(n))
+    def push_many(self, values, priorities=None):
+        priorities = values if priorities is None else priorities
+        self.heap.extend((p, next(self.counter), v) for p, v in zip(priorities, values))
+        heapq.heapify(self.heap)
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def pop_many(self, count):
+        count = min(count, len(self.heap))
+        return [heapq.heappop(self.heap)[2] for _ in range(count)]
+
+    # 먼저 나올 것부터 size 개 – 전체 정렬 없이 nsmallest (O(n log size))
+    def window(self, size):
+        return [value for _, _, value in heapq.nsmallest(size, self.heap)]
+
+
+# ✅ 연산 시간 측정: 크기 n 인 구조에서 ops 번 꺼내기의 1회 평균 시간 (µs)
+# list.pop(0) 은 뒤 원소를 모두 한 칸씩 당기므로 n 에 비례, deque/힙은 거의 일정
+def operation_timings(sizes, ops=1000):
+    def per_op(setup, run):
+        container = setup()
+        start = time.perf_counter()
+        run(container)
+        return (time.perf_counter() - start) / ops * 1e6
+
+    rows = []
+    for n in sizes:
+        n = max(int(n), ops)
+        cases = {
+            "list.pop(0) (큐)": (lambda: list(range(n)), lambda c: [c.pop(0) for _ in range(ops)]),
+            "deque.popleft() (큐)": (lambda: deque(range(n)), lambda c: [c.popleft() for _ in range(ops)]),
+            "deque.pop() (스택)": (lambda: deque(range(n)), lambda c: [c.pop() for _ in range(ops)]),
+            "heappop (우선순위 큐)": (lambda: list(range(n)), lambda c: [heapq.heappop(c) for _ in range(ops)]),
+        }
+        for name, (setup, run) in cases.items():
+            rows.append({"연산": name, "크기": n, "1회 평균(µs)": per_op(setup, run)})
+    return rows
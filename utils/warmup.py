@@ -0,0 +1,74 @@
+import importlib
+import os
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 페이지가 코드 경로 안에서 늦게 import 하는 무거운 모듈 (첫 사용 때 수백 ms ~ 1 s)
+HEAVY_MODULES = (
+    "folium", "folium.plugins", "streamlit_folium",   # 05, 07 지도
+    "matplotlib.pyplot", "mpl_toolkits.mplot3d",      # 07 회귀 3D 그래프
+    "sklearn.linear_model", "sklearn.neighbors",      # 07 회귀 · 위험도 모델, Ball 트리
+    "scipy.sparse.csgraph", "scipy.optimize", "scipy.ndimage", "scipy.spatial",
+    "pydeck",                                         # 06 지도
+)
+# 저장소에 들어 있는 데이터셋 – 미리 파싱해 메모리·Parquet 캐시를 채운다
+DATASETS = (
+    ROOT / "pages" / "fire_data.csv",
+    ROOT / "pages" / "chemical_shelters.csv",
+    ROOT / "ess_suitability_data_updated.csv",
+)
+# 첫 화면이 그려진 뒤 이만큼 기다렸다가 시작 (첫 페이지 재실행과 GIL 을 다투지 않도록)
+DELAY_S = 1.0
+
+_lock = threading.Lock()
+_thread = None
+_timings = {}  # 항목 → 소요 s (실패는 None)
+
+
+def _timed(name, load):
+    start = time.perf_counter()
+    try:
+        load()
+        _timings[name] = time.perf_counter() - start
+    except Exception:  # 선택 의존성이 없거나 데이터가 깨져도 예열은 계속
+        _timings[name] = None
+
+
+def _run():
+    from utils.data import load_csv
+
+    time.sleep(DELAY_S)
+    os.environ.setdefault("MPLBACKEND", "Agg")  # 백그라운드 스레드에서 GUI 백엔드를 고르지 않도록
+    for name in HEAVY_MODULES:
+        _timed(name, lambda: importlib.import_module(name))
+    for path in DATASETS:
+        if path.exists():
+            _timed(path.name, lambda: load_csv(path))
+
+
+# ✅ 예열: 프로세스당 한 번, 데몬 스레드로 무거운 모듈 import + 데이터셋 캐시 채우기
+# (import 는 sys.modules 에 남으므로 이후 어느 세션·페이지든 바로 쓴다)
+def start():
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=_run, name="warmup", daemon=True)
+        try:
+            from streamlit.runtime.scriptrunner import add_script_run_ctx
+            add_script_run_ctx(_thread)  # st.cache_data 가 세션 문맥 없이 경고를 찍지 않도록
+        except ImportError:
+            pass
+        _thread.start()
+
+
+def done():
+    return _thread is not None and not _thread.is_alive()
+
+
+# 예열 항목별 소요 시간 (s) – 아직 안 끝난 항목은 빠짐
+def timings():
+    return dict(_timings)